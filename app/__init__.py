@@ -1,5 +1,122 @@
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import os
+import threading
+
 from flask import Flask
 
-app = Flask(__name__)
+from app.utils.json_provider import FastJSONProvider
+from app.utils.profiler import ProfilerMiddleware
+from app.utils.startup import StartupReport
+
+# Seconds this process spent importing the app's modules; routes (and with them
+# the services and processors) are imported by the first create_app call
+_import_seconds = time.perf_counter() - _IMPORT_STARTED
+
+
+def _configure(app):
+    """Defaults from the environment; create_app's config overrides them."""
+    # Render the index-page Plotly charts at startup instead of on the first request
+    app.config["PRERENDER_CHARTS"] = os.environ.get("PRERENDER_CHARTS", "1") != "0"
+    # Work done before the worker serves requests, in order: any of "datasets" (load and
+    # clean every CSV), "indexes" (score engine, facet and bitmap indexes, KDE baseline),
+    # "charts" (pre-render the index-page charts) and "assets" (build static and map assets)
+    app.config["WARMUP"] = os.environ.get("WARMUP", "charts")
+    # Shared secret for POST /api/ingest/<dataset>; ingestion is disabled when unset
+    app.config["INGEST_TOKEN"] = os.environ.get("INGEST_TOKEN")
+    # Link templates to fingerprinted, precompressed copies of the static files under /assets/
+    app.config["ASSET_PIPELINE"] = os.environ.get("ASSET_PIPELINE", "1") != "0"
+    # gzip/brotli-encode dynamic responses of at least this many bytes; 0 disables it
+    app.config["COMPRESS_MIN_BYTES"] = int(os.environ.get("COMPRESS_MIN_BYTES", 1024))
+    # Time request phases (filtering, scoring, KDE, charts, serialization) for /metrics
+    app.config["INSTRUMENTATION"] = os.environ.get("INSTRUMENTATION", "1") != "0"
+    # Also send each response's phase timings to the client in a Server-Timing header
+    app.config["SERVER_TIMING"] = os.environ.get("SERVER_TIMING", "1") != "0"
+    # Bearer token required by GET /metrics; the endpoint is open when unset
+    app.config["METRICS_TOKEN"] = os.environ.get("METRICS_TOKEN")
+    # Profile every request (cProfile + stack sampling) into PROFILE_DIR; for debugging only
+    app.config["PROFILE_REQUESTS"] = os.environ.get("PROFILE_REQUESTS", "0") != "0"
+    # Profile just the requests sending this value in an X-Profile header; off when unset
+    app.config["PROFILE_TOKEN"] = os.environ.get("PROFILE_TOKEN")
+    app.config["PROFILE_DIR"] = os.environ.get("PROFILE_DIR", os.path.join(os.path.dirname(app.root_path), "profiles"))
+    # "cprofile" (.prof), "sample" (.collapsed) or both; X-Profile-Mode overrides per request
+    app.config["PROFILER"] = os.environ.get("PROFILER", "cprofile,sample")
+    app.config["PROFILE_INTERVAL_MS"] = float(os.environ.get("PROFILE_INTERVAL_MS", 1))
+    # Also record allocation sites with tracemalloc (slow); X-Profile-Allocations overrides
+    app.config["PROFILE_ALLOCATIONS"] = os.environ.get("PROFILE_ALLOCATIONS", "0") != "0"
+
+
+def _warmup_steps(app):
+    """Configured warm-up step names, in order; PRERENDER_CHARTS off drops "charts"."""
+    from app.services import WARMUP_STEPS
+
+    steps = app.config["WARMUP"]
+    if isinstance(steps, str):
+        steps = steps.split(",")
+    steps = [step.strip().lower() for step in steps if step.strip() and step.strip().lower() != "none"]
+    unknown = [step for step in steps if step not in WARMUP_STEPS]
+    if unknown:
+        raise ValueError(f"Unknown warm-up steps: {', '.join(unknown)} (expected {', '.join(WARMUP_STEPS)})")
+    if not app.config["PRERENDER_CHARTS"]:
+        steps = [step for step in steps if step != "charts"]
+    return list(dict.fromkeys(steps))
+
+
+def create_app(config=None):
+    """
+    Build the Flask app and warm it up
+
+    Importing the package does not build an app. The routes and services
+    are imported here, and SciPy and the Plotly chart modules on first use
+    (or by the warm-up steps that need them). The configured warm-up steps run
+    before this returns, so a worker created with it serves its first
+    request at full speed. Startup stage timings are logged and served on
+    /api/startup and /metrics.
+
+    Args:
+        config (dict, optional): Overrides of the environment-derived config
+
+    Returns:
+        Flask: The app, with the profiler middleware installed
+    """
+    global _import_seconds
+    report = StartupReport()
+    app = Flask(__name__)
+    # NumPy/pandas-aware JSON (orjson when installed) for jsonify and request.get_json
+    app.json = FastJSONProvider(app)
+    _configure(app)
+    app.config.update(config or {})
+
+    started = time.perf_counter()
+    from app.routes import bp
+    _import_seconds += time.perf_counter() - started
+    report.record("import", _import_seconds)
+    app.register_blueprint(bp)
+    app.extensions["startup"] = report
+    app.wsgi_app = ProfilerMiddleware(app.wsgi_app, app.config)
+
+    from app.services import WARMUP_STEPS
+    for step in _warmup_steps(app):
+        with report.stage(f"warmup.{step}"):
+            WARMUP_STEPS[step]()
+    report.ready = True
+    app.logger.info(report.summary())
+    return app
+
+
+_default_app = None
+_default_app_lock = threading.Lock()
+
 
-from app import routes
+def __getattr__(name):
+    # ``from app import app`` (run.py, ``flask --app app``, WSGI servers) builds the
+    # environment-configured app on first access rather than at package import
+    global _default_app
+    if name != "app":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _default_app_lock:
+        if _default_app is None:
+            _default_app = create_app()
+    return _default_app
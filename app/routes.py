@@ -1,22 +1,43 @@
-from flask import render_template, jsonify, abort, request
-from app import app
+from flask import Blueprint, current_app, render_template, jsonify, abort, request, redirect, send_file, url_for, g, Response
 from app.services import (
     get_main_metrics, get_anxiety_by_category, get_filtered_metrics,
     get_visual_analytics_data, get_filtered_loan_data, get_loan_purpose_data,
     get_digital_time_data, get_regional_data_from_file, get_financial_data_from_file, 
     get_profession_data, get_education_data, get_metrics_deep_dive,
-    get_question_distribution_data, METRICS_CONFIG,
-    get_filtered_metrics_deep_dive # <-- Restored this import
+    get_question_distribution_data, QUESTION_INDEX, get_metric_distributions,
+    get_filtered_metrics_deep_dive, # <-- Restored this import
+    get_group_metrics, PROFILE_FILTER_COLUMNS, RESPONSE_CACHE, get_dashboard_state,
+    ingest_rows, get_live_aggregates, get_column_summary, get_loan_distribution_by,
+    GEO_ASSETS, get_geo_manifest, get_geo_asset, STATIC_ASSETS, ASSET_URL_PREFIX, REQUEST_METRICS,
+    get_memory_report, EXECUTOR,
 )
-import re
+from app.utils.ingestion import SchemaError
+from app.utils.engagement_processor import DEFAULT_KDE_POINTS
+from app.utils.compression import accepted_encodings, compress_response
+from app.utils.instrumentation import begin_request, end_request, phase
+from app.utils.executor import TaskTimeout
+import hmac
 from urllib.parse import unquote
 
-@app.route("/")
+# Every route of the dashboard; registered on the app by create_app
+bp = Blueprint("main", __name__)
+
+@bp.route("/")
 def index():
-    main_metrics = get_main_metrics()
+    # The sections read different sheets, so the page waits for the slowest one only
+    sections = EXECUTOR.gather({
+        "main_metrics": get_main_metrics,
+        "viz_data": get_visual_analytics_data,
+        "metrics_deep_dive": get_metrics_deep_dive,
+    })
+    main_metrics = sections["main_metrics"]
     scores = main_metrics["scores"]
-    viz_data = get_visual_analytics_data()
-    metrics_deep_dive = get_metrics_deep_dive()
+    viz_data = sections["viz_data"]
+    metrics_deep_dive = sections["metrics_deep_dive"]
+    try:
+        geo_assets = _geo_manifest()
+    except RuntimeError:
+        geo_assets = None  # the map falls back to the raw GeoJSON
 
     page_data = {
         "hero_section": {
@@ -40,23 +61,25 @@ def index():
             "score_investasi": scores.get("Investasi Aset", 0),
         },
     }
-    return render_template(
-        'index.html', 
-        data=page_data, 
-        chart_html=viz_data['chart_html'], 
-        profession_chart=viz_data['profession_chart'], 
-        education_chart=viz_data['education_chart'],
-        metrics_deep_dive=metrics_deep_dive
-    )
+    with phase("render"):
+        return render_template(
+            'index.html', 
+            data=page_data, 
+            chart_html=viz_data['chart_html'], 
+            profession_chart=viz_data['profession_chart'], 
+            education_chart=viz_data['education_chart'],
+            metrics_deep_dive=metrics_deep_dive,
+            geo_assets=geo_assets,
+        )
 
 # --- NEW: API route for unfiltered metric details (Restored from old code) ---
-@app.route('/api/metrics-deep-dive/unfiltered')
+@bp.route('/api/metrics-deep-dive/unfiltered')
 def metrics_deep_dive_unfiltered():
     data = get_metrics_deep_dive()
     return jsonify(data)
 
 # --- NEW: API route for filtered metric details (Restored from old code) ---
-@app.route('/api/metrics-deep-dive/filtered/<filter_by>/<path:filter_value>')
+@bp.route('/api/metrics-deep-dive/filtered/<filter_by>/<path:filter_value>')
 def metrics_deep_dive_filtered(filter_by, filter_value):
     try:
         # Use unquote to handle special characters in the filter value
@@ -66,23 +89,13 @@ def metrics_deep_dive_filtered(filter_by, filter_value):
         return jsonify(error=str(e)), 500
 
 # --- MODIFIED: Question distribution route now accepts optional filters ---
-@app.route('/api/question-distribution/<question_id>')
+@bp.route('/api/question-distribution/<question_id>')
 def question_distribution(question_id):
     # Get filter parameters from the query string to match new API style
     filter_by = request.args.get('filter_by', None)
     filter_value = request.args.get('filter_value', None)
     
-    question_text = None
-    for metric in METRICS_CONFIG.values():
-        for q in metric['questions']:
-            safe_text = re.sub(r'[^a-zA-Z0-9\s]', '', q)
-            current_id = safe_text.lower().replace(" ", "-")[:50]
-            if current_id == question_id:
-                question_text = q
-                break
-        if question_text:
-            break
-            
+    question_text = QUESTION_INDEX.get(question_id)
     if not question_text:
         abort(404, description="Question not found for the given ID")
 
@@ -90,12 +103,23 @@ def question_distribution(question_id):
     data = get_question_distribution_data(question_text, filter_by, filter_value)
     return jsonify(data)
 
-@app.route('/data/anxiety_by/<filter_by>')
+@bp.route('/api/metric-distributions/<path:metric>')
+def metric_distributions(metric):
+    """Answer distributions of all questions of a metric, for the metric modal."""
+    filter_by = request.args.get('filter_by', None)
+    filter_value = request.args.get('filter_value', None)
+
+    data = get_metric_distributions(unquote(metric), filter_by, filter_value)
+    if isinstance(data, tuple):
+        return jsonify(data[0]), data[1]
+    return jsonify(data)
+
+@bp.route('/data/anxiety_by/<filter_by>')
 def anxiety_by_filter(filter_by):
     data = get_anxiety_by_category(filter_by)
     return jsonify(categories=data["categories"], scores=data["scores"])
 
-@app.route("/api/filter_metrics/<filter_by>/<path:filter_value>")
+@bp.route("/api/filter_metrics/<filter_by>/<path:filter_value>")
 def filtered_metrics(filter_by, filter_value):
     try:
         metrics = get_filtered_metrics(filter_by, filter_value)
@@ -106,58 +130,295 @@ def filtered_metrics(filter_by, filter_value):
     except Exception as e:
         return jsonify(error=str(e)), 500
 
+@bp.route("/api/group_metrics/<filter_by>")
+def group_metrics(filter_by):
+    """Metric scores and average anxiety for every value of a dimension in one response."""
+    try:
+        return jsonify(get_group_metrics(filter_by))
+    except ValueError as e:
+        return jsonify(error=str(e)), 404
+    except Exception as e:
+        return jsonify(error=str(e)), 500
+
 # --- REFACTORED ROUTES (Unchanged from new codebase) ---
 # All routes below now use query parameters for filtering
 
-@app.route("/api/loan-filtered")
+def _cross_filters_from_request():
+    """Multi-value cross filters, e.g. ?employment_status=Student&province=Bali&province=Banten&op=and."""
+    filters = {name: request.args.getlist(name) for name in PROFILE_FILTER_COLUMNS if name in request.args}
+    op = "or" if request.args.get("op", "and").lower() == "or" else "and"
+    return filters, op
+
+def _exact_from_request():
+    """?exact=true forces exact statistics, ?exact=false forces sketches, absent lets the service decide."""
+    exact = request.args.get('exact')
+    if exact is None:
+        return None
+    return exact.lower() in ('1', 'true', 'yes')
+
+@bp.route("/api/loan-filtered")
 def api_loan_filtered():
     filter_type = request.args.get('filter_type')
     filter_value = request.args.get('filter_value')
-    data = get_filtered_loan_data(filter_type, filter_value)
+    filters, op = _cross_filters_from_request()
+    data = get_filtered_loan_data(filter_type, filter_value, filters, op, exact=_exact_from_request())
     return jsonify(data)
 
-@app.route("/api/loan-purpose")
+@bp.route("/api/loan-distribution-by/<group_by>")
+def api_loan_distribution_by(group_by):
+    """Loan buckets per profession/education/province/... value, e.g. /api/loan-distribution-by/employment_status."""
+    filter_type = request.args.get('filter_type')
+    filter_value = request.args.get('filter_value')
+    filters, op = _cross_filters_from_request()
+    try:
+        data = get_loan_distribution_by(group_by, filter_type, filter_value, filters, op)
+    except ValueError as e:
+        return jsonify(error=str(e)), 404
+    return jsonify(data)
+
+@bp.route("/api/column-summary/<name>")
+def api_column_summary(name):
+    """Summary statistics of loan, income or expense for the current filters."""
+    filter_type = request.args.get('filter_type')
+    filter_value = request.args.get('filter_value')
+    filters, op = _cross_filters_from_request()
+    try:
+        data = get_column_summary(name, filter_type, filter_value, filters, op, exact=_exact_from_request())
+    except ValueError as e:
+        return jsonify(error=str(e)), 404
+    return jsonify(data)
+
+@bp.route("/api/loan-purpose")
 def api_loan_purpose():
     filter_type = request.args.get('filter_type')
     filter_value = request.args.get('filter_value')
-    data = get_loan_purpose_data(filter_type, filter_value)
+    filters, op = _cross_filters_from_request()
+    data = get_loan_purpose_data(filter_type, filter_value, filters, op)
     return jsonify(data)
 
-@app.route("/api/digital-time")
+@bp.route("/api/digital-time")
 def api_digital_time():
     filter_type = request.args.get('filter_type')
     filter_value = request.args.get('filter_value')
-    data = get_digital_time_data(filter_type, filter_value)
+    filters, op = _cross_filters_from_request()
+    # ?points= trades curve detail for payload size (clamped to 10-1000)
+    points = request.args.get('points', default=DEFAULT_KDE_POINTS, type=int)
+    data = get_digital_time_data(filter_type, filter_value, filters, op, points)
     return jsonify(data)
 
-@app.route("/api/profession-chart")
+@bp.route("/api/profession-chart")
 def api_profession_chart():
     filter_type = request.args.get('filter_type')
     filter_value = request.args.get('filter_value')
-    data = get_profession_data(filter_type, filter_value)
+    filters, op = _cross_filters_from_request()
+    data = get_profession_data(filter_type, filter_value, filters, op)
     return jsonify(data)
 
-@app.route("/api/education-chart")
+@bp.route("/api/education-chart")
 def api_education_chart():
     filter_type = request.args.get('filter_type')
     filter_value = request.args.get('filter_value')
-    data = get_education_data(filter_type, filter_value)
+    filters, op = _cross_filters_from_request()
+    data = get_education_data(filter_type, filter_value, filters, op)
     return jsonify(data)
 
-@app.route("/api/financial-profile")
+@bp.route("/api/financial-profile")
 def get_financial_data():
     """Endpoint for aggregated Gen Z financial profile data, now filterable."""
     filter_type = request.args.get('filter_type')
     filter_value = request.args.get('filter_value')
-    data = get_financial_data_from_file(filter_type, filter_value)
-    if "error" in data:
-        return jsonify(data), 404
+    filters, op = _cross_filters_from_request()
+    data = get_financial_data_from_file(filter_type, filter_value, filters, op)
+    if isinstance(data, tuple):
+        return jsonify(data[0]), data[1]
     return jsonify(data)
 
+@bp.route("/api/dashboard-state")
+def api_dashboard_state():
+    """All panel payloads for one filter spec in a single response."""
+    filter_type = request.args.get('filter_type')
+    filter_value = request.args.get('filter_value')
+    filters, op = _cross_filters_from_request()
+    parallel = request.args.get('parallel', '0').lower() in ('1', 'true', 'yes')
+    data = get_dashboard_state(filter_type, filter_value, filters, op, parallel=parallel, exact=_exact_from_request())
+    return jsonify(data)
+
+@bp.route("/api/visual-analytics")
+def api_visual_analytics():
+    """Pre-rendered index charts; ?format=json ships Plotly figure JSON instead of HTML fragments."""
+    try:
+        return jsonify(get_visual_analytics_data(request.args.get('format', 'html')))
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+@bp.route("/api/cache-stats")
+def cache_stats():
+    """Hit/miss counters and occupancy of the service response cache."""
+    return jsonify(RESPONSE_CACHE.stats())
+
+@bp.route("/api/memory-report")
+def memory_report():
+    """Bytes held by each loaded dataset frame and column, next to their size without compaction."""
+    return jsonify(get_memory_report())
+
+@bp.route("/api/startup")
+def startup():
+    """Seconds this worker spent importing and warming up, and the deferred imports done since."""
+    return jsonify(current_app.extensions["startup"].as_dict())
+
+# --- Ingestion of new survey rows ---
+@bp.route("/api/ingest/<dataset>", methods=["POST"])
+def api_ingest(dataset):
+    """Append survey rows (a JSON list, or {"rows": [...]}) to sheet1, sheet2 or profile; ?persist=1 also appends them to the CSV."""
+    token = current_app.config.get("INGEST_TOKEN")
+    if not token:
+        return jsonify(error="Ingestion is disabled"), 403
+    if not hmac.compare_digest(request.headers.get("X-Ingest-Token", ""), token):
+        return jsonify(error="Invalid ingest token"), 403
+
+    payload = request.get_json(silent=True)
+    records = payload.get("rows") if isinstance(payload, dict) else payload
+    persist = request.args.get('persist', '0').lower() in ('1', 'true', 'yes')
+    try:
+        data = ingest_rows(dataset, records, persist=persist)
+    except SchemaError as e:
+        return jsonify(error=str(e), details=e.errors), 400
+    except ValueError as e:
+        return jsonify(error=str(e)), 404
+    return jsonify(data)
+
+@bp.route("/api/live-aggregates")
+def api_live_aggregates():
+    """Running aggregates maintained by ingestion; ?dataset= narrows to one dataset."""
+    try:
+        return jsonify(get_live_aggregates(request.args.get('dataset')))
+    except ValueError as e:
+        return jsonify(error=str(e)), 404
+
 # --- UNCHANGED ROUTES ---
-@app.route("/api/data")
+@bp.route("/api/data")
 def get_regional_data():
     data = get_regional_data_from_file()
-    if "error" in data:
-        return jsonify(data), 404
-    return jsonify(data)
\ No newline at end of file
+    if isinstance(data, tuple):
+        return jsonify(data[0]), data[1]
+    return jsonify(data)
+
+@bp.app_errorhandler(TaskTimeout)
+def section_timeout(e):
+    """A page or batch section ran past its timeout (EXECUTOR_TIMEOUT)."""
+    return jsonify(error=str(e)), 503
+
+@bp.before_app_request
+def start_request_timing():
+    if current_app.config["INSTRUMENTATION"]:
+        g.request_timing = begin_request()
+
+# Registered before compress: after_request hooks run in reverse order, so
+# this one sees the compressed response and the compression time
+@bp.after_app_request
+def record_request_timing(response):
+    """Adds the request to /metrics and its phases to a Server-Timing header."""
+    token = g.pop("request_timing", None)
+    if token is None:
+        return response
+    timings = end_request(token)
+    total = timings.elapsed()
+    route = request.url_rule.rule if request.url_rule else "<unmatched>"
+    REQUEST_METRICS.observe(route, request.method, response.status_code, total, timings)
+    if current_app.config["SERVER_TIMING"]:
+        response.headers["Server-Timing"] = timings.server_timing(total)
+    return response
+
+@bp.after_app_request
+def compress(response):
+    """gzip/brotli-encodes large dynamic responses the client accepts compressed."""
+    min_bytes = current_app.config["COMPRESS_MIN_BYTES"]
+    if min_bytes > 0:
+        with phase("compress"):
+            compress_response(response, accepted_encodings(request.accept_encodings), min_bytes)
+    return response
+
+@bp.route("/metrics")
+def metrics():
+    """Request latency histograms, phase totals and cache counters in the Prometheus text format."""
+    token = current_app.config["METRICS_TOKEN"]
+    if token:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return jsonify(error="Invalid metrics token"), 403
+    body = REQUEST_METRICS.render(
+        RESPONSE_CACHE.stats(), RESPONSE_CACHE.endpoint_stats(), current_app.extensions["startup"].as_dict(),
+    )
+    return Response(body, mimetype="text/plain; version=0.0.4")
+
+# Built map and static assets are named by content hash, so they never change under a URL
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+def _send_precompressed(store, name):
+    """Sends a built file from a store, precompressed (br, then gzip) when the client accepts it."""
+    located = store.locate(name, accepted_encodings(request.accept_encodings))
+    if located is None:
+        abort(404)
+    path, encoding, mimetype = located
+    response = send_file(path, mimetype=mimetype, conditional=True, max_age=IMMUTABLE_MAX_AGE)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+def _geo_manifest():
+    manifest = get_geo_manifest()
+    for assets in manifest["resolutions"].values():
+        for entry in assets.values():
+            entry["url"] = url_for('main.geo_asset', file_name=entry["file"])
+    return manifest
+
+@bp.route("/api/geo/manifest")
+def api_geo_manifest():
+    """Hashed URL and raw/compressed sizes of every map resolution and format."""
+    try:
+        return jsonify(_geo_manifest())
+    except RuntimeError as e:
+        return jsonify(error=str(e)), 503
+
+@bp.route("/api/geo/<resolution>")
+def api_geo_resolution(resolution):
+    """Redirects to the current hashed asset of a resolution; ?format=topojson for TopoJSON."""
+    try:
+        entry = get_geo_asset(resolution, request.args.get('format', 'geojson'))
+    except ValueError as e:
+        return jsonify(error=str(e)), 404
+    except RuntimeError as e:
+        return jsonify(error=str(e)), 503
+    return redirect(url_for('main.geo_asset', file_name=entry["file"]))
+
+@bp.route("/geo/<file_name>")
+def geo_asset(file_name):
+    """A built map asset, by its hashed file name."""
+    return _send_precompressed(GEO_ASSETS, file_name)
+
+@bp.route(ASSET_URL_PREFIX + "<path:filename>")
+def asset(filename):
+    """A fingerprinted static file, by its hashed path."""
+    return _send_precompressed(STATIC_ASSETS, filename)
+
+@bp.app_template_global()
+def asset_url(filename):
+    """Fingerprinted URL of a static file; its plain /static URL when it is not part of the build."""
+    if current_app.config["ASSET_PIPELINE"]:
+        hashed = STATIC_ASSETS.hashed_name(filename, check=current_app.debug)
+        if hashed:
+            return url_for('main.asset', filename=hashed)
+    return url_for('static', filename=filename)
+
+@bp.app_template_global()
+def asset_urls(directory):
+    """asset_url of every built file under a static directory, keyed by path within it."""
+    if not current_app.config["ASSET_PIPELINE"]:
+        return {}
+    return {
+        name: url_for('main.asset', filename=hashed)
+        for name, hashed in STATIC_ASSETS.hashed_names(directory, check=current_app.debug).items()
+    }
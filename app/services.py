@@ -1,16 +1,79 @@
 import pandas as pd
 import numpy as np
-from app.utils.loan_processor import LoanProcessor
-from app.utils.engagement_processor import EngagementProcessor
+from app.utils.loan_processor import LoanProcessor, BUCKETER
+from app.utils.engagement_processor import EngagementProcessor, DEFAULT_KDE_POINTS, clamp_kde_points
 from app.utils.chart_generator import ChartGenerator
+from app.utils.dataset_registry import DatasetRegistry
+from app.utils.dataset_cache import ColumnarCache
+from app.utils.score_engine import ScoreEngine
+from app.utils.facet_index import FacetIndex
+from app.utils.bitmap_index import BitmapIndex
+from app.utils.response_cache import ResponseCache
+from app.utils.answer_distribution import AnswerDistribution
+from app.utils.ingestion import TableSchema
+from app.utils.running_aggregates import RunningAggregates
+from app.utils.quantile_sketch import SummaryIndex, describe_exact
+from app.utils.regional_aggregator import RegionalAggregator
+from app.utils.geo_assets import GeoAssetStore, DEFAULT_GEO_RESOLUTION
+from app.utils.static_assets import StaticAssetManifest
+from app.utils.json_provider import frame_records_json
+from app.utils.instrumentation import RequestMetrics, phase, timed
+from app.utils.frame_schema import FrameSchema, LIKERT_MISSING, memory_report, replace_values, value_counts
+from app.utils.executor import Task, TaskExecutor
 import os
 import re
+import threading
 from urllib.parse import quote, unquote
 
 # --- Data Loading ---
+# DATASET_DIR points the app at another copy of the CSVs (e.g. benchmarks/data/<size>)
+DATASET_DIR = os.environ.get("DATASET_DIR", os.path.join(os.path.dirname(__file__), "..", "dataset"))
+
+# Bump whenever clean_profile_data or clean_regional_data changes its output,
+# so stale entries in the binary dataset cache are rebuilt.
+DATASET_CLEANING_VERSION = 1
+
+def _dataset_cache():
+    if os.environ.get("DATASET_CACHE", "1") == "0":
+        return None
+    cache_dir = os.environ.get("DATASET_CACHE_DIR", os.path.join(DATASET_DIR, ".cache"))
+    return ColumnarCache(cache_dir, version=DATASET_CLEANING_VERSION)
+
+# Every sheet is read and cleaned once per process; frames are shared and read-only.
+DATASETS = DatasetRegistry(cache=_dataset_cache())
+
 def _load_sheet(file_name):
-    path = os.path.join(os.path.dirname(__file__), "..", "dataset", file_name)
-    return pd.read_csv(path)
+    return DATASETS.get(os.path.join(DATASET_DIR, file_name))
+
+# Memoized service results, keyed on endpoint, normalized filter params and dataset version.
+RESPONSE_CACHE = ResponseCache(
+    max_bytes=int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+    ttl=float(os.environ.get("RESPONSE_CACHE_TTL", 600)),
+    enabled=os.environ.get("RESPONSE_CACHE", "1") != "0",
+)
+
+# Latency histograms and phase totals of instrumented requests, served on /metrics
+REQUEST_METRICS = RequestMetrics()
+
+# Runs independent sections of a request concurrently: NumPy/pandas work on threads,
+# Plotly figure building in worker processes when EXECUTOR_PROCESSES is set
+EXECUTOR = TaskExecutor(
+    threads=int(os.environ.get("EXECUTOR_THREADS", 6)),
+    processes=int(os.environ.get("EXECUTOR_PROCESSES", 0)),
+    timeout=float(os.environ.get("EXECUTOR_TIMEOUT", 30)),
+)
+
+def _sheets_version():
+    return (
+        DATASETS.version(os.path.join(DATASET_DIR, "Sheet1.csv")),
+        DATASETS.version(os.path.join(DATASET_DIR, "Sheet2.csv")),
+    )
+
+def _profile_version():
+    return DATASETS.version(NEW_DATASET_PATH, clean_profile_data)
+
+def _regional_version():
+    return DATASETS.version(REGIONAL_DATASET_PATH, clean_regional_data)
 
 # --- Metric Calculation Logic (Restored 'title' for deep dive compatibility) ---
 METRICS_CONFIG = {
@@ -118,40 +181,45 @@ NEGATIVE_POLARITY_QUESTIONS = [
 ]
 
 def _calculate_scores(df):
-    if df.empty:
-        return {metric: 0 for metric in METRICS_CONFIG.keys()}
-
-    df_copy = df.copy()
-    for question in NEGATIVE_POLARITY_QUESTIONS:
-        if question in df_copy.columns:
-            df_copy[question] = 5 - df_copy[question]
+    """Scores an arbitrary Sheet2-shaped frame; request paths use the cached engine instead."""
+    return ScoreEngine(df, METRICS_CONFIG, NEGATIVE_POLARITY_QUESTIONS).score()
 
-    scores = {}
-    for metric, config in METRICS_CONFIG.items():
-        questions = config["questions"]
-        existing_questions = [q for q in questions if q in df_copy.columns]
-        if existing_questions:
-            metric_scores = df_copy[existing_questions].mean(axis=1)
-            avg_score = metric_scores.mean()
-            scores[metric] = round(((avg_score - 1) / 3) * 100) if pd.notna(avg_score) else 0
-        else:
-            scores[metric] = 0
-    return scores
+def _score_engine():
+    """Score engine over the full Sheet2 Likert matrix, rebuilt only when Sheet2 is reloaded."""
+    df_sheet2 = _load_sheet("Sheet2.csv")
+    return DATASETS.derived(
+        "score_engine", lambda df: ScoreEngine(df, METRICS_CONFIG, NEGATIVE_POLARITY_QUESTIONS), df_sheet2,
+    )
 
+@RESPONSE_CACHE.cached("main-metrics", _sheets_version)
 def get_main_metrics():
-    df_sheet2 = _load_sheet("Sheet2.csv")
     df_sheet1 = _load_sheet("Sheet1.csv")
-    scores = _calculate_scores(df_sheet2)
+    scores = _score_engine().score()
     average_anxiety_score = df_sheet1["financial_anxiety_score"].mean()
     return {"scores": scores, "average_anxiety_score": average_anxiety_score}
 
 # --- MERGED DEEP DIVE LOGIC ---
 
+def _question_id(q_text):
+    """URL slug of a question, as used by /api/question-distribution/<question_id>."""
+    safe_text = re.sub(r'[^a-zA-Z0-9\s]', '', q_text)
+    return safe_text.lower().replace(" ", "-")[:50]
+
+def _build_question_index():
+    index = {}
+    for config in METRICS_CONFIG.values():
+        for q_text in config["questions"]:
+            # Slugs are truncated, so the first question keeps a shared slug
+            index.setdefault(_question_id(q_text), q_text)
+    return index
+
+# Question slug -> question text, resolved once at import
+QUESTION_INDEX = _build_question_index()
+
 def _build_deep_dive_structure(scores_data):
     """Helper function to build the nested dictionary for the modal (Restored from old code)."""
     def create_question_id(q_text):
-        safe_text = re.sub(r'[^a-zA-Z0-9\s]', '', q_text)
-        return quote(safe_text.lower().replace(" ", "-")[:50])
+        return quote(_question_id(q_text))
 
     metrics_data = {}
     for metric, config in METRICS_CONFIG.items():
@@ -172,97 +240,244 @@ def _build_deep_dive_structure(scores_data):
         }
     return metrics_data
 
+@RESPONSE_CACHE.cached("metrics-deep-dive", _sheets_version)
 def get_metrics_deep_dive():
     """Gets the deep dive data for the entire dataset."""
-    df_sheet2 = _load_sheet("Sheet2.csv")
-    scores = _calculate_scores(df_sheet2)
+    scores = _score_engine().score()
     return _build_deep_dive_structure(scores)
 
-def _get_filtered_dataframe(filter_by, filter_value):
-    """Filters Sheet2 based on a filter from Sheet1 (Restored from old code)."""
-    df1 = _load_sheet("Sheet1.csv")
-    df2 = _load_sheet("Sheet2.csv")
+# Sheet1 filters translated to Sheet2's column names and answer vocabulary
+SHEET2_COLUMN_MAPPING = {"employment_status": "Job", "education_level": "Last Education", "gender": "Gender", "birth_year": "Year of Birth"}
+SHEET2_VALUE_MAPPING = {"Elementary School": "Elementary School (SD)", "Junior High School": "Junior High School (SMP)", "Senior High School": "Senior High School (SMA)"}
 
+def _normalize_employment_status(column):
+    return replace_values(column, {"Enterpreneur": "Entrepreneur", "enterpreneur": "Entrepreneur"})
+
+def _facet_index():
+    """Facet index over Sheet1/Sheet2, rebuilt only when either sheet is reloaded."""
+    return DATASETS.derived(
+        "facet_index",
+        lambda df1, df2: FacetIndex(
+            df1, df2, SHEET2_COLUMN_MAPPING, SHEET2_VALUE_MAPPING,
+            normalizers={"employment_status": _normalize_employment_status},
+        ),
+        _load_sheet("Sheet1.csv"), _load_sheet("Sheet2.csv"),
+    )
+
+def _normalize_filter_value(filter_by, filter_value):
+    """Translate a request filter value to its facet-index key (None for an invalid age)."""
     if filter_by == "employment_status":
-        df1["employment_status"] = df1["employment_status"].replace({"Enterpreneur": "Entrepreneur", "enterpreneur": "Entrepreneur"})
         filter_value = str(filter_value).replace("Enterpreneur", "Entrepreneur")
 
-    sheet1_filter_value = filter_value
     if filter_by == "birth_year":
         try:
-            age = int(filter_value)
-            sheet1_filter_value = 2025 - age
+            filter_value = 2025 - int(filter_value)
         except ValueError:
-            return pd.DataFrame(), pd.DataFrame()
+            return None
 
-    filtered_df1 = df1[df1[filter_by] == sheet1_filter_value]
-    
-    column_mapping = {"employment_status": "Job", "education_level": "Last Education", "gender": "Gender", "birth_year": "Year of Birth"}
-    value_mapping = {"Elementary School": "Elementary School (SD)", "Junior High School": "Junior High School (SMP)", "Senior High School": "Senior High School (SMA)"}
-    
-    sheet2_column = column_mapping.get(filter_by, filter_by)
-    sheet2_filter_value = value_mapping.get(str(sheet1_filter_value), sheet1_filter_value)
-    
-    df_filtered_sheet2 = df2[df2[sheet2_column] == sheet2_filter_value]
-    
-    return filtered_df1, df_filtered_sheet2
+    return filter_value
+
+def _get_filtered_rows(filter_by, filter_value):
+    """Row positions in Sheet1 and Sheet2 for a Sheet1-style filter (None, None for an invalid age)."""
+    filter_value = _normalize_filter_value(filter_by, filter_value)
+    if filter_value is None:
+        return None, None
+    with phase("filter") as timed_filter:
+        rows1, rows2 = _facet_index().lookup(filter_by, filter_value)
+        timed_filter.rows = len(rows1)
+    return rows1, rows2
+
+def _get_filtered_dataframe(filter_by, filter_value):
+    """Filters Sheet2 based on a filter from Sheet1 (Restored from old code)."""
+    rows1, rows2 = _get_filtered_rows(filter_by, filter_value)
+    if rows1 is None:
+        return pd.DataFrame(), pd.DataFrame()
+    return _load_sheet("Sheet1.csv").iloc[rows1], _load_sheet("Sheet2.csv").iloc[rows2]
 
+@RESPONSE_CACHE.cached("metrics-deep-dive-filtered", _sheets_version)
 def get_filtered_metrics_deep_dive(filter_by, filter_value):
     """Gets the deep dive data for a specific filtered group (Restored from old code)."""
-    _, df_filtered_sheet2 = _get_filtered_dataframe(filter_by, filter_value)
-    filtered_scores = _calculate_scores(df_filtered_sheet2)
+    _, rows2 = _get_filtered_rows(filter_by, filter_value)
+    filtered_scores = _score_engine().score(rows2 if rows2 is not None else FacetIndex.EMPTY)
     return _build_deep_dive_structure(filtered_scores)
 
+def _build_answer_distribution(df1, df2):
+    distributions = AnswerDistribution(
+        df2, [q for config in METRICS_CONFIG.values() for q in config["questions"]],
+    )
+    facets = _facet_index()
+    for dimension in facets.dimensions:
+        distributions.add_facet(dimension, {
+            value: facets.lookup(dimension, value)[1] for value in facets.values(dimension)
+        })
+    return distributions
+
+def _answer_distribution():
+    """Answer counts of every question, overall and per facet value, rebuilt only when a sheet is reloaded."""
+    return DATASETS.derived(
+        "answer_distribution", _build_answer_distribution,
+        _load_sheet("Sheet1.csv"), _load_sheet("Sheet2.csv"),
+    )
+
+def _answer_counts(filter_by=None, filter_value=None):
+    """Precomputed counts for a request filter (None for an invalid age)."""
+    distributions = _answer_distribution()
+    if not (filter_by and filter_value):
+        return distributions.totals
+    value = _normalize_filter_value(filter_by, unquote(filter_value))
+    if value is None:
+        return None
+    return distributions.lookup(filter_by, value)
+
 # --- MODIFIED: Question distribution with restored filtering logic ---
+@RESPONSE_CACHE.cached("question-distribution", _sheets_version)
 def get_question_distribution_data(question_text, filter_by=None, filter_value=None):
-    df2 = _load_sheet("Sheet2.csv")
-
-    # Apply filters if they are provided
-    if filter_by and filter_value:
-        # Use the restored helper function to get the correct slice of data
-        _, df2 = _get_filtered_dataframe(filter_by, unquote(filter_value))
+    distributions = _answer_distribution()
+    counts = _answer_counts(filter_by, filter_value)
 
-    if question_text not in df2.columns:
+    if counts is None or question_text not in distributions.position:
         return {"error": "Question not found in the dataset"}, 404
-    
-    counts = df2[question_text].value_counts().to_dict()
-    distribution = {str(int(i)): counts.get(i, 0) for i in range(1, 5)}
-    most_common = max(distribution, key=distribution.get) if distribution and sum(distribution.values()) > 0 else None
 
-    return {"distribution": distribution, "most_common": most_common}
+    return distributions.distribution(counts, question_text)
+
+@RESPONSE_CACHE.cached("metric-distributions", _sheets_version)
+def get_metric_distributions(metric, filter_by=None, filter_value=None):
+    """Answer distributions of every question of a metric, from one precomputed count table."""
+    if metric not in METRICS_CONFIG:
+        return {"error": f"Unknown metric: {metric}"}, 404
+    distributions = _answer_distribution()
+    counts = _answer_counts(filter_by, filter_value)
+
+    questions = []
+    for q_text in METRICS_CONFIG[metric]["questions"]:
+        entry = {"id": _question_id(q_text), "text": q_text, "distribution": None, "most_common": None}
+        if counts is not None and q_text in distributions.position:
+            entry.update(distributions.distribution(counts, q_text))
+        questions.append(entry)
+    return {"metric": metric, "questions": questions}
 
+@RESPONSE_CACHE.cached("anxiety-by", _sheets_version)
 def get_anxiety_by_category(filter_by="employment_status"):
     df = _load_sheet("Sheet1.csv")
     if filter_by == "employment_status":
-        df["employment_status"] = df["employment_status"].replace({"Enterpreneur": "Entrepreneur", "enterpreneur": "Entrepreneur"})
+        df = df.assign(employment_status=_normalize_employment_status(df["employment_status"]))
     
     category_column = filter_by
     if filter_by == "birth_year":
         current_year = 2025
-        df["age"] = current_year - df["birth_year"]
+        df = df.assign(age=current_year - df["birth_year"])
         category_column = "age"
 
-    anxiety_by_category = df.groupby(category_column)["financial_anxiety_score"].mean().round(1).reset_index()
+    anxiety_by_category = df.groupby(category_column, observed=True)["financial_anxiety_score"].mean().round(1).reset_index()
     anxiety_by_category = anxiety_by_category.sort_values("financial_anxiety_score", ascending=False)
     
     return {"categories": anxiety_by_category[category_column].tolist(), "scores": anxiety_by_category["financial_anxiety_score"].tolist()}
 
+@RESPONSE_CACHE.cached("filter-metrics", _sheets_version)
 def get_filtered_metrics(filter_by, filter_value):
     # This function now uses the restored helper function for consistency
-    filtered_df1, df_filtered_sheet2 = _get_filtered_dataframe(filter_by, filter_value)
+    rows1, rows2 = _get_filtered_rows(filter_by, filter_value)
+    if rows1 is None:
+        raise ValueError(f"Invalid age for birth_year filter: {filter_value}")
     
-    average_anxiety_score = filtered_df1["financial_anxiety_score"].mean()
-    scores = _calculate_scores(df_filtered_sheet2)
+    average_anxiety_score = _load_sheet("Sheet1.csv")["financial_anxiety_score"].take(rows1).mean()
+    scores = _score_engine().score(rows2)
 
     return {"scores": scores, "average_anxiety_score": average_anxiety_score}
 
+@RESPONSE_CACHE.cached("group-metrics", _sheets_version)
+def get_group_metrics(filter_by="employment_status"):
+    """Scores and average anxiety for every value of a dimension, computed in one grouped pass."""
+    if filter_by not in SHEET2_COLUMN_MAPPING:
+        raise ValueError(f"Unsupported dimension: {filter_by}")
+    df1 = _load_sheet("Sheet1.csv")
+    df2 = _load_sheet("Sheet2.csv")
+
+    sheet1_column = df1[filter_by]
+    if filter_by == "employment_status":
+        sheet1_column = _normalize_employment_status(sheet1_column)
+    codes1, groups = pd.factorize(sheet1_column, sort=True)
+
+    anxiety = df1["financial_anxiety_score"].to_numpy(dtype=float)
+    has_anxiety = (codes1 >= 0) & ~np.isnan(anxiety)
+    anxiety_sums = np.bincount(codes1[has_anxiety], weights=anxiety[has_anxiety], minlength=len(groups))
+    anxiety_counts = np.bincount(codes1[has_anxiety], minlength=len(groups))
+
+    sheet2_values = pd.Index([SHEET2_VALUE_MAPPING.get(str(value), value) for value in groups])
+    codes2 = sheet2_values.get_indexer(df2[SHEET2_COLUMN_MAPPING[filter_by]])
+    group_scores = _score_engine().score_groups(codes2, len(groups))
+
+    # Keys match the categories served by /data/anxiety_by (ages for birth_year)
+    categories = [2025 - int(value) if filter_by == "birth_year" else value for value in groups]
+    return {
+        "filter_by": filter_by,
+        "categories": categories,
+        "groups": {
+            str(category): {
+                "scores": group_scores[i],
+                "average_anxiety_score": float(anxiety_sums[i] / anxiety_counts[i]) if anxiety_counts[i] else None,
+            }
+            for i, category in enumerate(categories)
+        },
+    }
+
 # --- REFACTORED DATA LOADING AND PROCESSING (FROM NEW CODE) ---
-NEW_DATASET_PATH = os.path.join(
-    os.path.dirname(__file__), "..", "dataset", "dataset_gelarrasa_genzfinancialprofile.csv",
-)
+NEW_DATASET_PATH = os.path.join(DATASET_DIR, "dataset_gelarrasa_genzfinancialprofile.csv")
+REGIONAL_DATASET_PATH = os.path.join(DATASET_DIR, "Dataset Gelarrasa - Regional_Economic_Indicators.csv")
+
+def clean_profile_data(df):
+    """Parses the Rupiah amount columns and normalizes employment status spellings."""
+    cols_to_clean = ["avg_monthly_income", "avg_monthly_expense", "outstanding_loan"]
+    for col in cols_to_clean:
+        if col in df.columns and df[col].dtype == "object":
+            df[col] = df[col].astype(str).str.replace(r"[^\d]", "", regex=True)
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    if "employment_status" in df.columns:
+        df["employment_status"] = df["employment_status"].replace({
+            "Entrepreneur": "Entrepreneur", "entrepreneur": "Entrepreneur", "Enterpreneur": "Entrepreneur", 
+            "enterpreneur": "Entrepreneur", "Not Working": "Not Working", "Student": "Student", 
+            "Private Employee": "Private Employee", "Civil Servant/BUMN": "Civil Servant/BUMN", "Others": "Others",
+        })
+    return df
+
+# Dashboard filter names accepted in query strings, mapped to profile dataset columns
+PROFILE_FILTER_COLUMNS = {
+    "income": "avg_income_category", "expense": "avg_expense_category",
+    "employment_status": "employment_status", "education_level": "education_level",
+    "gender": "gender", "birth_year": "birth_year", "province": "province",
+    "financial_standing": "financial_standing", "main_fintech_app": "main_fintech_app",
+    "investment_type": "investment_type", "loan_usage_purpose": "loan_usage_purpose",
+}
+
+def build_filter_spec(filter_type=None, filter_value=None, filters=None):
+    """Merges the legacy filter_type/filter_value pair and multi-value filters into {column: [values]}."""
+    terms = []
+    if filter_type and filter_value and filter_value != 'All':
+        terms.append((filter_type, [filter_value]))
+    terms.extend((filters or {}).items())
+
+    spec = {}
+    for name, values in terms:
+        column = PROFILE_FILTER_COLUMNS.get(name)
+        values = [value for value in values if value and value != 'All']
+        if column and values:
+            spec.setdefault(column, []).extend(values)
+    return spec
+
+# Above this many filtered rows, loan/income/expense statistics come from merged
+# per-facet sketches (rank error under 1%) unless the request asks for exact=true
+SKETCH_MIN_ROWS = int(os.environ.get("SKETCH_MIN_ROWS", 100_000))
+
+# Numeric columns summarized per facet value; loans count borrowers only, as LoanProcessor does
+SUMMARY_COLUMNS = {
+    "loan": lambda df: df["outstanding_loan"].fillna(0).where(lambda loans: loans > 0),
+    "income": lambda df: df["avg_monthly_income"],
+    "expense": lambda df: df["avg_monthly_expense"],
+}
+SUMMARY_SOURCE_COLUMNS = {"loan": "outstanding_loan", "income": "avg_monthly_income", "expense": "avg_monthly_expense"}
 
 class DataLoader:
-    # This class is from your new, improved codebase and remains unchanged.
+    # Frames come from the shared registry, so loading is free after the first request.
     def __init__(self, csv_path):
         self.csv_path = csv_path
         self.df = None
@@ -273,31 +488,62 @@ class DataLoader:
     def load_data(self):
         if self.df is not None: return self.df
         if not os.path.exists(self.csv_path): raise FileNotFoundError(f"CSV file not found: {self.csv_path}")
-        self.df = pd.read_csv(self.csv_path)
-        cols_to_clean = ["avg_monthly_income", "avg_monthly_expense", "outstanding_loan"]
-        for col in cols_to_clean:
-            if col in self.df.columns and self.df[col].dtype == "object":
-                self.df[col] = self.df[col].astype(str).str.replace(r"[^\d]", "", regex=True)
-                self.df[col] = pd.to_numeric(self.df[col], errors="coerce")
-        if "employment_status" in self.df.columns:
-            self.df["employment_status"] = self.df["employment_status"].replace({
-                "Entrepreneur": "Entrepreneur", "entrepreneur": "Entrepreneur", "Enterpreneur": "Entrepreneur", 
-                "enterpreneur": "Entrepreneur", "Not Working": "Not Working", "Student": "Student", 
-                "Private Employee": "Private Employee", "Civil Servant/BUMN": "Civil Servant/BUMN", "Others": "Others",
-            })
+        self.df = DATASETS.get(self.csv_path, clean_profile_data)
         return self.df
 
-    def _get_filtered_df(self, filter_type=None, filter_value=None):
+    def _bitmap_index(self):
         if self.df is None: self.load_data()
-        if not filter_type or not filter_value or filter_value == 'All': return self.df.copy()
-        if filter_type == 'income': return self.df[self.df['avg_income_category'] == filter_value].copy()
-        if filter_type == 'expense': return self.df[self.df['avg_expense_category'] == filter_value].copy()
-        return self.df.copy()
+        return DATASETS.derived(
+            f"bitmap_index:{self.csv_path}", lambda df: BitmapIndex(df, set(PROFILE_FILTER_COLUMNS.values())), self.df,
+        )
+
+    def _get_filtered_df(self, filter_type=None, filter_value=None, filters=None, op="and", columns=None):
+        """
+        Rows matching the filters, restricted to ``columns`` when given.
+
+        Without filters or columns the shared frame itself is returned, so callers must not modify it.
+        """
+        return self._take(self._filtered_rows(filter_type, filter_value, filters, op), columns)
 
+    def _filtered_rows(self, filter_type=None, filter_value=None, filters=None, op="and"):
+        """Row positions matching the filters, or None when there is no filter (every row)."""
+        if self.df is None: self.load_data()
+        spec = build_filter_spec(filter_type, filter_value, filters)
+        if not spec:
+            return None
+        with phase("filter") as timed_filter:
+            rows = self._bitmap_index().query(spec, op)
+            timed_filter.rows = len(rows)
+        return rows
+
+    def _take(self, rows, columns=None):
+        if self.df is None: self.load_data()
+        with phase("take") as timed_take:
+            df = self.df if columns is None else self.df[columns]
+            df = df if rows is None else df.take(rows)
+            timed_take.rows = len(df)
+        return df
+
+    def _loan_bucket_codes(self, rows=None):
+        """Loan bucket of every row, assigned once per dataset version; ``rows`` selects a subset."""
+        if self.df is None: self.load_data()
+        codes = DATASETS.derived(
+            f"loan_bucket_codes:{self.csv_path}", lambda df: BUCKETER.codes(df["outstanding_loan"]), self.df,
+        )
+        return codes if rows is None else codes[rows]
+
+    def _group_codes(self, column):
+        """(codes, sorted distinct values) of a column, factorized once per dataset version."""
+        if self.df is None: self.load_data()
+        return DATASETS.derived(
+            f"group_codes:{self.csv_path}:{column}", lambda df: pd.factorize(df[column], sort=True), self.df,
+        )
+
+    @timed("aggregate", rows=lambda loader: len(loader.df))
     def get_chart_data(self):
         if self.df is None: self.load_data()
-        income_counts = self.df["avg_income_category"].value_counts()
-        expense_counts = self.df["avg_expense_category"].value_counts()
+        income_counts = value_counts(self.df["avg_income_category"])
+        expense_counts = value_counts(self.df["avg_expense_category"])
         income_pct = (income_counts / income_counts.sum() * 100).round(2)
         expense_pct = (expense_counts / expense_counts.sum() * 100).round(2)
         viz_data = pd.DataFrame({
@@ -312,13 +558,17 @@ class DataLoader:
             "expense_counts": viz_data["Expense_Count"].astype(int).tolist(),
         }
 
-    def get_filtered_profession_chart_data(self, filter_type=None, filter_value=None):
-        df_filtered = self._get_filtered_df(filter_type, filter_value)
+    def get_filtered_profession_chart_data(self, filter_type=None, filter_value=None, filters=None, op="and"):
+        df_filtered = self._get_filtered_df(filter_type, filter_value, filters, op, columns=["employment_status", "financial_standing"])
+        return self._profession_chart_data(df_filtered)
+
+    @timed("aggregate", rows=lambda loader, df_filtered: len(df_filtered))
+    def _profession_chart_data(self, df_filtered):
         if df_filtered.empty or "employment_status" not in df_filtered.columns or "financial_standing" not in df_filtered.columns:
             return {"categories": [], "data": {}, "colors": {}, "total_counts": {}, "total_respondents": 0}
         counts_df = pd.crosstab(df_filtered['employment_status'], df_filtered['financial_standing'])
         profession_standing = counts_df.div(counts_df.sum(axis=1), axis=0).fillna(0) * 100
-        employment_counts = df_filtered['employment_status'].value_counts()
+        employment_counts = value_counts(df_filtered['employment_status'])
         profession_standing = profession_standing.reindex(employment_counts.index)
         categories = profession_standing.index.tolist()
         colors = {"Surplus": "#2ecc71", "Break-even": "#f39c12", "Deficit": "#e74c3c"}
@@ -331,8 +581,12 @@ class DataLoader:
             chart_data["data"][standing] = profession_standing[standing].round(1).tolist() if standing in profession_standing.columns else [0] * len(categories)
         return chart_data
 
-    def get_filtered_education_chart_data(self, filter_type=None, filter_value=None):
-        df_filtered = self._get_filtered_df(filter_type, filter_value)
+    def get_filtered_education_chart_data(self, filter_type=None, filter_value=None, filters=None, op="and"):
+        df_filtered = self._get_filtered_df(filter_type, filter_value, filters, op, columns=["education_level", "financial_standing"])
+        return self._education_chart_data(df_filtered)
+
+    @timed("aggregate", rows=lambda loader, df_filtered: len(df_filtered))
+    def _education_chart_data(self, df_filtered):
         if df_filtered.empty or "education_level" not in df_filtered.columns or "financial_standing" not in df_filtered.columns:
             return {"categories": [], "data": {}, "colors": {}, "total_counts": {}, "total_respondents": 0}
         education_order = [
@@ -343,7 +597,7 @@ class DataLoader:
         education_standing = counts_df.div(counts_df.sum(axis=1), axis=0).fillna(0) * 100
         existing_education = [edu for edu in education_order if edu in education_standing.index]
         education_standing = education_standing.reindex(existing_education)
-        education_counts = df_filtered["education_level"].value_counts()
+        education_counts = value_counts(df_filtered["education_level"])
         categories = education_standing.index.tolist()
         colors = {"Surplus": "#2ecc71", "Break-even": "#f39c12", "Deficit": "#e74c3c"}
         chart_data = {
@@ -355,51 +609,194 @@ class DataLoader:
             chart_data["data"][standing] = education_standing[standing].round(1).tolist() if standing in education_standing.columns else [0] * len(categories)
         return chart_data
 
-    def get_filtered_loan_overview(self, filter_type=None, filter_value=None):
-        filtered_df = self._get_filtered_df(filter_type, filter_value)
-        return LoanProcessor(filtered_df).get_filtered_loan_data(filter_type, filter_value)
+    def _summary_index(self):
+        if self.df is None: self.load_data()
+        return DATASETS.derived(
+            f"summary_index:{self.csv_path}",
+            lambda df: SummaryIndex(df, SUMMARY_COLUMNS, set(PROFILE_FILTER_COLUMNS.values())), self.df,
+        )
+
+    def _sketch_summary(self, name, spec, n_rows, exact=None):
+        """Merged per-facet sketch for a filter spec, or None when statistics should be computed exactly."""
+        if exact or (exact is None and n_rows < SKETCH_MIN_ROWS):
+            return None
+        return self._summary_index().lookup(name, spec)
+
+    def get_filtered_loan_overview(self, filter_type=None, filter_value=None, filters=None, op="and", exact=None):
+        rows = self._filtered_rows(filter_type, filter_value, filters, op)
+        filtered_df = self._take(rows, ["outstanding_loan"])
+        summary = self._sketch_summary("loan", build_filter_spec(filter_type, filter_value, filters), len(filtered_df), exact)
+        processor = LoanProcessor(filtered_df, bucket_codes=self._loan_bucket_codes(rows))
+        return processor.get_filtered_loan_data(filter_type, filter_value, summary)
+
+    def get_loan_distribution_by(self, group_by, filter_type=None, filter_value=None, filters=None, op="and"):
+        """Loan bucket counts for every value of a grouping column, from the cached bucket codes."""
+        if group_by not in PROFILE_FILTER_COLUMNS:
+            raise ValueError(f"Unsupported grouping: {group_by}")
+        rows = self._filtered_rows(filter_type, filter_value, filters, op)
+        group_codes, groups = self._group_codes(PROFILE_FILTER_COLUMNS[group_by])
+        if rows is not None:
+            group_codes = group_codes[rows]
+        counts = BUCKETER.group_counts(self._loan_bucket_codes(rows), group_codes, len(groups))
+        totals = np.bincount(group_codes[group_codes >= 0], minlength=len(groups))
+        return {
+            "group_by": group_by,
+            "categories": BUCKETER.names,
+            "colors": [category["color"] for category in LoanProcessor.LOAN_CATEGORIES],
+            "groups": [
+                {
+                    "value": value, "total": int(total), "counts": group_counts.tolist(),
+                    "percentages": [round(count / total * 100, 1) for count in group_counts],
+                }
+                for value, total, group_counts in zip(groups.tolist(), totals, counts) if total > 0
+            ],
+        }
 
-    def get_filtered_loan_purpose_data(self, filter_type=None, filter_value=None):
-        filtered_df = self._get_filtered_df(filter_type, filter_value)
+    def get_column_summary(self, name, filter_type=None, filter_value=None, filters=None, op="and", exact=None):
+        if self.df is None: self.load_data()
+        spec = build_filter_spec(filter_type, filter_value, filters)
+        n_rows = self._bitmap_index().count(spec, op) if spec else len(self.df)
+        summary = self._sketch_summary(name, spec, n_rows, exact)
+        if summary is not None:
+            return summary.describe()
+        filtered_df = self._get_filtered_df(filter_type, filter_value, filters, op, columns=[SUMMARY_SOURCE_COLUMNS[name]])
+        return describe_exact(SUMMARY_COLUMNS[name](filtered_df))
+
+    def get_filtered_loan_purpose_data(self, filter_type=None, filter_value=None, filters=None, op="and"):
+        filtered_df = self._get_filtered_df(filter_type, filter_value, filters, op, columns=["outstanding_loan", "loan_usage_purpose"])
         return LoanProcessor(filtered_df).get_loan_purpose_distribution()
 
-    def get_filtered_engagement_data(self, filter_type=None, filter_value=None):
-        baseline_df = self._get_filtered_df()
-        filtered_df = self._get_filtered_df(filter_type, filter_value)
-        baseline_data = EngagementProcessor(baseline_df).get_engagement_distribution()
-        filtered_data = EngagementProcessor(filtered_df).get_engagement_distribution()
+    def get_filtered_engagement_data(self, filter_type=None, filter_value=None, filters=None, op="and", points=DEFAULT_KDE_POINTS):
+        if not build_filter_spec(filter_type, filter_value, filters):
+            return self._engagement_data(None, points)
+        filtered_df = self._get_filtered_df(filter_type, filter_value, filters, op, columns=["digital_time_spent_per_day"])
+        return self._engagement_data(filtered_df, points)
+
+    def _engagement_baseline(self, points=DEFAULT_KDE_POINTS):
+        """Histogram and KDE of the whole dataset, computed once per dataset version and curve resolution."""
+        if self.df is None: self.load_data()
+        points = clamp_kde_points(points)
+        return DATASETS.derived(
+            f"engagement_baseline:{self.csv_path}:{points}",
+            lambda df: EngagementProcessor(df, points).get_engagement_distribution(), self.df,
+        )
+
+    def _engagement_data(self, filtered_df, points=DEFAULT_KDE_POINTS):
+        """``filtered_df`` of None means the unfiltered dataset, served entirely from the cached baseline."""
+        baseline_data = self._engagement_baseline(points)
+        if filtered_df is None:
+            filtered_data = baseline_data
+        else:
+            filtered_data = EngagementProcessor(filtered_df, points).get_engagement_distribution()
         return {"filtered_data": filtered_data, "baseline_kde": baseline_data["kde"]}
     
-def get_visual_analytics_data():
+def _render_visual_analytics(df):
+    """Builds the index-page figures once, as HTML fragments and as figure JSON."""
     loader = DataLoader(NEW_DATASET_PATH)
+    loader.df = df
     chart_data = loader.get_chart_data()
     profession_data = loader.get_filtered_profession_chart_data()
     education_data = loader.get_filtered_education_chart_data()
-    return {
-        "chart_html": ChartGenerator.create_diverging_bar_chart(chart_data),
-        "profession_chart": ChartGenerator.create_profession_chart(profession_data),
-        "education_chart": ChartGenerator.create_education_chart(education_data),
-    }
+    figures = EXECUTOR.gather({
+        ("html", "chart_html"): Task(ChartGenerator.create_diverging_bar_chart, chart_data, process=True),
+        ("html", "profession_chart"): Task(ChartGenerator.create_profession_chart, profession_data, process=True),
+        ("html", "education_chart"): Task(ChartGenerator.create_education_chart, education_data, process=True),
+        ("json", "chart_html"): Task(ChartGenerator.create_diverging_bar_chart_json, chart_data, process=True),
+        ("json", "profession_chart"): Task(ChartGenerator.create_profession_chart_json, profession_data, process=True),
+        ("json", "education_chart"): Task(ChartGenerator.create_education_chart_json, education_data, process=True),
+    })
+    rendered = {"html": {}, "json": {}}
+    for (output, name), figure in figures.items():
+        rendered[output][name] = figure
+    return rendered
+
+def get_visual_analytics_data(output="html"):
+    """Pre-rendered index-page charts ("html" fragments or figure "json"), rebuilt only when the profile dataset changes."""
+    if output not in ("html", "json"):
+        raise ValueError(f"Unsupported chart output: {output}")
+    df = DataLoader(NEW_DATASET_PATH).load_data()
+    return DATASETS.derived("visual_analytics", _render_visual_analytics, df)[output]
+
+def prerender_visual_analytics():
+    """Renders the index-page charts ahead of the first request."""
+    get_visual_analytics_data()
+
+@RESPONSE_CACHE.cached("loan-filtered", _profile_version)
+def get_filtered_loan_data(filter_type, filter_value, filters=None, op="and", exact=None):
+    loader = DataLoader(NEW_DATASET_PATH)
+    return loader.get_filtered_loan_overview(filter_type, filter_value, filters, op, exact)
+
+@RESPONSE_CACHE.cached("column-summary", _profile_version)
+def get_column_summary(name, filter_type=None, filter_value=None, filters=None, op="and", exact=None):
+    """Count, moments, median, percentiles and mode of loan/income/expense for a filter spec."""
+    if name not in SUMMARY_COLUMNS:
+        raise ValueError(f"Unknown summary column: {name}")
+    loader = DataLoader(NEW_DATASET_PATH)
+    return loader.get_column_summary(name, filter_type, filter_value, filters, op, exact)
+
+@RESPONSE_CACHE.cached("loan-distribution-by", _profile_version)
+def get_loan_distribution_by(group_by, filter_type=None, filter_value=None, filters=None, op="and"):
+    loader = DataLoader(NEW_DATASET_PATH)
+    return loader.get_loan_distribution_by(group_by, filter_type, filter_value, filters, op)
 
-def get_filtered_loan_data(filter_type, filter_value):
+@RESPONSE_CACHE.cached("loan-purpose", _profile_version)
+def get_loan_purpose_data(filter_type, filter_value, filters=None, op="and"):
     loader = DataLoader(NEW_DATASET_PATH)
-    return loader.get_filtered_loan_overview(filter_type, filter_value)
+    return loader.get_filtered_loan_purpose_data(filter_type, filter_value, filters, op)
 
-def get_loan_purpose_data(filter_type, filter_value):
+@RESPONSE_CACHE.cached("digital-time", _profile_version)
+def get_digital_time_data(filter_type, filter_value, filters=None, op="and", points=DEFAULT_KDE_POINTS):
     loader = DataLoader(NEW_DATASET_PATH)
-    return loader.get_filtered_loan_purpose_data(filter_type, filter_value)
+    return loader.get_filtered_engagement_data(filter_type, filter_value, filters, op, clamp_kde_points(points))
 
-def get_digital_time_data(filter_type, filter_value):
+@RESPONSE_CACHE.cached("profession-chart", _profile_version)
+def get_profession_data(filter_type, filter_value, filters=None, op="and"):
     loader = DataLoader(NEW_DATASET_PATH)
-    return loader.get_filtered_engagement_data(filter_type, filter_value)
+    return loader.get_filtered_profession_chart_data(filter_type, filter_value, filters, op)
 
-def get_profession_data(filter_type, filter_value):
+@RESPONSE_CACHE.cached("education-chart", _profile_version)
+def get_education_data(filter_type, filter_value, filters=None, op="and"):
     loader = DataLoader(NEW_DATASET_PATH)
-    return loader.get_filtered_profession_chart_data(filter_type, filter_value)
+    return loader.get_filtered_education_chart_data(filter_type, filter_value, filters, op)
 
-def get_education_data(filter_type, filter_value):
+# Every column read by the dashboard panels, so a batch request materializes them once
+DASHBOARD_COLUMNS = [
+    "employment_status", "education_level", "financial_standing", "outstanding_loan",
+    "loan_usage_purpose", "digital_time_spent_per_day",
+]
+
+@RESPONSE_CACHE.cached("dashboard-state", _profile_version)
+def get_dashboard_state(filter_type=None, filter_value=None, filters=None, op="and", parallel=False, exact=None):
+    """
+    Every dashboard panel for one filter spec, computed from a single filtered subset.
+
+    Loan statistics come from the same per-facet sketches as /api/loan-filtered (``exact`` as there),
+    so both agree for a filter spec and large subsets are not sorted.
+    """
     loader = DataLoader(NEW_DATASET_PATH)
-    return loader.get_filtered_education_chart_data(filter_type, filter_value)
+    rows = loader._filtered_rows(filter_type, filter_value, filters, op)
+    subset = loader._take(rows, DASHBOARD_COLUMNS)
+    unfiltered = rows is None
+
+    def loan_panel():
+        spec = build_filter_spec(filter_type, filter_value, filters)
+        summary = loader._sketch_summary("loan", spec, len(subset), exact)
+        processor = LoanProcessor(subset, bucket_codes=loader._loan_bucket_codes(rows))
+        return processor.get_filtered_loan_data(filter_type, filter_value, summary)
+
+    panels = {
+        "loan": loan_panel,
+        "loan_purpose": lambda: LoanProcessor(subset).get_loan_purpose_distribution(),
+        "digital_time": lambda: loader._engagement_data(None if unfiltered else subset),
+        "profession_chart": lambda: loader._profession_chart_data(subset),
+        "education_chart": lambda: loader._education_chart_data(subset),
+    }
+    if parallel:
+        state = EXECUTOR.gather(panels)
+    else:
+        state = {name: build() for name, build in panels.items()}
+    state["filter"] = {"filter_type": filter_type, "filter_value": filter_value, "filters": filters or {}, "op": op}
+    return state
 
 def clean_regional_data(df):
     df = df.rename(columns={
@@ -420,61 +817,262 @@ def clean_regional_data(df):
         df[col] = pd.to_numeric(df[col], errors="coerce")
     return df
 
+# Per-province means and modes for the map panel, from one grouped count table per categorical column
+FINANCIAL_AGGREGATOR = RegionalAggregator(
+    "province",
+    mean_columns=["avg_monthly_income (INT)", "avg_monthly_expense (INT)", "financial_anxiety_score", "digital_time_spent_per_day"],
+    mode_columns=["main_fintech_app", "investment_type"],
+    share_columns=["main_fintech_app"],
+)
+
 def clean_and_aggregate_financial_data(df):
-    numeric_cols = ["avg_monthly_income (INT)", "avg_monthly_expense (INT)", "financial_anxiety_score", "digital_time_spent_per_day"]
-    for col in numeric_cols: df[col] = pd.to_numeric(df[col], errors="coerce")
-    agg_functions = {
-        "avg_monthly_income (INT)": "mean", "avg_monthly_expense (INT)": "mean",
-        "financial_anxiety_score": "mean", "digital_time_spent_per_day": "mean",
-        "main_fintech_app": lambda x: x.mode().iloc[0] if not x.mode().empty else None,
-        "investment_type": lambda x: x.mode().iloc[0] if not x.mode().empty else None,
-    }
-    agg_df = df.groupby("province").agg(agg_functions).reset_index()
-    fintech_percentage = []
-    for province in agg_df["province"]:
-        province_data = df[df["province"] == province]
-        if not province_data.empty:
-            most_popular_app = province_data["main_fintech_app"].mode().iloc[0] if not province_data["main_fintech_app"].mode().empty else None
-            if most_popular_app:
-                percentage = ((province_data["main_fintech_app"] == most_popular_app).sum() / len(province_data) * 100)
-                fintech_percentage.append(round(percentage, 1))
-            else: fintech_percentage.append(0)
-        else: fintech_percentage.append(0)
-    agg_df["fintech_percentage"] = fintech_percentage
+    agg_df = FINANCIAL_AGGREGATOR.aggregate(df)
     agg_df = agg_df.rename(columns={
         "province": "provinsi", "avg_monthly_income (INT)": "avg_income", "avg_monthly_expense (INT)": "avg_expense",
         "financial_anxiety_score": "avg_anxiety_score", "digital_time_spent_per_day": "avg_digital_time",
         "main_fintech_app": "mode_fintech_app", "investment_type": "mode_investment_type",
+        "main_fintech_app_share": "fintech_percentage",
     })
     agg_df["financial_balance"] = agg_df["avg_income"] - agg_df["avg_expense"]
     for col in ["avg_income", "avg_expense", "avg_anxiety_score", "avg_digital_time", "financial_balance"]:
         agg_df[col] = agg_df[col].round(2)
     return agg_df
 
+@RESPONSE_CACHE.cached("regional-data", _regional_version)
 def get_regional_data_from_file():
     try:
-        df = pd.read_csv(os.path.join(os.path.dirname(__file__), "..", "dataset", "Dataset Gelarrasa - Regional_Economic_Indicators.csv"))
-        df_cleaned = clean_regional_data(df)
-        df_final = df_cleaned.replace({np.nan: None})
-        return df_final.to_dict(orient="records")
+        df_cleaned = DATASETS.get(REGIONAL_DATASET_PATH, clean_regional_data)
+        return frame_records_json(df_cleaned)
     except FileNotFoundError:
         return {"error": "File Regional_Economic_Indicators.csv tidak ditemukan"}, 404
     except Exception as e:
         return {"error": str(e)}, 500
 
-def get_financial_data_from_file(filter_type=None, filter_value=None):
+def _financial_profile_records(df):
+    """Per-province financial profile records for an already filtered profile frame."""
+    if df.empty: return []
+    df_renamed = df.rename(columns={
+        "avg_monthly_income": "avg_monthly_income (INT)",
+        "avg_monthly_expense": "avg_monthly_expense (INT)",
+    })
+    df_agg = clean_and_aggregate_financial_data(df_renamed)
+    return frame_records_json(df_agg)
+
+# Columns read by clean_and_aggregate_financial_data
+FINANCIAL_PROFILE_COLUMNS = [
+    "province", "avg_monthly_income", "avg_monthly_expense", "financial_anxiety_score",
+    "digital_time_spent_per_day", "main_fintech_app", "investment_type",
+]
+
+@RESPONSE_CACHE.cached("financial-profile", _profile_version)
+def get_financial_data_from_file(filter_type=None, filter_value=None, filters=None, op="and"):
     try:
         loader = DataLoader(NEW_DATASET_PATH)
-        df = loader._get_filtered_df(filter_type, filter_value)
-        if df.empty: return []
-        df_renamed = df.rename(columns={
-            "avg_monthly_income": "avg_monthly_income (INT)",
-            "avg_monthly_expense": "avg_monthly_expense (INT)",
-        })
-        df_agg = clean_and_aggregate_financial_data(df_renamed)
-        df_final = df_agg.replace({np.nan: None})
-        return df_final.to_dict(orient="records")
+        df = loader._get_filtered_df(filter_type, filter_value, filters, op, columns=FINANCIAL_PROFILE_COLUMNS)
+        return _financial_profile_records(df)
     except FileNotFoundError:
         return {"error": "File dataset_gelarrasa_genzfinancialprofile.csv tidak ditemukan"}, 404
     except Exception as e:
-        return {"error": str(e)}, 500
\ No newline at end of file
+        return {"error": str(e)}, 500
+
+# --- Map geometry: simplified, precompressed province shapes per resolution ---
+GEOJSON_PATH = os.path.join(os.path.dirname(__file__), "static", "indonesia-38-provinsi.geojson")
+GEO_ASSETS = GeoAssetStore(
+    GEOJSON_PATH, os.environ.get("GEO_CACHE_DIR", os.path.join(DATASET_DIR, ".cache", "geo")),
+)
+
+def get_geo_manifest():
+    """Built map asset file names and sizes per resolution and format (built on first call)."""
+    assets = GEO_ASSETS.manifest()["assets"]
+    return {
+        "default": DEFAULT_GEO_RESOLUTION,
+        "resolutions": {
+            name: {fmt: dict(entry) for fmt, entry in formats.items()} for name, formats in assets.items()
+        },
+    }
+
+def get_geo_asset(resolution, fmt="geojson"):
+    """Manifest entry of one map resolution; raises ValueError for unknown names."""
+    return GEO_ASSETS.asset(resolution, fmt)
+
+# --- Static files: fingerprinted, precompressed copies served under /assets/ ---
+STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+ASSET_URL_PREFIX = "/assets/"
+STATIC_ASSETS = StaticAssetManifest(
+    STATIC_DIR,
+    os.environ.get("ASSET_BUILD_DIR", os.path.join(DATASET_DIR, ".cache", "static")),
+    directories=("js", "css", "logos"),
+    url_prefix=ASSET_URL_PREFIX,
+)
+
+# --- Compact in-memory storage of the survey frames ---
+# Text columns with a small vocabulary, shared by Sheet1 and the profile dataset
+# (whose income/expense amounts are numeric after clean_profile_data)
+PROFILE_CATEGORICAL_COLUMNS = [
+    "gender", "province", "education_level", "employment_status", "avg_income_category",
+    "avg_expense_category", "financial_standing", "main_fintech_app", "ewallet_spending",
+    "investment_type", "loan_usage_purpose",
+]
+SHEET2_CATEGORICAL_COLUMNS = [
+    "Gender", "Province of Origin", "Random_Code", "Residence Status", "Last Education", "Job",
+    "Marital Status", "Est. Monthly Income", "Est. Monthly Expenditure",
+]
+DATASET_SCHEMAS = {
+    os.path.join(DATASET_DIR, "Sheet1.csv"): FrameSchema(
+        PROFILE_CATEGORICAL_COLUMNS + ["avg_monthly_income", "avg_monthly_expense"],
+    ),
+    os.path.join(DATASET_DIR, "Sheet2.csv"): FrameSchema(
+        SHEET2_CATEGORICAL_COLUMNS, likert=[q for config in METRICS_CONFIG.values() for q in config["questions"]],
+    ),
+    NEW_DATASET_PATH: FrameSchema(PROFILE_CATEGORICAL_COLUMNS),
+}
+
+# COMPACT_FRAMES=0 keeps pandas' default object/int64/float64 columns
+if os.environ.get("COMPACT_FRAMES", "1") != "0":
+    for _path, _schema in DATASET_SCHEMAS.items():
+        DATASETS.use_schema(_path, _schema)
+
+def get_memory_report():
+    """Bytes held by every loaded dataset frame, per column, against the uncompacted layout."""
+    return memory_report(DATASETS.frames())
+
+# --- Incremental ingestion of new survey responses ---
+# Profile rows are validated against the Sheet1 schema, which they share.
+INGEST_TARGETS = {
+    "sheet1": {"path": os.path.join(DATASET_DIR, "Sheet1.csv"), "cleaner": None, "schema": "Sheet1.csv"},
+    "sheet2": {"path": os.path.join(DATASET_DIR, "Sheet2.csv"), "cleaner": None, "schema": "Sheet2.csv"},
+    "profile": {"path": NEW_DATASET_PATH, "cleaner": clean_profile_data, "schema": "Sheet1.csv"},
+}
+
+def _sheet1_schema(df1):
+    categories = DataLoader(NEW_DATASET_PATH).category_order
+    return TableSchema.from_frame(
+        df1,
+        choices={
+            "avg_income_category": categories, "avg_expense_category": categories,
+            "financial_anxiety_score": range(1, 6),
+        },
+        ranges={"digital_time_spent_per_day": (0, 24), "outstanding_loan": (0, float("inf"))},
+    )
+
+def _sheet2_schema(df2):
+    likert = [q for config in METRICS_CONFIG.values() for q in config["questions"] if q in df2.columns]
+    return TableSchema.from_frame(
+        df2, choices={q: (1, 2, 3, 4) for q in likert}, missing={q: LIKERT_MISSING for q in likert},
+    )
+
+def _ingest_schema(dataset):
+    sheet = INGEST_TARGETS[dataset]["schema"]
+    builder = _sheet1_schema if sheet == "Sheet1.csv" else _sheet2_schema
+    return DATASETS.derived(f"schema:{sheet}", builder, _load_sheet(sheet))
+
+def _loan_bucket_counts(df):
+    distribution = LoanProcessor(df).get_loan_distribution()
+    return dict(zip(distribution["categories"], distribution["counts"]))
+
+def _respondent_scores(df):
+    engine = ScoreEngine(df, METRICS_CONFIG, NEGATIVE_POLARITY_QUESTIONS)
+    return engine.metrics, engine.respondent_means()
+
+def _new_running_aggregates(dataset):
+    if dataset == "sheet2":
+        return RunningAggregates(
+            counts={"job": "Job", "last_education": "Last Education", "gender": "Gender"},
+            scorer=_respondent_scores,
+        )
+    return RunningAggregates(
+        stats=["financial_anxiety_score", "digital_time_spent_per_day"],
+        counts={"income": "avg_income_category", "expense": "avg_expense_category", "loan": _loan_bucket_counts},
+        crosstabs=[("employment_status", "financial_standing"), ("education_level", "financial_standing")],
+    )
+
+_INGEST_LOCK = threading.Lock()
+_RUNNING_AGGREGATES = {}
+
+def _running_aggregates(dataset):
+    """Aggregates of the dataset's current frame; rebuilt from scratch only when the file was reloaded. Caller holds _INGEST_LOCK."""
+    target = INGEST_TARGETS[dataset]
+    df = DATASETS.get(target["path"], target["cleaner"])
+    entry = _RUNNING_AGGREGATES.get(dataset)
+    if entry is None or entry[0] is not df:
+        aggregates = _new_running_aggregates(dataset)
+        aggregates.update(df)
+        entry = (df, aggregates)
+        _RUNNING_AGGREGATES[dataset] = entry
+    return entry[1]
+
+def ingest_rows(dataset, records, persist=False):
+    """
+    Validates new survey rows and appends them to a loaded dataset.
+
+    Only the running aggregates (/api/live-aggregates) are updated incrementally. Each batch
+    copies the shared frame (O(rows) per batch) and changes the dataset version, so every
+    derived artifact of the dataset (score engine, facet/bitmap/summary indexes, answer
+    distributions, charts) and every cached response reading it is rebuilt on next use:
+    batch rows rather than sending them one at a time. ``persist`` also appends them to the CSV.
+    Raises SchemaError (a ValueError) listing invalid values, ValueError for an unknown dataset.
+    """
+    if dataset not in INGEST_TARGETS:
+        raise ValueError(f"Unknown dataset: {dataset}")
+    target = INGEST_TARGETS[dataset]
+    rows = _ingest_schema(dataset).validate(records)
+
+    with _INGEST_LOCK:
+        aggregates = _running_aggregates(dataset)
+        if len(rows):
+            df = DATASETS.append(target["path"], rows, target["cleaner"], persist=persist)
+            aggregates.update(df.iloc[len(df) - len(rows):])
+            _RUNNING_AGGREGATES[dataset] = (df, aggregates)
+        return {
+            "dataset": dataset,
+            "accepted": len(rows),
+            "rows": aggregates.rows,
+            "version": DATASETS.version(target["path"], target["cleaner"]),
+        }
+
+def get_live_aggregates(dataset=None):
+    """Running aggregates of every ingestable dataset (or one), current as of the last ingested row."""
+    if dataset is not None and dataset not in INGEST_TARGETS:
+        raise ValueError(f"Unknown dataset: {dataset}")
+    with _INGEST_LOCK:
+        result = {}
+        for name in [dataset] if dataset else INGEST_TARGETS:
+            target = INGEST_TARGETS[name]
+            snapshot = _running_aggregates(name).snapshot(ScoreEngine.to_percent)
+            snapshot["version"] = DATASETS.version(target["path"], target["cleaner"])
+            result[name] = snapshot
+        return result
+
+# --- Warm-up: per-process work done by create_app before the worker serves requests ---
+def _warm_datasets():
+    """Reads and cleans every dataset into the registry (or from the columnar cache)."""
+    _load_sheet("Sheet1.csv")
+    _load_sheet("Sheet2.csv")
+    DataLoader(NEW_DATASET_PATH).load_data()
+    DATASETS.get(REGIONAL_DATASET_PATH, clean_regional_data)
+
+def _warm_indexes():
+    """Builds the derived structures the first filtered requests would otherwise build."""
+    _score_engine()
+    _answer_distribution()
+    loader = DataLoader(NEW_DATASET_PATH)
+    loader._bitmap_index()
+    loader._summary_index()
+    loader._loan_bucket_codes()
+    loader._engagement_baseline()
+
+def _warm_assets():
+    """Builds the fingerprinted static files and, when possible, the simplified map assets."""
+    STATIC_ASSETS.manifest()
+    try:
+        GEO_ASSETS.manifest()
+    except RuntimeError:
+        pass  # the map falls back to the raw GeoJSON, as on a request
+
+# Warm-up step name -> function, in the order they are best run
+WARMUP_STEPS = {
+    "datasets": _warm_datasets,
+    "indexes": _warm_indexes,
+    "charts": prerender_visual_analytics,
+    "assets": _warm_assets,
+}
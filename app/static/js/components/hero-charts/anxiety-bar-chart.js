@@ -12,6 +12,7 @@ function initAnxietyBarChart() {
     const state = {
         selectedFilter: null, // {category, value, pointIndex}
         currentFilterCategory: 'employment_status', // Default category
+        groupMetrics: null, // Prefetched scores for every category, keyed by category value
     };
 
     // 4. Get the chart configuration.
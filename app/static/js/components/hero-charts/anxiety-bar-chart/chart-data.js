@@ -95,6 +95,17 @@ function resetAllData() {
 function updateChart(chart, state, filterBy) {
     state.currentFilterCategory = filterBy;
     state.selectedFilter = null; // Reset selection when the category changes.
+    state.groupMetrics = null;
+
+    // Prefetch the scores of every category in one round trip so clicks are instant.
+    fetch(`/api/group_metrics/${filterBy}`)
+        .then(response => response.json())
+        .then(data => {
+            if (state.currentFilterCategory === filterBy && data.groups) {
+                state.groupMetrics = data.groups;
+            }
+        })
+        .catch(error => console.error('Error prefetching group metrics:', error));
 
     fetch(`/data/anxiety_by/${filterBy}`)
         .then(response => response.json())
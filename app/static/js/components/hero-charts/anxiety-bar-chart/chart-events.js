@@ -40,10 +40,14 @@ function chartClickHandler() {
         });
         chart.redraw();
 
-        // 7. Fetch filtered data from the server.
+        // 7. Use the prefetched group metrics, falling back to the server if they are not loaded yet.
         const safeValue = normalizeFilterValue(state.currentFilterCategory, clickedCategory);
-        fetch(`/api/filter_metrics/${state.currentFilterCategory}/${encodeURIComponent(safeValue)}`)
-            .then(response => response.json())
+        const prefetched = state.groupMetrics && state.groupMetrics[String(safeValue)];
+        const metricsRequest = prefetched
+            ? Promise.resolve(prefetched)
+            : fetch(`/api/filter_metrics/${state.currentFilterCategory}/${encodeURIComponent(safeValue)}`)
+                .then(response => response.json());
+        metricsRequest
             .then(data => {
                 // Update all cards through a single, consistent function
                 updateAllScoreCards(data.scores, false);
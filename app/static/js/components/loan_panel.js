@@ -102,10 +102,41 @@ function renderLoanPurposeChart(data, filterType, filterValue) {
     renderLegend('loan-purpose-legend', labels, purposeColorMapping);
 }
 
+function renderLoanOverview(data, filterValue) {
+    const titleEl = document.getElementById('loan-overview-title');
+    if (titleEl) {
+        if (data.filter_type && data.filter_value !== 'All') {
+            const typeText = data.filter_type.charAt(0).toUpperCase() + data.filter_type.slice(1);
+            titleEl.innerHTML = `<i class="fas fa-hand-holding-usd"></i> Tinjauan Pinjaman Aktif
+            <br><small style="font-size: 0.7rem; color: #5E6573; font-weight: 500;">
+                ${data.total_respondents} Responden untuk ${data.filter_value} (${typeText})
+            </small>`;
+        } else {
+            titleEl.innerHTML = `<i class="fas fa-hand-holding-usd"></i> Tinjauan Pinjaman Aktif`;
+        }
+    }
+
+    // --- MODIFIED SECTION START ---
+    // Update 'Total with Loans' KPI to show fraction
+    const totalWithLoansValue = `${data.with_loan} / ${data.total_respondents}`;
+    const totalWithLoansSubtext = `${data.with_loan_pct}% memiliki pinjaman`;
+    updateKPICard('loan-total-value', totalWithLoansValue);
+    updateKPICard('loan-total-subtext', totalWithLoansSubtext);
+    // --- MODIFIED SECTION END ---
+
+    // Update other KPI cards
+    updateKPICard('loan-avg-value', formatCurrency(data.mean));
+    updateKPICard('loan-third-label', 'Total Pinjaman Aktif');
+    updateKPICard('loan-third-value', formatCurrency(data.total_outstanding));
+    updateKPICard('loan-third-subtext', filterValue && filterValue !== 'All' ? `Di ${filterValue}` : 'Jumlah semua pinjaman');
+    updateKPICard('loan-max-value', formatCurrency(data.max));
+
+    renderLoanChart(data);
+}
+
 function updateLoanPanel(filterType, filterValue) {
     const kpiContainer = document.querySelector('.loan-kpi-cards');
     const chartContainer = document.querySelector('#loan-overview-chart').parentElement;
-    const titleEl = document.getElementById('loan-overview-title');
     if (kpiContainer) kpiContainer.classList.add('is-loading');
     if (chartContainer) chartContainer.classList.add('is-loading');
 
@@ -116,36 +147,7 @@ function updateLoanPanel(filterType, filterValue) {
 
     fetch(url)
         .then(response => response.json())
-        .then(data => {
-            if (titleEl) {
-                if (data.filter_type && data.filter_value !== 'All') {
-                    const typeText = data.filter_type.charAt(0).toUpperCase() + data.filter_type.slice(1);
-                    titleEl.innerHTML = `<i class="fas fa-hand-holding-usd"></i> Tinjauan Pinjaman Aktif
-                    <br><small style="font-size: 0.7rem; color: #5E6573; font-weight: 500;">
-                        ${data.total_respondents} Responden untuk ${data.filter_value} (${typeText})
-                    </small>`;
-                } else {
-                    titleEl.innerHTML = `<i class="fas fa-hand-holding-usd"></i> Tinjauan Pinjaman Aktif`;
-                }
-            }
-
-            // --- MODIFIED SECTION START ---
-            // Update 'Total with Loans' KPI to show fraction
-            const totalWithLoansValue = `${data.with_loan} / ${data.total_respondents}`;
-            const totalWithLoansSubtext = `${data.with_loan_pct}% memiliki pinjaman`;
-            updateKPICard('loan-total-value', totalWithLoansValue);
-            updateKPICard('loan-total-subtext', totalWithLoansSubtext);
-            // --- MODIFIED SECTION END ---
-
-            // Update other KPI cards
-            updateKPICard('loan-avg-value', formatCurrency(data.mean));
-            updateKPICard('loan-third-label', 'Total Pinjaman Aktif');
-            updateKPICard('loan-third-value', formatCurrency(data.total_outstanding));
-            updateKPICard('loan-third-subtext', filterValue && filterValue !== 'All' ? `Di ${filterValue}` : 'Jumlah semua pinjaman');
-            updateKPICard('loan-max-value', formatCurrency(data.max));
-
-            renderLoanChart(data);
-        })
+        .then(data => renderLoanOverview(data, filterValue))
         .finally(() => {
             if (kpiContainer) kpiContainer.classList.remove('is-loading');
             if (chartContainer) chartContainer.classList.remove('is-loading');
@@ -9,3 +9,38 @@ export async function fetchGeoJSON(url) {
     if (!res.ok) throw new Error('Gagal memuat file peta.');
     return res.json();
 }
+
+// Decodes a quantized, delta-encoded TopoJSON topology (as built by
+// app/utils/geo_assets.py) into the GeoJSON FeatureCollection Highcharts expects.
+export function topoToGeoJSON(topology) {
+    const [sx, sy] = topology.transform.scale;
+    const [tx, ty] = topology.transform.translate;
+    const arcs = topology.arcs.map(arc => {
+        let x = 0, y = 0;
+        return arc.map(([dx, dy]) => [(x += dx) * sx + tx, (y += dy) * sy + ty]);
+    });
+    const ring = refs => refs.flatMap((ref, i) => {
+        const points = ref < 0 ? arcs[~ref].slice().reverse() : arcs[ref];
+        return i === 0 ? points : points.slice(1);
+    });
+    const [collection] = Object.values(topology.objects);
+    return {
+        type: 'FeatureCollection',
+        features: collection.geometries.map(geometry => ({
+            type: 'Feature',
+            properties: geometry.properties || {},
+            geometry: {
+                type: geometry.type,
+                coordinates: geometry.type === 'Polygon'
+                    ? geometry.arcs.map(ring)
+                    : geometry.arcs.map(polygon => polygon.map(ring))
+            }
+        }))
+    };
+}
+
+export async function fetchMapGeometry(url) {
+    const data = await fetchGeoJSON(url);
+    return data.type === 'Topology' ? topoToGeoJSON(data) : data;
+}
+
@@ -1,5 +1,7 @@
-import { datasetsConfig, GEOJSON_URL, reverseNameMapping } from './config.js';
-import { fetchApiData, fetchGeoJSON } from './api.js';
+import {
+    datasetsConfig, GEOJSON_URL, GEO_MANIFEST_URL, GEO_FIRST_PAINT_RESOLUTION, chooseGeoResolution, reverseNameMapping
+} from './config.js';
+import { fetchApiData, fetchMapGeometry } from './api.js';
 import { renderChoroplethMap } from './choroplethRenderer.js';
 import { renderPatternMap } from './patternRenderer.js';
 
@@ -84,9 +86,39 @@ document.addEventListener('DOMContentLoaded', async function () {
         }
     }
 
+    async function loadGeoManifest() {
+        try {
+            if (container.dataset.geoAssets) return JSON.parse(container.dataset.geoAssets);
+            return await fetchApiData(GEO_MANIFEST_URL);
+        } catch (err) {
+            console.warn('Map asset manifest unavailable, using the raw GeoJSON:', err);
+            return null;
+        }
+    }
+
+    // Paint with the smallest geometry first, then swap in the resolution
+    // this screen can actually show once it has downloaded.
+    async function upgradeMapGeometry(geoManifest) {
+        if (!geoManifest) return;
+        const available = Object.keys(geoManifest.resolutions);
+        const target = chooseGeoResolution(available, container.clientWidth);
+        if (target === GEO_FIRST_PAINT_RESOLUTION) return;
+        try {
+            state.mapData = await fetchMapGeometry(geoManifest.resolutions[target].topojson.url);
+            renderMap();
+        } catch (err) {
+            console.warn(`Keeping the low-resolution map (${target} failed):`, err);
+        }
+    }
+
     async function initializeApp() {
         try {
-            state.mapData = await fetchGeoJSON(GEOJSON_URL);
+            const geoManifest = await loadGeoManifest();
+            const firstGeometry = geoManifest
+                ? geoManifest.resolutions[GEO_FIRST_PAINT_RESOLUTION].topojson.url
+                : GEOJSON_URL;
+            // Download the geometry while the dataset request below is in flight
+            const mapDataPromise = fetchMapGeometry(firstGeometry);
 
             initDropdown(datasetDropdown, async (selectedValue) => {
                 state.selectedDataset = selectedValue;
@@ -136,7 +168,9 @@ document.addEventListener('DOMContentLoaded', async function () {
 
             updateMetricSelector(state.selectedDataset);
             await loadDataset(state.selectedDataset);
+            state.mapData = await mapDataPromise;
             renderMap();
+            upgradeMapGeometry(geoManifest);
 
         } catch (error) {
             console.error('Initialization failed:', error);
@@ -1,5 +1,25 @@
 export const GEOJSON_URL = '/static/indonesia-38-provinsi.geojson';
 
+// Simplified, precompressed and content-hashed versions of GEOJSON_URL.
+// The page embeds the manifest in #container[data-geo-assets]; the endpoint
+// is only used when it is missing. GEOJSON_URL stays the last-resort fallback.
+export const GEO_MANIFEST_URL = '/api/geo/manifest';
+export const GEO_FIRST_PAINT_RESOLUTION = 'low';
+
+// Finest resolution worth downloading on this screen and connection, in
+// device pixels across the map; ?map_resolution=low|medium|high|full overrides it.
+export function chooseGeoResolution(available, containerWidth) {
+    const requested = new URLSearchParams(window.location.search).get('map_resolution');
+    if (requested && available.includes(requested)) return requested;
+
+    const connection = navigator.connection || {};
+    if (connection.saveData || ['slow-2g', '2g', '3g'].includes(connection.effectiveType)) return 'low';
+
+    const pixels = (containerWidth || window.innerWidth) * (window.devicePixelRatio || 1);
+    const wanted = pixels < 1600 ? 'low' : pixels < 4000 ? 'medium' : 'high';
+    return available.includes(wanted) ? wanted : GEO_FIRST_PAINT_RESOLUTION;
+}
+
 export const provinceNameMapping = {
     "Nanggroe Aceh Darusalam": "Aceh",
     "DI Yogyakarta": "Daerah Istimewa Yogyakarta",
@@ -10,6 +30,19 @@ export const reverseNameMapping = Object.fromEntries(
     Object.entries(provinceNameMapping).map(([csv, geo]) => [geo, csv])
 );
 
+// Fingerprinted logo URLs from #container[data-logo-urls], else the plain static path
+let logoUrls = null;
+export function logoUrl(appName) {
+    if (logoUrls === null) {
+        try {
+            logoUrls = JSON.parse(document.getElementById('container')?.dataset.logoUrls || '{}');
+        } catch {
+            logoUrls = {};
+        }
+    }
+    return logoUrls[`${appName}.png`] || `/static/logos/${appName}.png`;
+}
+
 // Colors for fintech app logos (pattern map)
 export const appColors = {
     Dana: '#118EEA',
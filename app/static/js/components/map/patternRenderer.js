@@ -1,4 +1,4 @@
-import { appColors } from './config.js';
+import { appColors, logoUrl as logoUrlFor } from './config.js';
 import { attachNavigationEnhancements } from './navigation.js';
 
 export function renderPatternMap({
@@ -29,7 +29,7 @@ export function renderPatternMap({
                 name: geoName,
                 appName,
                 value: appIndexMap[appName],
-                logoUrl: `/static/logos/${appName}.png`
+                logoUrl: logoUrlFor(appName)
             };
         }
         return { name: geoName, appName: null, value: isAcehFinancial ? -1 : null };
@@ -148,7 +148,7 @@ export function renderPatternMap({
 					</div>`;
                 }
                 const percentage = provinceData.fintech_percentage || 0;
-                const logoUrl = `/static/logos/${appName}.png`;
+                const logoUrl = logoUrlFor(appName);
                 return `<div style="padding:12px;min-width:220px;font-family:Inter,sans-serif;">
 					<div style="font-weight:700;margin-bottom:10px;font-size:1.05rem;color:#2d3748;">${provinceData[config.keyColumn]}</div>
 					<div style="display:flex;align-items:center;gap:12px;">
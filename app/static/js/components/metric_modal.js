@@ -28,6 +28,9 @@ function initMetricModal() { // REMOVED metricsData parameter
 
     gsap.set(detailContainer, { height: 0, opacity: 0, marginTop: 0, paddingTop: 0 });
 
+    // Question id -> distribution, prefetched per metric when the modal opens
+    let distributionCache = new Map();
+
     // --- Event Listeners ---
     kpiCards.forEach(card => {
         card.addEventListener('click', () => {
@@ -112,12 +115,37 @@ function initMetricModal() { // REMOVED metricsData parameter
             gsap.set(detailContainer, { height: 0, opacity: 0, marginTop: 0, paddingTop: 0 });
             questionTextEl.textContent = '';
             chartContainer.innerHTML = '';
+            prefetchDistributions(metricKeys, currentFilter);
         } catch (error) {
             console.error('Error populating modal:', error);
             modalBody.innerHTML = '<p style="color:red; text-align:center;">Could not load data.</p>';
         }
     }
 
+    function filterQuery(currentFilter) {
+        if (!currentFilter) return '';
+        const safeValue = normalizeFilterValue(currentFilter.by, currentFilter.value);
+        return `?filter_by=${encodeURIComponent(currentFilter.by)}&filter_value=${encodeURIComponent(safeValue)}`;
+    }
+
+    // One request per metric instead of one per clicked question
+    async function prefetchDistributions(metricKeys, currentFilter) {
+        const cache = new Map();
+        distributionCache = cache;
+        await Promise.all(metricKeys.map(async key => {
+            try {
+                const response = await fetch(`/api/metric-distributions/${encodeURIComponent(key)}${filterQuery(currentFilter)}`);
+                if (!response.ok) return;
+                const data = await response.json();
+                data.questions.forEach(q => {
+                    if (q.distribution) cache.set(q.id, q);
+                });
+            } catch (error) {
+                console.warn('Could not prefetch distributions for', key, error);
+            }
+        }));
+    }
+
     function showModal() {
         modal.style.display = 'flex';
         gsap.to(modal, { opacity: 1, duration: 0.3 });
@@ -150,17 +178,14 @@ function initMetricModal() { // REMOVED metricsData parameter
         circle.classList.add('active', 'active-question');
 
         try {
-            const currentFilter = window.activeDashboardFilter;
-            let url = `/api/question-distribution/${questionId}`;
-            if (currentFilter) {
-                const safeValue = normalizeFilterValue(currentFilter.by, currentFilter.value);
-                url += `?filter_by=${encodeURIComponent(currentFilter.by)}&filter_value=${encodeURIComponent(safeValue)}`;
+            let data = distributionCache.get(questionId);
+            if (!data) {
+                const url = `/api/question-distribution/${questionId}${filterQuery(window.activeDashboardFilter)}`;
+                const response = await fetch(url);
+                if (!response.ok) throw new Error('Failed to fetch distribution data');
+                data = await response.json();
             }
 
-            const response = await fetch(url);
-            if (!response.ok) throw new Error('Failed to fetch distribution data');
-            const data = await response.json();
-
             questionTextEl.textContent = `"${questionText}"`;
             renderDistributionChart(data.distribution, data.most_common);
             showDetailView();
@@ -139,6 +139,38 @@ function updateEducationChart(filterType, filterValue) {
     updateChartData('education-chart', '/api/education-chart', filterType, filterValue, educationChartConfig);
 }
 
+// Fetches every filterable panel in one request and hands each payload to its renderer.
+function updateDashboardPanels(filterType, filterValue) {
+    const containers = [
+        document.querySelector('.loan-kpi-cards'),
+        document.querySelector('#loan-overview-chart')?.parentElement,
+        document.querySelector('#loan-purpose-chart')?.parentElement,
+        document.getElementById('digital-time-chart')?.parentElement,
+        document.getElementById('profession-chart')?.closest('.viz-panel'),
+        document.getElementById('education-chart')?.closest('.viz-panel'),
+    ].filter(Boolean);
+    containers.forEach(el => el.classList.add('is-loading'));
+
+    let url = '/api/dashboard-state?parallel=1';
+    if (filterType && filterValue) {
+        url += `&filter_type=${filterType}&filter_value=${encodeURIComponent(filterValue)}`;
+    }
+
+    fetch(url)
+        .then(response => response.json())
+        .then(state => {
+            renderLoanOverview(state.loan, filterValue);
+            renderLoanPurposeChart(state.loan_purpose, filterType, filterValue);
+            renderDigitalTimeChart(state.digital_time, filterType, filterValue);
+            renderChart('profession-chart', state.profession_chart, filterType, filterValue, professionChartConfig);
+            renderChart('education-chart', state.education_chart, filterType, filterValue, educationChartConfig);
+        })
+        .catch(error => console.error('Error updating dashboard panels:', error))
+        .finally(() => {
+            containers.forEach(el => el.classList.remove('is-loading'));
+        });
+}
+
 function initializeNewCharts() {
     if (typeof initializeLoanCharts === 'function') initializeLoanCharts();
     if (typeof initializeDigitalTimeChart === 'function') initializeDigitalTimeChart();
@@ -146,19 +178,11 @@ function initializeNewCharts() {
     document.addEventListener('applyDashboardFilter', (e) => {
         const { filterType, filterValue } = e.detail;
         console.log(`Applying filter: ${filterType} = ${filterValue}`);
-        updateLoanPanel(filterType, filterValue);
-        updateLoanPurposeChart(filterType, filterValue);
-        updateDigitalTimeChart(filterType, filterValue);
-        updateProfessionChart(filterType, filterValue);
-        updateEducationChart(filterType, filterValue);
+        updateDashboardPanels(filterType, filterValue);
     });
 
     document.addEventListener('resetDashboardFilter', () => {
         console.log('Resetting all filters');
-        updateLoanPanel(null, null);
-        updateLoanPurposeChart(null, null);
-        updateDigitalTimeChart(null, null);
-        updateProfessionChart(null, null);
-        updateEducationChart(null, null);
+        updateDashboardPanels(null, null);
     });
 }
\ No newline at end of file
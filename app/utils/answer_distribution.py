@@ -0,0 +1,135 @@
+"""
+Answer Distribution Module
+Precomputed per-question answer counts for the full survey and every facet
+"""
+
+import numpy as np
+
+
+class AnswerDistribution:
+    """
+    Answer-count tensors over the Likert questions of the survey
+
+    Every answer is encoded once as its position on the scale (0 for a
+    missing or off-scale answer), so the counts of all questions over any
+    row subset or row partition come out of a single ``np.bincount``. The
+    counts of the full sheet and of every registered facet value are
+    computed at build time; a distribution request is then an array lookup.
+    """
+
+    def __init__(self, df, questions, scale=(1, 2, 3, 4)):
+        """
+        Initialize AnswerDistribution
+
+        Args:
+            df (pd.DataFrame): Survey answers, one column per question
+            questions (iterable): Questions to index; those missing from
+                ``df`` are skipped
+            scale (tuple): Answer values, in display order
+        """
+        self.scale = tuple(scale)
+        self.questions = [q for q in dict.fromkeys(questions) if q in df.columns]
+        self.position = {q: i for i, q in enumerate(self.questions)}
+        self.n_rows = len(df)
+
+        answers = df[self.questions].to_numpy(dtype=np.float64, na_value=np.nan)
+        self._codes = np.zeros(answers.shape, dtype=np.int8)
+        for code, value in enumerate(self.scale, start=1):
+            self._codes[answers == value] = code
+
+        self.totals = self.counts()
+        self._facets = {}
+
+    def counts(self, rows=None):
+        """
+        Answer counts of every question over a row subset
+
+        Args:
+            rows (np.ndarray, optional): Boolean mask or integer row positions.
+                All rows when omitted.
+
+        Returns:
+            np.ndarray: (n_questions, len(scale)) int64 counts
+        """
+        codes = self._codes if rows is None else self._codes[rows]
+        width = len(self.scale) + 1
+        bins = (codes + np.arange(len(self.questions)) * width).ravel()
+        counts = np.bincount(bins, minlength=len(self.questions) * width)
+        return counts.reshape(len(self.questions), width)[:, 1:]
+
+    def group_counts(self, group_codes, n_groups):
+        """
+        Answer counts of every question for every group of a row partition
+
+        Args:
+            group_codes (np.ndarray): Group index per row, -1 for rows that
+                belong to no group
+            n_groups (int): Number of groups
+
+        Returns:
+            np.ndarray: (n_groups, n_questions, len(scale)) int64 counts
+        """
+        group_codes = np.asarray(group_codes)
+        in_group = group_codes >= 0
+        n_questions = len(self.questions)
+        width = len(self.scale) + 1
+
+        # Flatten (group, question, answer) into one bin index
+        bins = (
+            (group_codes[in_group][:, None] * n_questions + np.arange(n_questions)) * width
+            + self._codes[in_group]
+        ).ravel()
+        counts = np.bincount(bins, minlength=n_groups * n_questions * width)
+        return counts.reshape(n_groups, n_questions, width)[:, :, 1:]
+
+    def add_facet(self, dimension, rows_by_value):
+        """
+        Precompute the counts of every value of a filter dimension
+
+        Args:
+            dimension (str): Dimension name used for lookups
+            rows_by_value (dict): Value -> row positions; the row sets are
+                expected to be disjoint
+        """
+        values = list(rows_by_value)
+        group_codes = np.full(self.n_rows, -1, dtype=np.intp)
+        for i, value in enumerate(values):
+            group_codes[rows_by_value[value]] = i
+        tensor = self.group_counts(group_codes, len(values))
+        self._facets[dimension] = {value: tensor[i] for i, value in enumerate(values)}
+
+    def lookup(self, dimension=None, value=None):
+        """
+        Precomputed counts for the full sheet or one facet value
+
+        Args:
+            dimension (str, optional): Registered dimension; the full sheet
+                when omitted
+            value: Facet value
+
+        Returns:
+            np.ndarray: (n_questions, len(scale)) counts, all zero when the
+                value does not occur
+
+        Raises:
+            KeyError: If the dimension was not registered
+        """
+        if dimension is None:
+            return self.totals
+        facet = self._facets[dimension]
+        counts = facet.get(value)
+        if counts is None:
+            return np.zeros_like(self.totals)
+        return counts
+
+    def distribution(self, counts, question):
+        """
+        JSON-ready distribution of one question
+
+        Returns:
+            dict: {"distribution": answer -> count, "most_common": answer or None}
+        """
+        row = counts[self.position[question]]
+        distribution = {str(value): int(count) for value, count in zip(self.scale, row)}
+        most_common = max(distribution, key=distribution.get) if row.sum() > 0 else None
+        return {"distribution": distribution, "most_common": most_common}
@@ -0,0 +1,107 @@
+"""
+Bitmap Index Module
+Per-value bitsets over categorical columns for AND/OR cross-filtering
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class BitmapIndex:
+    """
+    Packed bitset per (column, value) of a DataFrame
+
+    Each bitset stores one bit per row (8 rows per byte), so combining
+    filters is a handful of bitwise operations over ``n_rows / 8`` bytes
+    instead of comparisons over the full columns. Values are keyed by their
+    string form, matching what arrives in query parameters.
+    """
+
+    def __init__(self, df, columns):
+        """
+        Initialize BitmapIndex
+
+        Args:
+            df (pd.DataFrame): Frame to index
+            columns (list): Categorical columns to build bitsets for
+        """
+        self.n_rows = len(df)
+        self._bitsets = {}
+        for column in columns:
+            if column not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[column])
+            self._bitsets[column] = {
+                str(value): np.packbits(codes == code, bitorder="little")
+                for code, value in enumerate(uniques)
+            }
+
+    @property
+    def columns(self):
+        return list(self._bitsets)
+
+    def values(self, column):
+        """Indexed values of a column."""
+        return list(self._bitsets[column])
+
+    def bitset(self, filters, op="and"):
+        """
+        Evaluate a filter spec to a packed bitset
+
+        Values listed for the same column are OR-ed together; the per-column
+        results are then combined with ``op``.
+
+        Args:
+            filters (dict): Column -> list of accepted values
+            op (str): "and" or "or" across columns
+
+        Returns:
+            np.ndarray: Packed uint8 bitset, or None when ``filters`` is empty
+
+        Raises:
+            KeyError: If a column is not indexed
+            ValueError: If ``op`` is not "and" or "or"
+        """
+        if op not in ("and", "or"):
+            raise ValueError(f"Unsupported filter operator: {op}")
+
+        result = None
+        empty = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for column, values in filters.items():
+            column_bitsets = self._bitsets[column]
+            column_bits = empty.copy()
+            for value in values:
+                bits = column_bitsets.get(str(value))
+                if bits is not None:
+                    np.bitwise_or(column_bits, bits, out=column_bits)
+            if result is None:
+                result = column_bits
+            elif op == "and":
+                np.bitwise_and(result, column_bits, out=result)
+            else:
+                np.bitwise_or(result, column_bits, out=result)
+        return result
+
+    def query(self, filters, op="and"):
+        """
+        Row positions matching a filter spec
+
+        Args:
+            filters (dict): Column -> list of accepted values
+            op (str): "and" or "or" across columns
+
+        Returns:
+            np.ndarray: Sorted row positions, or None when ``filters`` is empty
+                (meaning every row)
+        """
+        bits = self.bitset(filters, op)
+        if bits is None:
+            return None
+        return np.flatnonzero(np.unpackbits(bits, count=self.n_rows, bitorder="little"))
+
+    def count(self, filters, op="and"):
+        """Number of rows matching a filter spec, without materializing them."""
+        bits = self.bitset(filters, op)
+        if bits is None:
+            return self.n_rows
+        return int(np.bitwise_count(bits).sum())
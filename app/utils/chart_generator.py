@@ -3,31 +3,58 @@ Chart Generator Module
 Creates visualizations using Plotly
 """
 
-from app.utils.charts.diverging_chart import (
-    create_diverging_bar_chart as _create_diverging,
-)
-from app.utils.charts.profession_chart import (
-    create_profession_chart as _create_profession,
-)
-from app.utils.charts.education_chart import create_education_chart as _create_education
-from app.utils.charts.grouped_chart import create_grouped_bar_chart as _create_grouped
+import json
+
+from app.utils.instrumentation import timed
+from app.utils.startup import deferred_import
+
+
+def _chart(name):
+    """Chart module, imported on first use: Plotly alone takes most of a second to import."""
+    return deferred_import(f"app.utils.charts.{name}")
+
+def _figure_payload(fig, module):
+    """Figure JSON with the div id and plot config needed for Plotly.newPlot"""
+    return {"div_id": module.DIV_ID, "figure": json.loads(fig.to_json()), "config": module.PLOT_CONFIG}
 
 
 class ChartGenerator:
     """Thin wrapper delegating to chart-specific modules"""
 
     @staticmethod
+    @timed("chart")
     def create_diverging_bar_chart(chart_data):
-        return _create_diverging(chart_data)
+        return _chart("diverging_chart").create_diverging_bar_chart(chart_data)
     
     @staticmethod
+    @timed("chart")
     def create_profession_chart(profession_data):
-        return _create_profession(profession_data)
+        return _chart("profession_chart").create_profession_chart(profession_data)
     
     @staticmethod
+    @timed("chart")
     def create_education_chart(education_data):
-        return _create_education(education_data)
+        return _chart("education_chart").create_education_chart(education_data)
     
     @staticmethod
+    @timed("chart")
     def create_grouped_bar_chart(chart_data):
-        return _create_grouped(chart_data)
+        return _chart("grouped_chart").create_grouped_bar_chart(chart_data)
+
+    @staticmethod
+    @timed("chart")
+    def create_diverging_bar_chart_json(chart_data):
+        diverging_chart = _chart("diverging_chart")
+        return _figure_payload(diverging_chart.build_diverging_bar_figure(chart_data), diverging_chart)
+
+    @staticmethod
+    @timed("chart")
+    def create_profession_chart_json(profession_data):
+        profession_chart = _chart("profession_chart")
+        return _figure_payload(profession_chart.build_profession_figure(profession_data), profession_chart)
+
+    @staticmethod
+    @timed("chart")
+    def create_education_chart_json(education_data):
+        education_chart = _chart("education_chart")
+        return _figure_payload(education_chart.build_education_figure(education_data), education_chart)
@@ -1,7 +1,19 @@
 import plotly.graph_objects as go
 
 
-def create_diverging_bar_chart(chart_data):
+DIV_ID = "diverging-bar-chart"
+
+PLOT_CONFIG = {
+    "displayModeBar": 'hover', "displaylogo": False, "responsive": True,
+    "modeBarButtonsToRemove": ["pan2d", "lasso2d", "select2d"],
+    "toImageButtonOptions": {
+        "format": "png", "filename": "income_vs_expense_chart",
+        "height": 576, "width": 1152, "scale": 2,
+    },
+}
+
+
+def build_diverging_bar_figure(chart_data):
     categories = chart_data["categories"]
     income_pct = chart_data["income_percentages"]
     expense_pct = chart_data["expense_percentages"]
@@ -96,21 +108,11 @@ def create_diverging_bar_chart(chart_data):
         hoverlabel=dict(bgcolor="white", font_size=10, font_family="Arial, sans-serif"),
     )
 
-    chart_html = fig.to_html(
-        include_plotlyjs=False,
-        div_id="diverging-bar-chart",
-        config={
-            "displayModeBar": 'hover', "displaylogo": False, "responsive": True,
-            "modeBarButtonsToRemove": ["pan2d", "lasso2d", "select2d"],
-            "toImageButtonOptions": {
-                "format": "png", "filename": "income_vs_expense_chart",
-                "height": 576, "width": 1152, "scale": 2,
-            },
-        },
-    )
+    return fig
+
 
-    # --- PHASE 2: UPDATED INTERACTIVE SCRIPT ---
-    interactive_script = """
+# --- PHASE 2: UPDATED INTERACTIVE SCRIPT ---
+INTERACTIVE_SCRIPT = """
     <script>
     (function() {
         function initializeChartInteractivity() {
@@ -188,4 +190,8 @@ def create_diverging_bar_chart(chart_data):
     </script>
     """
 
-    return chart_html + interactive_script
\ No newline at end of file
+
+def create_diverging_bar_chart(chart_data):
+    fig = build_diverging_bar_figure(chart_data)
+    chart_html = fig.to_html(include_plotlyjs=False, div_id=DIV_ID, config=dict(PLOT_CONFIG))
+    return chart_html + INTERACTIVE_SCRIPT
\ No newline at end of file
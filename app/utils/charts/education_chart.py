@@ -1,7 +1,12 @@
 import plotly.graph_objects as go
 
 
-def create_education_chart(education_data):
+DIV_ID = "education-chart"
+
+PLOT_CONFIG = {"displayModeBar": False, "responsive": True}
+
+
+def build_education_figure(education_data):
     fig = go.Figure()
     categories = education_data["categories"]
     colors = education_data["colors"]
@@ -95,8 +100,9 @@ def create_education_chart(education_data):
         hoverlabel=dict(bgcolor="white", font_size=10),
     )
 
-    return fig.to_html(
-        include_plotlyjs=False,
-        div_id="education-chart",
-        config={"displayModeBar": False},
-    )
+    return fig
+
+
+def create_education_chart(education_data):
+    fig = build_education_figure(education_data)
+    return fig.to_html(include_plotlyjs=False, div_id=DIV_ID, config=dict(PLOT_CONFIG))
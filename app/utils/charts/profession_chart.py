@@ -1,7 +1,12 @@
 import plotly.graph_objects as go
 
 
-def create_profession_chart(profession_data):
+DIV_ID = "profession-chart"
+
+PLOT_CONFIG = {"displayModeBar": False, "responsive": True}
+
+
+def build_profession_figure(profession_data):
     fig = go.Figure()
     categories = profession_data["categories"]
     colors = profession_data["colors"]
@@ -75,8 +80,9 @@ def create_profession_chart(profession_data):
         hoverlabel=dict(bgcolor="white", font_size=10),
     )
 
-    return fig.to_html(
-        include_plotlyjs=False,
-        div_id="profession-chart",
-        config={"displayModeBar": False},
-    )
+    return fig
+
+
+def create_profession_chart(profession_data):
+    fig = build_profession_figure(profession_data)
+    return fig.to_html(include_plotlyjs=False, div_id=DIV_ID, config=dict(PLOT_CONFIG))
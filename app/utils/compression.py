@@ -0,0 +1,104 @@
+"""
+Compression Module
+gzip/brotli encoding of static files and of large dynamic responses
+"""
+
+import gzip
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+# Preferred first when the client accepts several
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Built files are compressed once, so they get the slowest, smallest settings;
+# responses are compressed per request and use cheaper levels.
+STATIC_LEVELS = {"gzip": 9, "br": 11}
+DYNAMIC_LEVELS = {"gzip": 6, "br": 5}
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/geo+json", "image/svg+xml")
+
+
+def compress(body, encoding, levels=DYNAMIC_LEVELS):
+    """
+    Encode a body
+
+    Args:
+        body (bytes): Uncompressed content
+        encoding (str): "gzip" or "br"
+        levels (dict): Compression level per encoding
+
+    Returns:
+        bytes: Compressed content
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=levels["br"])
+    return gzip.compress(body, compresslevel=levels["gzip"], mtime=0)
+
+
+def compress_variants(body):
+    """
+    Precompressed copies of a file at the highest compression levels
+
+    Args:
+        body (bytes): Uncompressed content
+
+    Returns:
+        dict: Encoding ("gzip", and "br" when brotli is installed) -> bytes
+    """
+    return {encoding: compress(body, encoding, STATIC_LEVELS) for encoding in ENCODINGS}
+
+
+def encoded_path(path, encoding):
+    """Path of the precompressed copy of ``path`` for an encoding."""
+    return f"{path}.gz" if encoding == "gzip" else f"{path}.{encoding}"
+
+
+def accepted_encodings(accept_encodings):
+    """
+    Supported encodings a client accepts, in preference order
+
+    Args:
+        accept_encodings: ``request.accept_encodings`` (a werkzeug Accept)
+
+    Returns:
+        list: Subset of ENCODINGS
+    """
+    return [encoding for encoding in ENCODINGS if accept_encodings[encoding]]
+
+
+def compress_response(response, accepted, min_size):
+    """
+    Compress a response body in place when it is worth it
+
+    Only complete, uncompressed, successful responses of a compressible
+    type of at least ``min_size`` bytes are encoded. ``Vary:
+    Accept-Encoding`` is added to every response that could have been
+    compressed, so caches keep the encodings apart.
+
+    Args:
+        response (flask.Response): Outgoing response
+        accepted (list): Output of accepted_encodings for the request
+        min_size (int): Smallest body worth compressing, in bytes
+
+    Returns:
+        flask.Response: The same response
+    """
+    if (
+        response.direct_passthrough
+        or response.status_code < 200 or response.status_code >= 300 or response.status_code == 204
+        or "Content-Encoding" in response.headers
+        or not (response.mimetype or "").startswith(COMPRESSIBLE_TYPES)
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    if not accepted:
+        return response
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+    response.set_data(compress(body, accepted[0]))
+    response.headers["Content-Encoding"] = accepted[0]
+    return response
@@ -0,0 +1,227 @@
+"""
+Dataset Cache Module
+Persists cleaned DataFrames as one .npy file per column for fast cold starts
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout below changes
+CACHE_FORMAT_VERSION = 1
+
+
+class ColumnarCache:
+    """
+    Binary columnar cache of cleaned datasets
+
+    Each entry is a directory holding a ``manifest.json`` and one ``.npy``
+    file per column. Numeric columns are stored as-is; string columns are
+    dictionary-encoded into integer codes plus a fixed-width unicode
+    vocabulary, so nothing is ever pickled, and categoricals are read back
+    as categoricals. Entries are keyed by the source file's content hash,
+    the cleaner's name, the cleaning-code version and an optional variant
+    (e.g. the schema the frame was compacted with), so editing the CSV, the
+    cleaning code or the schema produces a new entry.
+    """
+
+    def __init__(self, cache_dir, version=1):
+        """
+        Initialize ColumnarCache
+
+        Args:
+            cache_dir (str): Directory the entries are written to
+            version (int): Cleaning-code version; bump it whenever a cleaner's
+                output changes for the same input file
+        """
+        self.cache_dir = cache_dir
+        self.version = version
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+    def file_hash(self, path):
+        """
+        Content hash of a source file
+
+        The hash is remembered per (size, mtime) so unchanged files are not
+        re-read on every process start.
+
+        Args:
+            path (str): Path to the source file
+
+        Returns:
+            str: Hex digest of the file contents
+        """
+        stat = os.stat(path)
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        cached = self._hashes.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        index = self._read_hash_index()
+        entry = index.get(path)
+        if entry and tuple(entry["stamp"]) == stamp:
+            digest = entry["hash"]
+        else:
+            hasher = hashlib.blake2b(digest_size=16)
+            with open(path, "rb") as fh:
+                for chunk in iter(lambda: fh.read(1 << 20), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            index[path] = {"stamp": list(stamp), "hash": digest}
+            self._write_hash_index(index)
+
+        self._hashes[path] = (stamp, digest)
+        return digest
+
+    def key_for(self, path, cleaner=None, variant=None):
+        """Cache key for a source file, the cleaner applied to it and an optional variant."""
+        parts = [
+            str(CACHE_FORMAT_VERSION),
+            str(self.version),
+            getattr(cleaner, "__qualname__", "raw"),
+            self.file_hash(path),
+        ]
+        if variant is not None:
+            parts.append(str(variant))
+        return hashlib.blake2b("|".join(parts).encode(), digest_size=12).hexdigest()
+
+    def load(self, path, cleaner=None, variant=None):
+        """
+        Load a cached frame
+
+        Args:
+            path (str): Path to the source CSV
+            cleaner (callable, optional): Cleaner the frame was built with
+            variant (str, optional): Variant the frame was stored under
+
+        Returns:
+            pd.DataFrame or None: Cached frame, or None on a cache miss
+        """
+        entry_dir = self._entry_dir(path, self.key_for(path, cleaner, variant))
+        manifest_path = os.path.join(entry_dir, "manifest.json")
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path, encoding="utf-8") as fh:
+                manifest = json.load(fh)
+            columns = {}
+            for i, spec in enumerate(manifest["columns"]):
+                columns[spec["name"]] = self._load_column(entry_dir, i, spec)
+            return pd.DataFrame(columns, columns=[c["name"] for c in manifest["columns"]])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable dataset cache %s: %s", entry_dir, e)
+            return None
+
+    def store(self, path, df, cleaner=None, variant=None):
+        """
+        Write a cleaned frame to the cache
+
+        Frames that cannot be represented without pickling (non-default
+        index, non-string labels, mixed-type or non-numeric columns) are
+        skipped. Write errors are logged and otherwise ignored.
+
+        Args:
+            path (str): Path to the source CSV
+            df (pd.DataFrame): Cleaned frame
+            cleaner (callable, optional): Cleaner the frame was built with
+            variant (str, optional): Distinguishes frames built differently
+                from the same file and cleaner
+
+        Returns:
+            bool: True if the entry was written
+        """
+        if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+            return False
+        if not all(isinstance(c, str) for c in df.columns) or df.columns.has_duplicates:
+            return False
+
+        key = self.key_for(path, cleaner, variant)
+        entry_dir = self._entry_dir(path, key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir)
+            try:
+                specs = []
+                for i, name in enumerate(df.columns):
+                    spec = self._store_column(tmp_dir, i, name, df[name])
+                    if spec is None:
+                        return False
+                    specs.append(spec)
+                with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as fh:
+                    json.dump({"source": os.path.basename(path), "rows": len(df), "columns": specs}, fh)
+                self._remove_stale(path)
+                os.replace(tmp_dir, entry_dir)
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except OSError as e:
+            logger.warning("Could not write dataset cache for %s: %s", path, e)
+            return False
+        return True
+
+    def _store_column(self, entry_dir, i, name, series):
+        dtype = series.dtype
+        if dtype.kind in "biuf":
+            np.save(os.path.join(entry_dir, f"{i}.npy"), series.to_numpy(), allow_pickle=False)
+            return {"name": name, "kind": "numeric"}
+        categorical = isinstance(dtype, pd.CategoricalDtype)
+        if dtype == object or categorical:
+            if categorical:
+                # Keep the category order and unobserved categories
+                codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+            else:
+                codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            uniques = np.asarray(uniques, dtype=object)
+            if not all(isinstance(u, str) for u in uniques):
+                return None
+            np.save(os.path.join(entry_dir, f"{i}.codes.npy"), codes.astype(np.int32), allow_pickle=False)
+            np.save(os.path.join(entry_dir, f"{i}.vocab.npy"), uniques.astype(str), allow_pickle=False)
+            return {"name": name, "kind": "categorical" if categorical else "string"}
+        return None
+
+    def _load_column(self, entry_dir, i, spec):
+        if spec["kind"] == "numeric":
+            return np.load(os.path.join(entry_dir, f"{i}.npy"), allow_pickle=False)
+        codes = np.load(os.path.join(entry_dir, f"{i}.codes.npy"), allow_pickle=False)
+        vocab = np.load(os.path.join(entry_dir, f"{i}.vocab.npy"), allow_pickle=False).astype(object)
+        if spec["kind"] == "categorical":
+            return pd.Categorical.from_codes(codes, pd.Index(vocab, dtype=object))
+        values = np.append(vocab, np.nan).take(codes)
+        return values
+
+    def _entry_dir(self, path, key):
+        stem = os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+        return os.path.join(self.cache_dir, f"{stem}-{key}")
+
+    def _remove_stale(self, path):
+        prefix = os.path.splitext(os.path.basename(path))[0].replace(" ", "_") + "-"
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(prefix) and len(name) == len(prefix) + 24:
+                shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+
+    def _read_hash_index(self):
+        try:
+            with open(os.path.join(self.cache_dir, "hashes.json"), encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_hash_index(self, index):
+        with self._lock:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=self.cache_dir)
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    json.dump(index, fh)
+                os.replace(tmp_path, os.path.join(self.cache_dir, "hashes.json"))
+            except OSError as e:
+                logger.warning("Could not write dataset hash index: %s", e)
@@ -0,0 +1,254 @@
+"""
+Dataset Registry Module
+Loads and cleans each CSV once per process and shares the result
+"""
+
+import os
+import threading
+
+import pandas as pd
+
+from app.utils.instrumentation import phase
+
+
+class DatasetRegistry:
+    """Thread-safe, process-wide store of cleaned DataFrames"""
+
+    def __init__(self, cache=None, schemas=None):
+        """
+        Initialize DatasetRegistry
+
+        Args:
+            cache (ColumnarCache, optional): Binary cache consulted before
+                parsing a CSV and filled after cleaning it
+            schemas (dict, optional): CSV path -> FrameSchema applied to the
+                cleaned frame, so the shared copy is stored compactly
+        """
+        self.cache = cache
+        self.schemas = {}
+        self._entries = {}
+        self._derived = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        for path, schema in (schemas or {}).items():
+            self.use_schema(path, schema)
+
+    def use_schema(self, path, schema):
+        """
+        Compact a dataset with a schema from its next load on
+
+        Args:
+            path (str): Path to the CSV file
+            schema (FrameSchema): Applied after the cleaner; None stops compacting
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            if schema is None:
+                self.schemas.pop(path, None)
+            else:
+                self.schemas[path] = schema
+
+    def get(self, path, cleaner=None):
+        """
+        Return the cleaned DataFrame for a CSV file, loading it on first use
+
+        The same object is handed to every caller, so it must be treated as
+        read-only: derive new frames (``assign``, ``rename``, boolean
+        indexing) instead of assigning columns in place. The file is
+        re-stat'ed on every call and reloaded when it changes on disk.
+
+        Args:
+            path (str): Path to the CSV file
+            cleaner (callable, optional): Function applied to the freshly read
+                DataFrame before it is stored
+
+        Returns:
+            pd.DataFrame: Shared, cleaned DataFrame
+        """
+        return self._entry(path, cleaner)["df"]
+
+    def version(self, path, cleaner=None):
+        """
+        Identifier of the currently loaded contents of a dataset
+
+        Args:
+            path (str): Path to the CSV file
+            cleaner (callable, optional): Cleaner the dataset is loaded with
+
+        Returns:
+            str: Changes whenever the file is reloaded with different contents
+        """
+        return self._entry(path, cleaner)["version"]
+
+    def derived(self, name, builder, *frames):
+        """
+        Return an artifact computed from shared frames, built once per load
+
+        The artifact is rebuilt only when one of the source frames has been
+        replaced (i.e. its dataset was reloaded), which makes this the place
+        for load-time precomputation such as indexes and matrices.
+
+        Args:
+            name (str): Unique artifact name
+            builder (callable): Called as ``builder(*frames)``
+            *frames (pd.DataFrame): Frames obtained from ``get``
+
+        Returns:
+            Any: The (possibly cached) artifact
+        """
+        entry = self._derived.get(name)
+        if entry is not None and self._same_frames(entry[0], frames):
+            return entry[1]
+
+        with self._lock:
+            key_lock = self._locks.setdefault(("derived", name), threading.Lock())
+        with key_lock:
+            entry = self._derived.get(name)
+            if entry is None or not self._same_frames(entry[0], frames):
+                entry = (frames, builder(*frames))
+                self._derived[name] = entry
+        return entry[1]
+
+    def append(self, path, rows, cleaner=None, persist=False):
+        """
+        Append rows to a loaded dataset without reloading it
+
+        The shared frame is replaced by a new one holding the extra rows,
+        so readers holding the old frame are unaffected. This copies the
+        whole frame, and the version change makes every derived artifact
+        of the dataset rebuild on next use, so appends are meant for
+        batches, not single rows.
+
+        Args:
+            path (str): Path to the CSV file
+            rows (pd.DataFrame): Raw rows with the CSV's columns
+            cleaner (callable, optional): Cleaner the dataset is loaded with;
+                applied to ``rows`` before they are appended
+            persist (bool): Also append the raw rows to the CSV file
+
+        Returns:
+            pd.DataFrame: The new shared frame
+        """
+        self._entry(path, cleaner)
+        key = (os.path.abspath(path), cleaner)
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self._entries[key]
+            if persist:
+                self._append_csv(key[0], rows)
+                # Other cleaners' entries of this file no longer match it
+                with self._lock:
+                    for other in [k for k in self._entries if k[0] == key[0] and k != key]:
+                        del self._entries[other]
+            cleaned = cleaner(rows.copy()) if cleaner is not None else rows
+            schema = self.schemas.get(key[0])
+            if schema is not None:
+                df = schema.concat([entry["df"], cleaned])
+            else:
+                df = pd.concat([entry["df"], cleaned], ignore_index=True)
+            appended = entry.get("appended", 0) + len(rows)
+            base_version = entry.get("base_version", entry["version"])
+            self._entries[key] = {
+                "df": df,
+                "stamp": self._stamp(key[0]) if persist else entry["stamp"],
+                "version": f"{base_version}+{appended}",
+                "base_version": base_version,
+                "appended": appended,
+            }
+        return df
+
+    def frames(self):
+        """
+        Currently loaded frames
+
+        Returns:
+            dict: "<file name>" (plus ":<cleaner>" when cleaned) -> shared DataFrame
+        """
+        with self._lock:
+            entries = list(self._entries.items())
+        return {
+            os.path.basename(path) + (f":{cleaner.__name__}" if cleaner is not None else ""): entry["df"]
+            for (path, cleaner), entry in entries
+        }
+
+    def invalidate(self, path=None):
+        """
+        Drop cached frames so they are reloaded on the next ``get``
+
+        Args:
+            path (str, optional): Only drop frames loaded from this file.
+                Drops everything when omitted.
+        """
+        with self._lock:
+            self._derived.clear()
+            if path is None:
+                self._entries.clear()
+                return
+            abs_path = os.path.abspath(path)
+            for key in [k for k in self._entries if k[0] == abs_path]:
+                del self._entries[key]
+
+    def _entry(self, path, cleaner):
+        key = (os.path.abspath(path), cleaner)
+        stamp = self._stamp(key[0])
+        entry = self._entries.get(key)
+        if entry is not None and entry["stamp"] == stamp:
+            return entry
+
+        # One lock per dataset so a slow load does not block the others
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["stamp"] != stamp:
+                entry = self._load(key[0], cleaner, stamp)
+                self._entries[key] = entry
+        return entry
+
+    def _load(self, path, cleaner, stamp):
+        schema = self.schemas.get(path)
+        variant = schema.fingerprint if schema is not None else None
+        if self.cache is not None:
+            version = self.cache.file_hash(path)
+            with phase("load_cache") as timed_load:
+                df = self.cache.load(path, cleaner, variant)
+                timed_load.rows = None if df is None else len(df)
+            if df is not None:
+                return {"df": df, "stamp": stamp, "version": version}
+        else:
+            version = "{}-{}".format(*stamp)
+
+        with phase("load_csv") as timed_load:
+            df = pd.read_csv(path)
+            if cleaner is not None:
+                df = cleaner(df)
+            timed_load.rows = len(df)
+        if schema is not None:
+            with phase("compact"):
+                df = schema.apply(df)
+        if self.cache is not None:
+            self.cache.store(path, df, cleaner, variant)
+        return {"df": df, "stamp": stamp, "version": version}
+
+    @staticmethod
+    def _append_csv(path, rows):
+        # The shipped CSVs have no trailing newline
+        needs_newline = False
+        if os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            if needs_newline:
+                f.write("\n")
+            rows.to_csv(f, header=False, index=False, lineterminator="\n")
+
+    @staticmethod
+    def _same_frames(old, new):
+        return len(old) == len(new) and all(a is b for a, b in zip(old, new))
+
+    @staticmethod
+    def _stamp(path):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
@@ -4,20 +4,96 @@ Handles analysis of 'digital_time_spent_per_day' data.
 """
 import pandas as pd
 import numpy as np
-from scipy.stats import gaussian_kde
+from app.utils.instrumentation import timed
+from app.utils.startup import deferred_import
+
+DEFAULT_KDE_POINTS = 200
+MIN_KDE_POINTS = 10
+MAX_KDE_POINTS = 1000
+
+# "auto" evaluates the exact KDE up to this many samples and bins above it
+EXACT_KDE_MAX_SAMPLES = 20000
+
+# Grid cells per bandwidth for the binned KDE; keeps the deviation from
+# gaussian_kde well below 0.1% of the curve's peak
+BINNED_KDE_CELLS_PER_BANDWIDTH = 32
+BINNED_KDE_MAX_GRID = 2 ** 16
+
+def clamp_kde_points(points):
+    """Number of KDE curve points limited to the supported range."""
+    return int(np.clip(points, MIN_KDE_POINTS, MAX_KDE_POINTS))
+
+def binned_kde(values, x, bandwidth=None):
+    """
+    Gaussian KDE evaluated on points via linear binning and FFT convolution.
+
+    Costs O(n + G log G) for a grid of G cells instead of O(n * len(x)), and
+    uses the same Scott's-rule bandwidth as scipy's gaussian_kde by default.
+
+    Args:
+        values (np.ndarray): 1-D sample.
+        x (np.ndarray): Points to evaluate the density at.
+        bandwidth (float, optional): Kernel standard deviation.
+
+    Returns:
+        np.ndarray: Density at each point of x.
+
+    Raises:
+        ValueError: If the sample has no spread (gaussian_kde raises LinAlgError).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if bandwidth is None:
+        bandwidth = values.std(ddof=1) * n ** (-1 / 5)
+    if not np.isfinite(bandwidth) or bandwidth <= 0:
+        raise ValueError("KDE bandwidth must be positive")
+
+    # Grid wide enough that kernel mass from every sample reaches all of x
+    lo = min(values.min(), np.min(x)) - 5 * bandwidth
+    hi = max(values.max(), np.max(x)) + 5 * bandwidth
+    size = int(np.clip((hi - lo) / bandwidth * BINNED_KDE_CELLS_PER_BANDWIDTH, 256, BINNED_KDE_MAX_GRID))
+    delta = (hi - lo) / (size - 1)
+
+    # Linear binning: split each sample between its two neighbouring grid nodes
+    position = (values - lo) / delta
+    left = np.floor(position).astype(np.intp)
+    frac = position - left
+    grid = np.bincount(left, weights=1 - frac, minlength=size + 1)
+    grid += np.bincount(left + 1, weights=frac, minlength=size + 1)
+    grid = grid[:size]
+
+    # Circular FFT convolution, zero-padded so the kernel never wraps around
+    offsets = np.arange(-size + 1, size) * delta
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi) * n)
+    fft_size = 1 << int(np.ceil(np.log2(3 * size - 2)))
+    density = np.fft.irfft(np.fft.rfft(grid, fft_size) * np.fft.rfft(kernel, fft_size), fft_size)
+    density = density[size - 1:2 * size - 1]
+
+    return np.maximum(np.interp(x, lo + np.arange(size) * delta, density), 0)
+
+def _frame_rows(processor, *args, **kwargs):
+    return len(processor.df)
 
 class EngagementProcessor:
     """Processes and analyzes digital engagement data."""
 
-    def __init__(self, df):
+    def __init__(self, df, points=DEFAULT_KDE_POINTS, kde_method="auto"):
         """
         Initialize EngagementProcessor with a DataFrame.
 
         Args:
             df (pd.DataFrame): DataFrame containing 'digital_time_spent_per_day'.
+            points (int): Number of points on the KDE curve (clamped to 10-1000).
+            kde_method (str): "exact" (scipy gaussian_kde), "binned" (FFT) or
+                "auto" (exact for small samples, binned for large ones).
         """
+        if kde_method not in ("auto", "exact", "binned"):
+            raise ValueError(f"Unsupported KDE method: {kde_method}")
         self.df = df
+        self.points = clamp_kde_points(points)
+        self.kde_method = kde_method
 
+    @timed("kde", rows=_frame_rows)
     def get_engagement_distribution(self):
         """
         Calculates histogram and KDE for 'digital_time_spent_per_day'.
@@ -45,17 +121,17 @@ class EngagementProcessor:
         # Use numpy's histogram function for robust binning
         counts, bin_edges = np.histogram(time_data, bins='auto', density=False)
         
+        # Arrays stay NumPy; the app's JSON provider encodes them without boxing
         histogram_data = {
-            'x': bin_edges.tolist(),
-            'y': counts.tolist()
+            'x': bin_edges,
+            'y': counts
         }
 
         # 4. Calculate KDE data
         try:
-            kde = gaussian_kde(time_data)
             # Generate points for the KDE curve
-            kde_x = np.linspace(time_data.min(), time_data.max(), 200)
-            kde_y = kde(kde_x)
+            kde_x = np.linspace(time_data.min(), time_data.max(), self.points)
+            kde_y = self._kde(time_data.to_numpy(dtype=np.float64), kde_x)
             
             # Scale KDE to match histogram counts instead of density
             # Area under histogram = sum(counts * bin_width)
@@ -63,8 +139,8 @@ class EngagementProcessor:
             kde_y_scaled = kde_y * stats['count'] * bin_width
 
             kde_data = {
-                'x': kde_x.tolist(),
-                'y': kde_y_scaled.tolist()
+                'x': kde_x,
+                'y': kde_y_scaled
             }
         except (np.linalg.LinAlgError, ValueError):
             # Handle cases where KDE calculation fails (e.g., all values are the same)
@@ -76,6 +152,12 @@ class EngagementProcessor:
             'kde': kde_data
         }
 
+    def _kde(self, values, x):
+        """Density at x with the configured method."""
+        if self.kde_method == "exact" or (self.kde_method == "auto" and len(values) <= EXACT_KDE_MAX_SAMPLES):
+            return deferred_import("scipy.stats").gaussian_kde(values)(x)
+        return binned_kde(values, x)
+
     def _get_empty_distribution(self):
         """Returns a default empty structure for when there's no data."""
         return {
@@ -0,0 +1,180 @@
+"""
+Executor Module
+Fans independent sections of a request out to thread and process pools
+"""
+
+import concurrent.futures
+import contextvars
+import multiprocessing
+import threading
+import time
+
+from app.utils.instrumentation import note, phase
+
+_RAISE = object()
+
+_worker = threading.local()
+
+
+class TaskTimeout(TimeoutError):
+    """A gathered task did not finish within its timeout"""
+
+    def __init__(self, name, seconds):
+        super().__init__(f"Section {name!r} did not finish within {seconds:g} s")
+        self.name = name
+        self.seconds = seconds
+
+
+class Task:
+    """
+    One section to gather: a call plus how and how long to run it
+
+    ``fallback`` is returned instead of raising TaskTimeout when the task
+    runs out of time; a callable fallback is called to build the value.
+    """
+
+    __slots__ = ("func", "args", "timeout", "process", "fallback")
+
+    def __init__(self, func, *args, timeout=None, process=False, fallback=_RAISE):
+        """
+        Initialize Task
+
+        Args:
+            func (callable): The section; must be picklable for ``process``
+            *args: Its arguments (picklable for ``process``)
+            timeout (float, optional): Seconds to wait for it, from the start
+                of the gather; the executor's default when None
+            process (bool): Run it in the process pool (inline when there is none)
+            fallback (optional): Result used when the task times out
+        """
+        self.func = func
+        self.args = args
+        self.timeout = timeout
+        self.process = process
+        self.fallback = fallback
+
+
+def _run_in_worker(context, func, args):
+    _worker.active = True
+    try:
+        return context.run(func, *args)
+    finally:
+        _worker.active = False
+
+
+class TaskExecutor:
+    """
+    Thread pool, optional process pool and per-task timeouts
+
+    The thread pool suits NumPy/pandas sections, which release the GIL in
+    their inner loops. Thread tasks run in a copy of the caller's context,
+    so their request phases and cache notes are still recorded. The process
+    pool (off unless ``processes`` is set) suits pure-Python work such as
+    Plotly figure building. Its tasks are pickled, start from a fresh
+    interpreter ("spawn", safe with a threaded server) and record no
+    request phases.
+
+    Pools are created on first use. Thread tasks gathered from inside a
+    thread task run inline, so nested fan-outs cannot exhaust the pool and
+    deadlock. With ``threads=0`` every thread task runs inline, in order.
+    """
+
+    def __init__(self, threads=6, processes=0, timeout=30.0):
+        """
+        Initialize TaskExecutor
+
+        Args:
+            threads (int): Thread pool size; 0 runs thread tasks inline
+            processes (int): Process pool size; 0 runs process tasks inline
+            timeout (float): Default seconds to wait for a task; None waits forever
+        """
+        self.threads = threads
+        self.processes = processes
+        self.timeout = timeout
+        self._thread_pool = None
+        self._process_pool = None
+        self._lock = threading.Lock()
+
+    def _pool(self, process):
+        with self._lock:
+            if process:
+                if self._process_pool is None:
+                    self._process_pool = concurrent.futures.ProcessPoolExecutor(
+                        max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"),
+                    )
+                return self._process_pool
+            if self._thread_pool is None:
+                self._thread_pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.threads, thread_name_prefix="section",
+                )
+            return self._thread_pool
+
+    def submit(self, task):
+        """
+        Start a task
+
+        Args:
+            task (Task): The task
+
+        Returns:
+            concurrent.futures.Future or None: None when the task should run inline
+        """
+        if task.process:
+            # Pure-Python work gains nothing from threads, so without a process pool it runs inline
+            return self._pool(True).submit(task.func, *task.args) if self.processes > 0 else None
+        if self.threads <= 0 or getattr(_worker, "active", False):
+            return None
+        return self._pool(False).submit(_run_in_worker, contextvars.copy_context(), task.func, task.args)
+
+    def gather(self, tasks, timeout=None):
+        """
+        Run independent tasks concurrently and collect their results
+
+        Every task's timeout counts from the start of the gather, so the
+        wait is bounded by the slowest task rather than the sum. A task that
+        raises re-raises here, as it would have when called directly.
+
+        Args:
+            tasks (dict): Name -> Task, or -> callable taking no arguments
+            timeout (float, optional): Default for tasks without their own,
+                instead of the executor's
+
+        Returns:
+            dict: Name -> result, in the order of ``tasks``
+
+        Raises:
+            TaskTimeout: A task without a fallback ran out of time
+        """
+        tasks = {name: task if isinstance(task, Task) else Task(task) for name, task in tasks.items()}
+        default = self.timeout if timeout is None else timeout
+        started = time.perf_counter()
+        futures = {name: self.submit(task) for name, task in tasks.items()}
+        results = {}
+        for name, task in tasks.items():
+            future = futures[name]
+            if future is None:
+                results[name] = task.func(*task.args)
+                continue
+            limit = default if task.timeout is None else task.timeout
+            remaining = None if limit is None else max(0.0, started + limit - time.perf_counter())
+            try:
+                with phase("gather"):
+                    results[name] = future.result(remaining)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                note("timeout", name)
+                if task.fallback is _RAISE:
+                    for other in futures.values():
+                        if other is not None:
+                            other.cancel()
+                    raise TaskTimeout(name, limit) from None
+                results[name] = task.fallback() if callable(task.fallback) else task.fallback
+        return results
+
+    def shutdown(self, wait=True):
+        """Stop both pools; they are recreated on next use."""
+        with self._lock:
+            pools, self._thread_pool, self._process_pool = (self._thread_pool, self._process_pool), None, None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=True)
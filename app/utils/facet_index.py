@@ -0,0 +1,89 @@
+"""
+Facet Index Module
+Precomputed row positions for every filter value across Sheet1 and Sheet2
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _positions_by_value(values):
+    """Map each distinct non-null value to the sorted row positions holding it."""
+    codes, uniques = pd.factorize(values)
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    # Rows with a null value (code -1) sort first and are skipped
+    start = int((codes < 0).sum())
+    positions = {}
+    for value, count in zip(uniques, counts):
+        positions[value] = order[start:start + count].astype(np.intp)
+        start += count
+    return positions
+
+
+class FacetIndex:
+    """
+    (dimension, value) -> row positions in Sheet1 and Sheet2
+
+    Built once per load of the two sheets. Sheet2 rows are stored under the
+    Sheet1 spelling of their value, so the cross-sheet vocabulary translation
+    is resolved at build time and a filter lookup is a single dict access.
+    """
+
+    EMPTY = np.zeros(0, dtype=np.intp)
+
+    def __init__(self, df1, df2, column_mapping, value_mapping=None, normalizers=None):
+        """
+        Initialize FacetIndex
+
+        Args:
+            df1 (pd.DataFrame): Sheet1 (respondent profile)
+            df2 (pd.DataFrame): Sheet2 (survey answers)
+            column_mapping (dict): Sheet1 dimension -> Sheet2 column name
+            value_mapping (dict, optional): Sheet1 value -> Sheet2 spelling
+            normalizers (dict, optional): Sheet1 dimension -> callable applied
+                to the Sheet1 column before indexing
+        """
+        value_mapping = value_mapping or {}
+        normalizers = normalizers or {}
+        sheet1_spelling = {v: k for k, v in value_mapping.items()}
+
+        self._rows = {}
+        for dimension, sheet2_column in column_mapping.items():
+            column = df1[dimension]
+            if dimension in normalizers:
+                column = normalizers[dimension](column)
+            sheet1_rows = _positions_by_value(column)
+            sheet2_rows = {
+                sheet1_spelling.get(value, value): rows
+                for value, rows in _positions_by_value(df2[sheet2_column]).items()
+            }
+            self._rows[dimension] = {
+                value: (sheet1_rows.get(value, self.EMPTY), sheet2_rows.get(value, self.EMPTY))
+                for value in list(sheet1_rows) + [v for v in sheet2_rows if v not in sheet1_rows]
+            }
+
+    @property
+    def dimensions(self):
+        return list(self._rows)
+
+    def values(self, dimension):
+        """Indexed values of a dimension, in Sheet1 spelling."""
+        return list(self._rows[dimension])
+
+    def lookup(self, dimension, value):
+        """
+        Row positions matching a filter
+
+        Args:
+            dimension (str): Sheet1 column name
+            value: Sheet1 value (already normalized)
+
+        Returns:
+            tuple: (Sheet1 positions, Sheet2 positions); empty arrays when the
+                value does not occur
+
+        Raises:
+            KeyError: If the dimension is not indexed
+        """
+        return self._rows[dimension].get(value, (self.EMPTY, self.EMPTY))
@@ -0,0 +1,226 @@
+"""
+Frame Schema Module
+Compact column types for the loaded survey frames and a memory report
+"""
+
+import hashlib
+import sys
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Stored in uint8 Likert columns for a missing answer; never a valid answer
+LIKERT_MISSING = 0
+
+_INT_TYPES = (np.int8, np.int16, np.int32)
+
+
+def _to_categorical(series):
+    """Dictionary-encode a column with sorted categories, as ``astype("category")`` would."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    codes, uniques = pd.factorize(series, sort=True)
+    categories = pd.Index(uniques, dtype=object) if len(uniques) == 0 else uniques
+    return pd.Series(pd.Categorical.from_codes(codes, categories), index=series.index, name=series.name)
+
+
+def _to_likert(series):
+    """uint8 answers with LIKERT_MISSING for nulls, or None when the values do not fit."""
+    if series.dtype == np.uint8:
+        return series
+    if not pd.api.types.is_numeric_dtype(series.dtype):
+        return None
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    present = values[~np.isnan(values)]
+    if len(present) and (present.min() < 1 or present.max() > 255 or (present != np.round(present)).any()):
+        return None
+    answers = np.where(np.isnan(values), LIKERT_MISSING, values).astype(np.uint8)
+    return pd.Series(answers, index=series.index, name=series.name)
+
+
+def _downcast_integers(series):
+    """Smallest signed integer type holding every value; non-integer columns are returned unchanged."""
+    if not pd.api.types.is_signed_integer_dtype(series.dtype) or series.empty:
+        return series
+    low, high = series.min(), series.max()
+    for dtype in _INT_TYPES:
+        if dtype().itemsize >= series.dtype.itemsize:
+            break
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return series.astype(dtype)
+    return series
+
+
+class FrameSchema:
+    """
+    Storage types of one dataset's columns
+
+    Categorical columns become pandas categoricals (int codes plus one copy
+    of each distinct string), Likert answers become uint8 with
+    LIKERT_MISSING for a missing answer, and integer columns shrink to the
+    smallest integer type holding their range. Float columns are kept as
+    float64: float32 would change the sums and means the endpoints report.
+
+    Applying a schema twice is a no-op, so frames that were already
+    compacted (e.g. read back from the columnar cache) pass through.
+    """
+
+    def __init__(self, categorical=(), likert=(), downcast=True):
+        """
+        Initialize FrameSchema
+
+        Args:
+            categorical (iterable): Low-cardinality text columns
+            likert (iterable): Survey answer columns (small positive integers)
+            downcast (bool): Shrink the remaining integer columns
+        """
+        self.categorical = list(dict.fromkeys(categorical))
+        self.likert = list(dict.fromkeys(likert))
+        self.downcast = downcast
+
+    @property
+    def fingerprint(self):
+        """Identifies the schema's output, e.g. in cache keys."""
+        spec = repr((self.categorical, self.likert, self.downcast, LIKERT_MISSING))
+        return hashlib.blake2b(spec.encode(), digest_size=8).hexdigest()
+
+    def apply(self, df):
+        """
+        Compact a frame
+
+        Args:
+            df (pd.DataFrame): Cleaned frame; columns the schema names but the
+                frame lacks are skipped
+
+        Returns:
+            pd.DataFrame: New frame with the same columns and index
+        """
+        columns = {}
+        for column in df.columns:
+            series = df[column]
+            if column in self.categorical:
+                series = _to_categorical(series)
+            elif column in self.likert:
+                series = _to_likert(series)
+                if series is None:
+                    series = df[column]
+            elif self.downcast:
+                series = _downcast_integers(series)
+            columns[column] = series
+        return pd.DataFrame(columns, index=df.index)
+
+    def concat(self, frames):
+        """
+        Concatenate compacted frames without falling back to object columns
+
+        Categories are merged (and kept sorted) instead of letting pandas
+        turn mismatched categoricals into object columns, and integer
+        columns are downcast again to the combined range.
+
+        Args:
+            frames (list): Frames with the same columns
+
+        Returns:
+            pd.DataFrame: Compacted frame with a fresh RangeIndex
+        """
+        frames = [self.apply(df) for df in frames]
+        columns = {}
+        for column in frames[0].columns:
+            parts = [df[column] for df in frames]
+            if isinstance(parts[0].dtype, pd.CategoricalDtype):
+                columns[column] = pd.Series(union_categoricals([part.array for part in parts], sort_categories=True))
+            else:
+                columns[column] = pd.concat(parts, ignore_index=True)
+        return self.apply(pd.DataFrame(columns))
+
+
+def replace_values(series, mapping):
+    """
+    ``series.replace(mapping)`` that keeps categoricals categorical
+
+    Only the categories are rewritten; values that map onto an existing
+    category are merged into it and the categories stay sorted.
+
+    Args:
+        series (pd.Series): Column to rewrite
+        mapping (dict): Old value -> new value
+
+    Returns:
+        pd.Series: Rewritten column
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.replace(mapping)
+    renamed = [mapping.get(value, value) for value in series.cat.categories]
+    categories = pd.Index(sorted(set(renamed)), dtype=series.cat.categories.dtype)
+    recode = np.append(categories.get_indexer(renamed), -1)
+    codes = recode[series.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories), index=series.index, name=series.name)
+
+
+def value_counts(series):
+    """
+    ``series.value_counts()`` with object-column semantics for categoricals
+
+    A categorical's ``value_counts`` lists every category, observed or not,
+    and breaks count ties by category order. This counts the codes instead,
+    so only observed values appear and ties keep first-occurrence order,
+    exactly as for the same column stored as strings.
+
+    Args:
+        series (pd.Series): Column to count
+
+    Returns:
+        pd.Series: Counts, most frequent first
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.value_counts()
+    codes = series.cat.codes.to_numpy()
+    counts = pd.Series(codes[codes >= 0]).value_counts()
+    index = pd.Index(series.cat.categories.take(counts.index.to_numpy()), name=series.name)
+    return pd.Series(counts.to_numpy(), index=index, name="count")
+
+
+def _uncompacted_bytes(series):
+    """Estimated size of a column stored the default way (object strings, 64-bit numbers)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        counts = np.bincount(series.cat.codes.to_numpy() + 1, minlength=len(series.cat.categories) + 1)
+        strings = sum(sys.getsizeof(value) * int(count) for value, count in zip(series.cat.categories, counts[1:]))
+        return len(series) * 8 + strings + int(counts[0]) * sys.getsizeof(np.nan)
+    if series.dtype.kind in "biuf":
+        return len(series) * 8
+    return int(series.memory_usage(index=False, deep=True))
+
+
+def memory_report(frames):
+    """
+    Memory held by loaded frames, per column, against the uncompacted layout
+
+    Args:
+        frames (dict): Name -> pd.DataFrame
+
+    Returns:
+        dict: Per frame rows, bytes, estimated uncompacted bytes and columns
+            (name, dtype, bytes), largest column first; plus overall totals
+    """
+    report = {"frames": {}, "bytes": 0, "uncompacted_bytes": 0}
+    for name, df in frames.items():
+        columns = []
+        for column in df.columns:
+            series = df[column]
+            columns.append({
+                "name": str(column),
+                "dtype": str(series.dtype),
+                "bytes": int(series.memory_usage(index=False, deep=True)),
+                "uncompacted_bytes": _uncompacted_bytes(series),
+            })
+        columns.sort(key=lambda entry: entry["bytes"], reverse=True)
+        total = sum(entry["bytes"] for entry in columns)
+        uncompacted = sum(entry["uncompacted_bytes"] for entry in columns)
+        report["frames"][name] = {
+            "rows": len(df), "bytes": total, "uncompacted_bytes": uncompacted, "columns": columns,
+        }
+        report["bytes"] += total
+        report["uncompacted_bytes"] += uncompacted
+    return report
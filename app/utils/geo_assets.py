@@ -0,0 +1,227 @@
+"""
+Geo Assets Module
+Builds content-hashed, precompressed map geometry at several resolutions
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+from app.utils.geo_simplifier import Topology
+from app.utils.compression import ENCODINGS, compress_variants, encoded_path
+
+logger = logging.getLogger(__name__)
+
+# Bump when the simplification or the output layout changes
+GEO_BUILD_VERSION = 1
+
+# Tolerances are in degrees (0.01 deg is about 1.1 km at the equator).
+# Isolated islands smaller than min_ring_area (deg^2) are dropped.
+GEO_RESOLUTIONS = {
+    "low": {"tolerance": 0.03, "min_ring_area": 0.0036, "precision": 3, "quantization": 10000},
+    "medium": {"tolerance": 0.01, "min_ring_area": 0.0001, "precision": 4, "quantization": 100000},
+    "high": {"tolerance": 0.003, "min_ring_area": 0.0, "precision": 5, "quantization": 100000},
+    "full": {"tolerance": 0.0, "min_ring_area": 0.0, "precision": 6, "quantization": 1000000},
+}
+DEFAULT_GEO_RESOLUTION = "medium"
+
+GEO_FORMATS = {
+    "geojson": {"extension": "geojson", "mimetype": "application/geo+json"},
+    "topojson": {"extension": "topojson", "mimetype": "application/json"},
+}
+
+
+class GeoAssetStore:
+    """
+    Simplified GeoJSON/TopoJSON files of one source, built once per source hash
+
+    Every (resolution, format) pair is written as
+    ``<stem>.<resolution>.<content hash>.<ext>`` next to a gzip copy and,
+    when the ``brotli`` package is installed, a brotli copy, so requests are
+    served straight from disk without compressing anything. A file's name
+    changes whenever its bytes do, which lets clients cache it forever. The
+    build is skipped while ``manifest.json`` matches the source file's hash
+    and ``GEO_BUILD_VERSION``.
+    """
+
+    def __init__(self, source, cache_dir, resolutions=None):
+        """
+        Initialize GeoAssetStore
+
+        Args:
+            source (str): Path to a Polygon/MultiPolygon FeatureCollection
+            cache_dir (str): Directory the built files are written to
+            resolutions (dict, optional): Name -> tolerance, min_ring_area,
+                precision and quantization; defaults to GEO_RESOLUTIONS
+        """
+        self.source = source
+        self.cache_dir = cache_dir
+        self.resolutions = dict(resolutions or GEO_RESOLUTIONS)
+        self.stem = os.path.splitext(os.path.basename(source))[0].replace(" ", "_")
+        self._manifest = None
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def manifest(self):
+        """
+        Built assets, building them on first use or when the source changed
+
+        Returns:
+            dict: source hash, version, resolution settings and, per
+                resolution and format, the file name, its size and the sizes
+                of its compressed copies
+        """
+        with self._lock:
+            stat = os.stat(self.source)
+            stamp = (stat.st_size, stat.st_mtime_ns)
+            if self._manifest is None or self._stamp != stamp:
+                source_hash = self._source_hash()
+                manifest = self._read_manifest()
+                if manifest is None or (manifest["source"], manifest["version"]) != (source_hash, GEO_BUILD_VERSION):
+                    manifest = self._build(source_hash)
+                self._manifest, self._stamp = manifest, stamp
+            return self._manifest
+
+    def asset(self, resolution, fmt="geojson"):
+        """
+        Manifest entry of one resolution and format
+
+        Raises:
+            ValueError: For an unknown resolution or format
+        """
+        if resolution not in self.resolutions:
+            raise ValueError(f"Unknown map resolution: {resolution}")
+        if fmt not in GEO_FORMATS:
+            raise ValueError(f"Unknown map format: {fmt}")
+        return self.manifest()["assets"][resolution][fmt]
+
+    def locate(self, file_name, accepted=ENCODINGS):
+        """
+        File to send for a built asset name
+
+        Args:
+            file_name (str): Name from the manifest
+            accepted (iterable): Encodings the client accepts, in preference order
+
+        Returns:
+            tuple: (path, encoding or None, mimetype), or None for names
+                that are not in the current manifest
+        """
+        for assets in self.manifest()["assets"].values():
+            for fmt, entry in assets.items():
+                if entry["file"] != file_name:
+                    continue
+                mimetype = GEO_FORMATS[fmt]["mimetype"]
+                for encoding in accepted:
+                    if entry.get(encoding):
+                        return encoded_path(os.path.join(self.cache_dir, file_name), encoding), encoding, mimetype
+                return os.path.join(self.cache_dir, file_name), None, mimetype
+        return None
+
+    def _source_hash(self):
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(self.source, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.cache_dir, "manifest.json"), encoding="utf-8") as fh:
+                manifest = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("resolutions") != self.resolutions:
+            return None
+        files = [entry["file"] for assets in manifest["assets"].values() for entry in assets.values()]
+        if not all(os.path.exists(os.path.join(self.cache_dir, name)) for name in files):
+            return None
+        return manifest
+
+    def _build(self, source_hash):
+        with open(self.source, encoding="utf-8") as fh:
+            topology = Topology(json.load(fh))
+
+        assets = {}
+        outputs = {}
+        for name, spec in self.resolutions.items():
+            simplified = topology.simplify(spec["tolerance"], spec["min_ring_area"])
+            documents = {
+                "geojson": simplified.to_geojson(spec["precision"]),
+                "topojson": simplified.to_topojson(spec["quantization"]),
+            }
+            assets[name] = {}
+            for fmt, document in documents.items():
+                body = json.dumps(document, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+                digest = hashlib.blake2b(body, digest_size=6).hexdigest()
+                file_name = f"{self.stem}.{name}.{digest}.{GEO_FORMATS[fmt]['extension']}"
+                compressed = compress_variants(body)
+                outputs[file_name] = (body, compressed)
+                assets[name][fmt] = {
+                    "file": file_name,
+                    "bytes": len(body),
+                    **{encoding: len(data) for encoding, data in compressed.items()},
+                }
+
+        manifest = {
+            "source": source_hash, "version": GEO_BUILD_VERSION, "resolutions": self.resolutions, "assets": assets,
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir)
+            try:
+                for file_name, (body, compressed) in outputs.items():
+                    with open(os.path.join(tmp_dir, file_name), "wb") as fh:
+                        fh.write(body)
+                    for encoding, data in compressed.items():
+                        with open(encoded_path(os.path.join(tmp_dir, file_name), encoding), "wb") as fh:
+                            fh.write(data)
+                for name in os.listdir(tmp_dir):
+                    os.replace(os.path.join(tmp_dir, name), os.path.join(self.cache_dir, name))
+                with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as fh:
+                    json.dump(manifest, fh)
+                os.replace(os.path.join(tmp_dir, "manifest.json"), os.path.join(self.cache_dir, "manifest.json"))
+                self._remove_stale(outputs)
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except OSError as e:
+            raise RuntimeError(f"Could not write map assets to {self.cache_dir}: {e}") from e
+        logger.info("Built %d map assets from %s", len(outputs), self.source)
+        return manifest
+
+    def _remove_stale(self, current):
+        keep = set(current)
+        prefix = self.stem + "."
+        for name in os.listdir(self.cache_dir):
+            base = name
+            for encoding in ENCODINGS:
+                base = base.removesuffix(encoded_path("", encoding))
+            if name.startswith(prefix) and base not in keep:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+
+def main(argv=None):
+    """Build step: ``python -m app.utils.geo_assets SOURCE OUT_DIR``."""
+    parser = argparse.ArgumentParser(description="Build simplified, precompressed map assets")
+    parser.add_argument("source", help="GeoJSON FeatureCollection to simplify")
+    parser.add_argument("out_dir", help="Directory to write the assets and manifest.json to")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    manifest = GeoAssetStore(args.source, args.out_dir).manifest()
+    for name, assets in manifest["assets"].items():
+        for fmt, entry in assets.items():
+            sizes = ", ".join(f"{encoding} {entry[encoding]:,}" for encoding in ENCODINGS if entry.get(encoding))
+            print(f"{name:>6} {fmt:<8} {entry['bytes']:>9,} B ({sizes})  {entry['file']}")
+
+
+if __name__ == "__main__":
+    main()
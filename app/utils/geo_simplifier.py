@@ -0,0 +1,343 @@
+"""
+Geo Simplifier Module
+Topology-preserving simplification of polygon GeoJSON and TopoJSON encoding
+"""
+
+import numpy as np
+
+
+def _douglas_peucker(points, tolerance):
+    """
+    Indices kept by Douglas-Peucker on an open polyline
+
+    Args:
+        points (np.ndarray): (n, 2) coordinates
+        tolerance (float): Maximum perpendicular distance of a dropped point
+
+    Returns:
+        list: Sorted indices, always including both endpoints
+    """
+    n = len(points)
+    if n <= 2 or tolerance <= 0:
+        return list(range(n))
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        distances = _segment_distances(points[start + 1:end], points[start], points[end])
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return np.flatnonzero(keep).tolist()
+
+
+def _segment_distances(points, a, b):
+    """Distance of every point to the segment a-b."""
+    ab = b - a
+    length2 = float(ab @ ab)
+    if length2 == 0:
+        return np.hypot(*(points - a).T)
+    t = np.clip(((points - a) @ ab) / length2, 0, 1)
+    return np.hypot(*(points - (a + t[:, None] * ab)).T)
+
+
+def _ring_area(ring):
+    """Absolute shoelace area of a closed ring."""
+    x, y = np.asarray(ring, dtype=np.float64).T
+    return abs(float(np.dot(x[:-1], y[1:]) - np.dot(x[1:], y[:-1]))) / 2
+
+
+class Topology:
+    """
+    Polygon features cut into shared arcs
+
+    Every ring is split at its junctions, the vertices where two rings that
+    share a border stop sharing it. Each border between two provinces then
+    becomes one arc used by both rings (once reversed), so simplifying the
+    arcs instead of the rings moves both sides of a border identically and
+    can never open gaps or overlaps between neighbours. Rings that touch no
+    other ring are a single closed arc.
+    """
+
+    def __init__(self, geojson):
+        """
+        Initialize Topology
+
+        Args:
+            geojson (dict): FeatureCollection of Polygon/MultiPolygon features
+        """
+        self.properties = []
+        self.types = []
+        polygons = []
+        for feature in geojson["features"]:
+            geometry = feature["geometry"]
+            self.properties.append(dict(feature.get("properties") or {}))
+            self.types.append(geometry["type"])
+            parts = geometry["coordinates"] if geometry["type"] == "MultiPolygon" else [geometry["coordinates"]]
+            polygons.append([[self._clean_ring(ring) for ring in polygon] for polygon in parts])
+
+        junctions = self._junctions(polygons)
+        self.arcs = []
+        self._arc_ids = {}
+        # feature -> polygon -> ring -> list of signed arc references (~i = reversed)
+        self.features = [
+            [[self._cut(ring, junctions) for ring in polygon if len(ring) >= 4] for polygon in parts]
+            for parts in polygons
+        ]
+        shared = {}
+        for parts in self.features:
+            for polygon in parts:
+                for ring in polygon:
+                    for ref in ring:
+                        shared[self._index(ref)] = shared.get(self._index(ref), 0) + 1
+        self.arc_uses = [shared.get(i, 0) for i in range(len(self.arcs))]
+
+    @staticmethod
+    def _clean_ring(ring):
+        points = [tuple(point[:2]) for point in ring]
+        deduplicated = [p for i, p in enumerate(points) if i == 0 or p != points[i - 1]]
+        if deduplicated and deduplicated[0] != deduplicated[-1]:
+            deduplicated.append(deduplicated[0])
+        return deduplicated
+
+    @staticmethod
+    def _junctions(polygons):
+        neighbours = {}
+        for parts in polygons:
+            for polygon in parts:
+                for ring in polygon:
+                    open_ring = ring[:-1]
+                    n = len(open_ring)
+                    for i, point in enumerate(open_ring):
+                        pair = frozenset((open_ring[i - 1], open_ring[(i + 1) % n]))
+                        neighbours.setdefault(point, set()).add(pair)
+        return {point for point, pairs in neighbours.items() if len(pairs) > 1}
+
+    @staticmethod
+    def _index(ref):
+        return ~ref if ref < 0 else ref
+
+    def _arc_ref(self, points):
+        """Reference to the arc through ``points``, registering it on first use."""
+        points = tuple(points)
+        if points[0] == points[-1]:
+            # Closed arcs are keyed by rotation to their smallest vertex so
+            # identical rings (an enclave and its hole) share one arc
+            start = min(range(len(points) - 1), key=points.__getitem__)
+            points = points[start:-1] + points[:start + 1]
+        backward = points[::-1]
+        if backward < points:
+            ref = self._arc_ids.get(backward)
+            if ref is None:
+                ref = self._arc_ids[backward] = len(self.arcs)
+                self.arcs.append(np.array(backward, dtype=np.float64))
+            return ~ref
+        ref = self._arc_ids.get(points)
+        if ref is None:
+            ref = self._arc_ids[points] = len(self.arcs)
+            self.arcs.append(np.array(points, dtype=np.float64))
+        return ref
+
+    def _cut(self, ring, junctions):
+        open_ring = ring[:-1]
+        cuts = [i for i, point in enumerate(open_ring) if point in junctions]
+        if not cuts:
+            return [self._arc_ref(ring)]
+        rotated = open_ring[cuts[0]:] + open_ring[:cuts[0]] + [open_ring[cuts[0]]]
+        offsets = [i - cuts[0] for i in cuts] + [len(open_ring)]
+        return [self._arc_ref(rotated[a:b + 1]) for a, b in zip(offsets, offsets[1:])]
+
+    def simplify(self, tolerance, min_ring_area=0.0):
+        """
+        Simplified copy of every arc
+
+        Closed arcs keep at least three distinct vertices. A ring whose
+        arcs all collapse to their endpoints gets the farthest interior
+        vertex of each arc back, on every ring using that arc.
+
+        Args:
+            tolerance (float): Douglas-Peucker tolerance in coordinate units;
+                0 keeps every vertex
+            min_ring_area (float): Rings below this area that share no arc
+                with another ring are dropped, except each feature's largest
+
+        Returns:
+            SimplifiedTopology: Arcs and ring references at this tolerance
+        """
+        kept = [self._simplify_arc(arc, tolerance) for arc in self.arcs]
+        while True:
+            collapsed = [
+                ring for parts in self.features for polygon in parts for ring in polygon
+                if self._ring_length(ring, kept) < 4
+            ]
+            grown = False
+            for ring in collapsed:
+                for ref in ring:
+                    i = self._index(ref)
+                    extra = self._farthest_dropped(self.arcs[i], kept[i])
+                    if extra is not None:
+                        kept[i] = sorted(kept[i] + [extra])
+                        grown = True
+            if not grown:
+                break
+
+        arcs = [arc[indices] for arc, indices in zip(self.arcs, kept)]
+        features = []
+        for parts in self.features:
+            largest = max(
+                (self._ring_area(ring, arcs) for polygon in parts for ring in polygon[:1]), default=0.0,
+            )
+            polygons = []
+            for polygon in parts:
+                if not polygon:
+                    continue
+                outer = polygon[0]
+                area = self._ring_area(outer, arcs)
+                if area < min_ring_area and area < largest and self._isolated(outer):
+                    continue
+                polygons.append([
+                    ring for ring in polygon
+                    if not (self._ring_area(ring, arcs) < min_ring_area and self._isolated(ring))
+                    or ring is outer
+                ])
+            features.append(polygons)
+        return SimplifiedTopology(self, arcs, features)
+
+    def _simplify_arc(self, arc, tolerance):
+        if arc.shape[0] <= 2 or tolerance <= 0:
+            return list(range(len(arc)))
+        if not np.array_equal(arc[0], arc[-1]):
+            return _douglas_peucker(arc, tolerance)
+        # Closed arc: anchor on the vertex farthest from the start
+        far = int(np.argmax(np.hypot(*(arc - arc[0]).T)))
+        first = _douglas_peucker(arc[:far + 1], tolerance)
+        second = [far + i for i in _douglas_peucker(arc[far:], tolerance)]
+        return first + second[1:]
+
+    @staticmethod
+    def _farthest_dropped(arc, indices):
+        best, best_distance = None, 0.0
+        for a, b in zip(indices, indices[1:]):
+            if b - a < 2:
+                continue
+            distances = _segment_distances(arc[a + 1:b], arc[a], arc[b])
+            i = int(np.argmax(distances))
+            if best is None or distances[i] > best_distance:
+                best, best_distance = a + 1 + i, float(distances[i])
+        return best
+
+    def _ring_length(self, ring, kept):
+        return sum(len(kept[self._index(ref)]) - 1 for ref in ring) + 1
+
+    def _isolated(self, ring):
+        return all(self.arc_uses[self._index(ref)] == 1 for ref in ring)
+
+    def _ring_area(self, ring, arcs):
+        return _ring_area(stitch(ring, arcs))
+
+
+def stitch(ring, arcs):
+    """
+    Coordinates of a ring from its signed arc references
+
+    Args:
+        ring (list): Arc references, ``~i`` for arc ``i`` reversed
+        arcs (list): Arc coordinate arrays
+
+    Returns:
+        np.ndarray: (n, 2) closed ring
+    """
+    pieces = []
+    for k, ref in enumerate(ring):
+        points = arcs[~ref][::-1] if ref < 0 else arcs[ref]
+        pieces.append(points if k == 0 else points[1:])
+    return np.concatenate(pieces)
+
+
+class SimplifiedTopology:
+    """Arcs of a Topology at one tolerance, encodable as GeoJSON or TopoJSON"""
+
+    def __init__(self, topology, arcs, features):
+        self.topology = topology
+        self.arcs = arcs
+        self.features = features
+
+    def to_geojson(self, precision=6):
+        """
+        GeoJSON FeatureCollection of the simplified features
+
+        Args:
+            precision (int): Decimals kept per coordinate
+
+        Returns:
+            dict: FeatureCollection with the source properties and geometry types
+        """
+        arcs = [np.round(arc, precision) for arc in self.arcs]
+        features = []
+        for properties, kind, parts in zip(self.topology.properties, self.topology.types, self.features):
+            polygons = [[self._coordinates(stitch(ring, arcs)) for ring in polygon] for polygon in parts]
+            if kind == "Polygon" and len(polygons) == 1:
+                geometry = {"type": "Polygon", "coordinates": polygons[0]}
+            else:
+                geometry = {"type": "MultiPolygon", "coordinates": polygons}
+            features.append({"type": "Feature", "properties": properties, "geometry": geometry})
+        return {"type": "FeatureCollection", "features": features}
+
+    def to_topojson(self, quantization=100000, object_name="provinces"):
+        """
+        Quantized, delta-encoded TopoJSON topology
+
+        Args:
+            quantization (int): Grid cells per axis over the bounding box
+            object_name (str): Key of the GeometryCollection under "objects"
+
+        Returns:
+            dict: Topology with one arc per shared border
+        """
+        used = sorted({
+            Topology._index(ref) for parts in self.features for polygon in parts for ring in polygon for ref in ring
+        })
+        renumber = {old: new for new, old in enumerate(used)}
+        points = np.concatenate([self.arcs[i] for i in used])
+        low, high = points.min(axis=0), points.max(axis=0)
+        scale = np.where(high > low, (high - low) / (quantization - 1), 1.0)
+
+        arcs = []
+        for i in used:
+            grid = np.round((self.arcs[i] - low) / scale).astype(np.int64)
+            keep = np.ones(len(grid), dtype=bool)
+            keep[1:] = np.any(grid[1:] != grid[:-1], axis=1)
+            keep[-1] = True
+            grid = grid[keep]
+            deltas = np.vstack([grid[:1], np.diff(grid, axis=0)])
+            arcs.append(deltas.tolist())
+
+        def remap(ref):
+            return ~renumber[~ref] if ref < 0 else renumber[ref]
+
+        geometries = []
+        for properties, kind, parts in zip(self.topology.properties, self.topology.types, self.features):
+            polygons = [[[remap(ref) for ref in ring] for ring in polygon] for polygon in parts]
+            if kind == "Polygon" and len(polygons) == 1:
+                geometries.append({"type": "Polygon", "arcs": polygons[0], "properties": properties})
+            else:
+                geometries.append({"type": "MultiPolygon", "arcs": polygons, "properties": properties})
+        return {
+            "type": "Topology",
+            "bbox": [*low.tolist(), *high.tolist()],
+            "transform": {"scale": scale.tolist(), "translate": low.tolist()},
+            "objects": {object_name: {"type": "GeometryCollection", "geometries": geometries}},
+            "arcs": arcs,
+        }
+
+    @staticmethod
+    def _coordinates(ring):
+        keep = np.ones(len(ring), dtype=bool)
+        keep[1:] = np.any(ring[1:] != ring[:-1], axis=1)
+        return ring[keep].tolist()
@@ -0,0 +1,136 @@
+"""
+Ingestion Module
+Validates incoming survey rows against the schema of an existing sheet
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class SchemaError(ValueError):
+    """Raised when submitted rows do not match a sheet's schema"""
+
+    MAX_REPORTED = 50
+
+    def __init__(self, errors):
+        self.errors = list(errors)[:self.MAX_REPORTED]
+        super().__init__(f"{len(errors)} invalid value(s): " + "; ".join(self.errors[:5]))
+
+
+class TableSchema:
+    """
+    Column types, required columns and value constraints of one sheet
+
+    ``validate`` turns a list of JSON records into a DataFrame with the
+    same columns and dtypes as the sheet, so it can be appended to the
+    loaded frame without changing any column's type.
+    """
+
+    KINDS = ("int", "float", "str")
+
+    def __init__(self, columns, required=(), choices=None, ranges=None):
+        """
+        Initialize TableSchema
+
+        Args:
+            columns (dict): Column name -> "int", "float" or "str", in sheet order
+            required (iterable): Columns that may not be null
+            choices (dict, optional): Column -> allowed values
+            ranges (dict, optional): Column -> inclusive (min, max) bounds
+        """
+        unknown = {kind for kind in columns.values() if kind not in self.KINDS}
+        if unknown:
+            raise ValueError(f"Unsupported column kinds: {sorted(unknown)}")
+        self.columns = dict(columns)
+        self.required = set(required)
+        self.choices = {column: set(values) for column, values in (choices or {}).items()}
+        self.ranges = dict(ranges or {})
+
+    @classmethod
+    def from_frame(cls, df, choices=None, ranges=None, missing=None):
+        """
+        Infer a schema from a loaded sheet
+
+        Integer columns stay integers, other numeric columns are floats and
+        everything else is text. Columns without nulls are required.
+
+        Args:
+            missing (dict, optional): Column -> value standing for null in
+                the loaded sheet (e.g. LIKERT_MISSING in uint8 answers)
+        """
+        columns = {}
+        for column, dtype in df.dtypes.items():
+            if pd.api.types.is_integer_dtype(dtype):
+                columns[column] = "int"
+            elif pd.api.types.is_numeric_dtype(dtype):
+                columns[column] = "float"
+            else:
+                columns[column] = "str"
+        missing = missing or {}
+        required = [
+            column for column in df.columns
+            if not df[column].isna().any() and not (column in missing and (df[column] == missing[column]).any())
+        ]
+        return cls(columns, required, choices, ranges)
+
+    def validate(self, records):
+        """
+        Check and convert submitted rows
+
+        Args:
+            records (list): One dict per row, keyed by column name
+
+        Returns:
+            pd.DataFrame: Rows typed like the sheet, columns in sheet order
+
+        Raises:
+            SchemaError: Listing every offending row and column
+        """
+        if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+            raise SchemaError(["rows must be a list of objects"])
+
+        errors = []
+        for i, record in enumerate(records):
+            unknown = [key for key in record if key not in self.columns]
+            if unknown:
+                errors.append(f"row {i}: unknown column(s) {unknown}")
+
+        df = pd.DataFrame.from_records(records, columns=list(self.columns))
+        for column, kind in self.columns.items():
+            raw = df[column]
+            missing = raw.isna()
+            if column in self.required:
+                errors.extend(f"row {i}: {column} is required" for i in np.flatnonzero(missing))
+
+            if kind == "str":
+                bad = ~missing & ~raw.map(lambda v: isinstance(v, str))
+                errors.extend(f"row {i}: {column} must be text" for i in np.flatnonzero(bad))
+                values = raw.astype(object).where(~missing, np.nan)
+            else:
+                values = pd.to_numeric(raw.map(lambda v: np.nan if isinstance(v, bool) else v), errors="coerce")
+                bad = ~missing & values.isna()
+                errors.extend(f"row {i}: {column} must be a number" for i in np.flatnonzero(bad))
+                if kind == "int":
+                    fractional = values.notna() & (values != values.round())
+                    errors.extend(f"row {i}: {column} must be an integer" for i in np.flatnonzero(fractional))
+                if column in self.ranges:
+                    low, high = self.ranges[column]
+                    outside = values.notna() & ((values < low) | (values > high))
+                    errors.extend(f"row {i}: {column} must be between {low} and {high}" for i in np.flatnonzero(outside))
+
+            if column in self.choices:
+                present = values.notna()
+                invalid = present & ~values.isin(self.choices[column])
+                errors.extend(f"row {i}: {column} has an unexpected value {values.iloc[i]}" for i in np.flatnonzero(invalid))
+
+            df[column] = values
+
+        if errors:
+            raise SchemaError(errors)
+
+        for column, kind in self.columns.items():
+            if kind == "int" and not df[column].isna().any():
+                df[column] = df[column].astype(np.int64)
+            elif kind == "float":
+                df[column] = df[column].astype(np.float64)
+        return df
@@ -0,0 +1,300 @@
+"""
+Instrumentation Module
+Per-request phase timings, Server-Timing headers and Prometheus metrics
+"""
+
+import bisect
+import contextvars
+import functools
+import threading
+import time
+
+# Upper bounds (seconds) of the request latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_REQUEST = contextvars.ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """
+    Phases of one request: time spent, how often and on how many rows
+
+    Shared by every thread working for the request (worker threads run in a
+    copy of the request's context), hence the lock.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.notes = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds, rows=None):
+        """Add one occurrence of a phase."""
+        with self._lock:
+            entry = self.phases.get(name)
+            if entry is None:
+                entry = self.phases[name] = [0.0, 0, None]
+            entry[0] += seconds
+            entry[1] += 1
+            if rows is not None:
+                entry[2] = (entry[2] or 0) + int(rows)
+
+    def note(self, name, value):
+        """Attach a zero-duration annotation, e.g. a cache hit."""
+        with self._lock:
+            self.notes.setdefault(name, []).append(str(value))
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total=None):
+        """
+        ``Server-Timing`` header value
+
+        Args:
+            total (float, optional): Request duration in seconds, sent as "total"
+
+        Returns:
+            str: e.g. ``filter;dur=1.20;desc="rows=3120", score;dur=0.85, total;dur=4.10``
+        """
+        with self._lock:
+            entries = []
+            for name, (seconds, count, rows) in self.phases.items():
+                details = ([f"n={count}"] if count > 1 else []) + ([f"rows={rows}"] if rows is not None else [])
+                entry = f"{name};dur={seconds * 1e3:.2f}"
+                entries.append(entry + (f';desc="{" ".join(details)}"' if details else ""))
+            for name, values in self.notes.items():
+                entries.append(f'{name};desc="{" ".join(values)}"')
+        if total is not None:
+            entries.append(f"total;dur={total * 1e3:.2f}")
+        return ", ".join(entries)
+
+
+def begin_request():
+    """Start collecting phases for the current request; returns the token for end_request."""
+    return _REQUEST.set(RequestTimings())
+
+
+def end_request(token):
+    """Stop collecting and return the request's RequestTimings."""
+    timings = _REQUEST.get()
+    _REQUEST.reset(token)
+    return timings
+
+
+def current():
+    """RequestTimings of the request being handled, or None outside a request."""
+    return _REQUEST.get()
+
+
+class phase:
+    """
+    Context manager timing a block as one phase of the current request
+
+    A no-op outside instrumented requests. Set ``rows`` on the returned
+    object to record how many rows the block processed::
+
+        with phase("filter") as p:
+            rows = index.query(spec)
+            p.rows = len(rows)
+    """
+
+    __slots__ = ("name", "rows", "_timings", "_started")
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self._timings = None
+        self._started = 0.0
+
+    def __enter__(self):
+        self._timings = _REQUEST.get()
+        if self._timings is not None:
+            self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self._timings is not None:
+            self._timings.add(self.name, time.perf_counter() - self._started, self.rows)
+        return False
+
+
+def timed(name, rows=None):
+    """
+    Decorator timing every call of a function as a phase
+
+    Args:
+        name (str): Phase name
+        rows (callable, optional): Called with the function's arguments;
+            returns the number of rows the call processes
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = _REQUEST.get()
+            if timings is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings.add(name, time.perf_counter() - started, rows(*args, **kwargs) if rows else None)
+        return wrapper
+    return decorator
+
+
+def note(name, value):
+    """Annotate the current request (no-op outside one)."""
+    timings = _REQUEST.get()
+    if timings is not None:
+        timings.note(name, value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class RequestMetrics:
+    """
+    Process-wide aggregates of instrumented requests
+
+    Keeps a latency histogram per (route, method, status) and the total
+    time, count and rows of every phase per route, and renders them in the
+    Prometheus text exposition format.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix="app"):
+        """
+        Initialize RequestMetrics
+
+        Args:
+            buckets (iterable): Histogram bucket upper bounds in seconds
+            prefix (str): Prefix of every metric name
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._requests = {}
+        self._phases = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route, method, status, seconds, timings=None):
+        """
+        Record one finished request
+
+        Args:
+            route (str): URL rule (not the URL, to keep label cardinality bounded)
+            method (str): HTTP method
+            status (int): Response status code
+            seconds (float): Request duration
+            timings (RequestTimings, optional): Its phases
+        """
+        with self._lock:
+            entry = self._requests.get((route, method, status))
+            if entry is None:
+                entry = self._requests[(route, method, status)] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][bisect.bisect_left(self.buckets, seconds)] += 1
+            entry[1] += seconds
+            entry[2] += 1
+            if timings is not None:
+                for name, (phase_seconds, count, rows) in timings.phases.items():
+                    totals = self._phases.get((route, name))
+                    if totals is None:
+                        totals = self._phases[(route, name)] = [0.0, 0, 0]
+                    totals[0] += phase_seconds
+                    totals[1] += count
+                    totals[2] += rows or 0
+
+    def render(self, cache_stats=None, cache_endpoints=None, startup=None):
+        """
+        Prometheus text exposition (format 0.0.4)
+
+        Args:
+            cache_stats (dict, optional): ResponseCache.stats()
+            cache_endpoints (dict, optional): ResponseCache.endpoint_stats()
+            startup (dict, optional): StartupReport.as_dict()
+
+        Returns:
+            str: All metrics, newline-terminated
+        """
+        p = self.prefix
+        with self._lock:
+            requests = {key: (list(counts), total, n) for key, (counts, total, n) in self._requests.items()}
+            phases = {key: list(totals) for key, totals in self._phases.items()}
+
+        lines = [
+            f"# HELP {p}_request_duration_seconds Request latency by route, method and status.",
+            f"# TYPE {p}_request_duration_seconds histogram",
+        ]
+        for (route, method, status), (counts, total, n) in sorted(requests.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{p}_request_duration_seconds_bucket{_labels(route=route, method=method, status=status, le=le)} {cumulative}")
+            labels = _labels(route=route, method=method, status=status)
+            lines.append(f"{p}_request_duration_seconds_sum{labels} {total!r}")
+            lines.append(f"{p}_request_duration_seconds_count{labels} {n}")
+
+        lines += [
+            f"# HELP {p}_phase_seconds Time spent in each request phase, by route.",
+            f"# TYPE {p}_phase_seconds summary",
+        ]
+        for (route, name), (seconds, count, _) in sorted(phases.items()):
+            labels = _labels(route=route, phase=name)
+            lines.append(f"{p}_phase_seconds_sum{labels} {seconds!r}")
+            lines.append(f"{p}_phase_seconds_count{labels} {count}")
+        lines += [
+            f"# HELP {p}_phase_rows_total Rows processed by each request phase, by route.",
+            f"# TYPE {p}_phase_rows_total counter",
+        ]
+        for (route, name), (_, _, rows) in sorted(phases.items()):
+            if not rows:
+                continue
+            lines.append(f"{p}_phase_rows_total{_labels(route=route, phase=name)} {rows}")
+
+        if cache_stats is not None:
+            lines += [
+                f"# HELP {p}_response_cache_lookups_total Response cache lookups by result.",
+                f"# TYPE {p}_response_cache_lookups_total counter",
+                f'{p}_response_cache_lookups_total{{result="hit"}} {cache_stats["hits"]}',
+                f'{p}_response_cache_lookups_total{{result="miss"}} {cache_stats["misses"]}',
+                f"# HELP {p}_response_cache_evictions_total Entries evicted to stay within the byte budget.",
+                f"# TYPE {p}_response_cache_evictions_total counter",
+                f"{p}_response_cache_evictions_total {cache_stats['evictions']}",
+                f"# HELP {p}_response_cache_hit_ratio Hits over lookups since start.",
+                f"# TYPE {p}_response_cache_hit_ratio gauge",
+                f"{p}_response_cache_hit_ratio {cache_stats['hit_ratio']}",
+                f"# HELP {p}_response_cache_bytes Estimated size of the cached results.",
+                f"# TYPE {p}_response_cache_bytes gauge",
+                f"{p}_response_cache_bytes {cache_stats['bytes']}",
+                f"# HELP {p}_response_cache_entries Cached results.",
+                f"# TYPE {p}_response_cache_entries gauge",
+                f"{p}_response_cache_entries {cache_stats['entries']}",
+            ]
+        if cache_endpoints:
+            lines += [
+                f"# HELP {p}_response_cache_endpoint_lookups_total Response cache lookups by endpoint and result.",
+                f"# TYPE {p}_response_cache_endpoint_lookups_total counter",
+            ]
+            for endpoint, counts in sorted(cache_endpoints.items()):
+                lines.append(f"{p}_response_cache_endpoint_lookups_total{_labels(endpoint=endpoint, result='hit')} {counts['hits']}")
+                lines.append(f"{p}_response_cache_endpoint_lookups_total{_labels(endpoint=endpoint, result='miss')} {counts['misses']}")
+        if startup is not None:
+            lines += [
+                f"# HELP {p}_startup_seconds Time this worker spent in each startup stage.",
+                f"# TYPE {p}_startup_seconds gauge",
+            ]
+            for stage, seconds in startup["stages"].items():
+                lines.append(f"{p}_startup_seconds{_labels(stage=stage)} {seconds!r}")
+            lines += [
+                f"# HELP {p}_deferred_import_seconds Time the first import of each deferred module took.",
+                f"# TYPE {p}_deferred_import_seconds gauge",
+            ]
+            for module, seconds in sorted(startup["deferred_imports"].items()):
+                lines.append(f"{p}_deferred_import_seconds{_labels(module=module)} {seconds!r}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,181 @@
+"""
+JSON Provider Module
+Flask JSON provider that serializes NumPy/pandas values natively
+"""
+
+import datetime
+import decimal
+import json
+import math
+import uuid
+
+import numpy as np
+import pandas as pd
+from flask.json.provider import DefaultJSONProvider
+
+from app.utils.instrumentation import timed
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is used instead
+    orjson = None
+
+# RawJSON payloads are embedded with orjson.Fragment, added in orjson 3.9
+if orjson is not None and not hasattr(orjson, "Fragment"):
+    orjson = None
+
+
+class RawJSON:
+    """
+    Already-serialized JSON embedded verbatim in a response
+
+    Lets a frame be encoded by pandas in one pass (``frame_records_json``)
+    and then nested anywhere in a payload without being parsed back into
+    Python objects.
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + len(self.text)
+
+    def __repr__(self):
+        return f"RawJSON({self.text[:60]!r}{'...' if len(self.text) > 60 else ''})"
+
+
+# Record encoding options: Flask's default sort_keys=True, NumPy values as-is
+_RECORD_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS if orjson is not None else None
+
+
+def frame_records_json(df):
+    """
+    A frame as a JSON list of records, encoded once so cached results skip re-serialization
+
+    Encoded by the same encoder as the responses (orjson when installed),
+    so floats are written in their shortest round-tripping form and keys
+    sorted, exactly as ``jsonify`` would write them; NaN, None, NA and NaT
+    become null.
+
+    Args:
+        df (pd.DataFrame): Frame with string column names
+
+    Returns:
+        RawJSON: Same content as ``df.to_dict(orient="records")`` sent through ``jsonify``
+    """
+    records = df.to_dict(orient="records")
+    if orjson is not None:
+        return RawJSON(orjson.dumps(records, default=_default, option=_RECORD_OPTIONS).decode("utf-8"))
+    return RawJSON(json.dumps(
+        _sanitize(records), ensure_ascii=False, separators=(",", ":"), sort_keys=True, allow_nan=False,
+    ))
+
+
+def _default(obj):
+    """Values neither encoder handles natively."""
+    if isinstance(obj, np.generic):
+        value = obj.item()
+        return None if isinstance(value, float) and not math.isfinite(value) else value
+    if isinstance(obj, np.ndarray):
+        return _sanitize(obj)
+    if isinstance(obj, pd.Series):
+        return _sanitize(obj.to_numpy())
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict(orient="records")
+    if obj is pd.NA or obj is pd.NaT:
+        return None
+    if isinstance(obj, (datetime.date, datetime.datetime, pd.Timestamp)):
+        return obj.isoformat()
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _sanitize(obj, raw=None):
+    """
+    JSON-safe copy of a payload for the stdlib encoder
+
+    Converts NumPy/pandas values, turns NaN/inf into None and swaps RawJSON
+    values for placeholder strings recorded in ``raw``.
+    """
+    if isinstance(obj, dict):
+        return {k: _sanitize(v, raw) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_sanitize(v, raw) for v in obj]
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind == "f":
+            finite = np.isfinite(obj)
+            if not finite.all():
+                obj = np.where(finite, obj.astype(object), None)
+            return obj.tolist()
+        if obj.dtype == object:
+            return _sanitize(obj.tolist(), raw)
+        return obj.tolist()
+    if isinstance(obj, RawJSON):
+        if raw is None:
+            return json.loads(obj.text)
+        placeholder = f"\x00raw{len(raw)}:{id(raw)}\x00"
+        raw[json.dumps(placeholder)] = obj.text
+        return placeholder
+    if obj is None or isinstance(obj, (str, int, bool)):
+        return obj
+    try:
+        return _sanitize(_default(obj), raw)
+    except TypeError:
+        return obj
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider for ``jsonify`` and ``request.get_json``
+
+    Uses orjson when it is installed, which encodes NumPy arrays and
+    scalars directly; otherwise the stdlib encoder after one conversion
+    pass. Either way NaN and infinities are written as null (the stdlib
+    default would emit invalid ``NaN`` tokens) and RawJSON values are
+    spliced in as-is. Key sorting follows ``sort_keys`` as in Flask's
+    default provider.
+    """
+
+    @timed("serialize")
+    def dumps(self, obj, **kwargs):
+        """Serialize to a JSON string."""
+        sort_keys = kwargs.pop("sort_keys", self.sort_keys)
+        indent = kwargs.pop("indent", None)
+        separators = kwargs.pop("separators", None)  # orjson output is always compact
+        if orjson is not None and not kwargs:
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=self._orjson_default, option=option).decode("utf-8")
+
+        raw = {}
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        text = json.dumps(
+            _sanitize(obj, raw), sort_keys=sort_keys, indent=indent, separators=separators, allow_nan=False, **kwargs,
+        )
+        for placeholder, fragment in raw.items():
+            text = text.replace(placeholder, fragment, 1)
+        return text
+
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes."""
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    @staticmethod
+    def _orjson_default(obj):
+        if isinstance(obj, RawJSON):
+            return orjson.Fragment(obj.text)
+        return _default(obj)
@@ -0,0 +1,87 @@
+"""
+Loan Bucketer Module
+Assigns every loan its category once and counts categories with bincount
+"""
+
+import numpy as np
+
+
+class LoanBucketer:
+    """
+    Sorted-edges bucketing of loan amounts into LoanProcessor categories
+
+    Each value is located with one ``searchsorted`` over the category
+    minimums and then checked against that category's maximum, so values
+    falling in the gaps between categories (or below zero) get no bucket,
+    exactly as the per-category range checks did. Missing loans count as
+    0, i.e. "No Loan".
+    """
+
+    NO_BUCKET = -1
+
+    def __init__(self, categories):
+        """
+        Initialize LoanBucketer
+
+        Args:
+            categories (list): Dicts with "name", "min" and "max", ordered by
+                "min" and non-overlapping
+
+        Raises:
+            ValueError: If the categories are unordered or overlap
+        """
+        self.categories = list(categories)
+        self.names = [category["name"] for category in self.categories]
+        self._mins = np.array([category["min"] for category in self.categories], dtype=np.float64)
+        self._maxs = np.array([category["max"] for category in self.categories], dtype=np.float64)
+        if np.any(self._mins[1:] <= self._maxs[:-1]) or np.any(self._maxs < self._mins):
+            raise ValueError("Loan categories must be ordered and non-overlapping")
+
+    def codes(self, values):
+        """
+        Bucket index of every value
+
+        Args:
+            values (array-like): Loan amounts; NaN is treated as 0
+
+        Returns:
+            np.ndarray: int8 bucket per value, ``NO_BUCKET`` outside every category
+        """
+        values = np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0)
+        candidates = np.searchsorted(self._mins, values, side="right") - 1
+        valid = candidates >= 0
+        valid[valid] = values[valid] <= self._maxs[candidates[valid]]
+        return np.where(valid, candidates, self.NO_BUCKET).astype(np.int8)
+
+    def counts(self, codes):
+        """
+        Number of values per bucket
+
+        Args:
+            codes (np.ndarray): Output of ``codes`` (or a subset of it)
+
+        Returns:
+            np.ndarray: int64 count per category, in category order
+        """
+        codes = np.asarray(codes)
+        return np.bincount(codes[codes >= 0], minlength=len(self.categories))
+
+    def group_counts(self, codes, group_codes, n_groups):
+        """
+        Bucket counts for every group of a row partition in one bincount
+
+        Args:
+            codes (np.ndarray): Bucket per row
+            group_codes (np.ndarray): Group index per row, -1 for no group
+            n_groups (int): Number of groups
+
+        Returns:
+            np.ndarray: (n_groups, n_categories) int64 counts
+        """
+        codes = np.asarray(codes)
+        group_codes = np.asarray(group_codes)
+        keep = (codes >= 0) & (group_codes >= 0)
+        n_categories = len(self.categories)
+        bins = group_codes[keep].astype(np.int64) * n_categories + codes[keep]
+        counts = np.bincount(bins, minlength=n_groups * n_categories)
+        return counts.reshape(n_groups, n_categories)
@@ -6,6 +6,14 @@ Handles outstanding loan data analysis and categorization
 import pandas as pd
 import numpy as np
 
+from app.utils.frame_schema import replace_values, value_counts
+from app.utils.loan_bucketer import LoanBucketer
+from app.utils.instrumentation import timed
+
+
+def _frame_rows(processor, *args, **kwargs):
+    return len(processor.df)
+
 
 class LoanProcessor:
     """Processes and analyzes outstanding loan data"""
@@ -29,16 +37,21 @@ class LoanProcessor:
         'Undefined': {'color': '#bdc3c7', 'icon': '❓'}
     }
 
-    def __init__(self, df):
+    def __init__(self, df, bucket_codes=None):
         """
         Initialize LoanProcessor with DataFrame
 
         Args:
             df (pd.DataFrame): DataFrame containing outstanding_loan column
+            bucket_codes (np.ndarray, optional): Precomputed loan bucket per
+                row of df (see LoanBucketer.codes)
         """
         self.df = df
         self.loan_categories = self.LOAN_CATEGORIES
+        self.bucketer = BUCKETER
+        self._bucket_codes = bucket_codes
 
+    @timed("loan", rows=_frame_rows)
     def get_loan_statistics(self):
         """
         Calculate comprehensive loan statistics
@@ -77,6 +90,7 @@ class LoanProcessor:
 
         return stats
 
+    @timed("loan", rows=_frame_rows)
     def get_loan_distribution(self):
         """
         Categorize loans into ranges for visualization
@@ -87,8 +101,7 @@ class LoanProcessor:
         distribution = []
         total = len(self.df)
 
-        for category in self.loan_categories:
-            count = self._count_loans_in_category(category)
+        for category, count in zip(self.loan_categories, self._bucket_counts()):
             percentage = round((count / total) * 100, 1) if total > 0 else 0.0
 
             distribution.append(
@@ -107,6 +120,7 @@ class LoanProcessor:
             "colors": [d["color"] for d in distribution],
         }
 
+    @timed("loan", rows=_frame_rows)
     def validate_loan_data(self):
         """
         Validate outstanding_loan data for accuracy and integrity
@@ -166,16 +180,23 @@ class LoanProcessor:
 
         # Category distribution
         report["statistics"]["by_category"] = {}
-        for category in self.loan_categories:
-            count = self._count_loans_in_category(category, loan_numeric)
+        for category, count in zip(self.loan_categories, self._bucket_counts(loan_numeric)):
             report["statistics"]["by_category"][category["name"]] = count
 
         return report
 
      # REFACTORED: Renamed and logic enhanced for generic filtering
-    def get_filtered_loan_data(self, filter_type=None, filter_value=None):
+    @timed("loan", rows=_frame_rows)
+    def get_filtered_loan_data(self, filter_type=None, filter_value=None, summary=None):
         """
         Get comprehensive loan data for the current DataFrame (which may be pre-filtered).
+
+        Args:
+            filter_type (str, optional): Echoed back in the result
+            filter_value (str, optional): Echoed back in the result
+            summary (ColumnSummary, optional): Precomputed summary of the
+                borrowers' loans; when given, mean/median/mode/min/max come
+                from it instead of sorting the borrower series
         """
         filtered_df = self.df
         if len(filtered_df) == 0:
@@ -195,7 +216,16 @@ class LoanProcessor:
             "max": 0.0, "min": 0.0, "total_outstanding": 0.0,
         }
 
-        if len(loan_data_with_loans) > 0:
+        if summary is not None:
+            if summary.count > 0:
+                stats["mean"] = float(summary.stats.mean)
+                stats["median"] = float(summary.quantile_sketch.quantile(0.5))
+                stats["max"] = float(summary.stats.max)
+                stats["min"] = float(summary.stats.min)
+                stats["total_outstanding"] = float(summary.total)
+                stats["mode"] = float(summary.mode())
+            stats["approximate"] = not summary.quantile_sketch.is_exact
+        elif len(loan_data_with_loans) > 0:
             stats["mean"] = float(loan_data_with_loans.mean())
             stats["median"] = float(loan_data_with_loans.median())
             stats["max"] = float(loan_data_with_loans.max())
@@ -208,8 +238,7 @@ class LoanProcessor:
         stats["without_loan_pct"] = (round((stats["without_loan"] / stats["total_respondents"]) * 100, 1) if stats["total_respondents"] > 0 else 0)
 
         distribution = []
-        for category in self.loan_categories:
-            count = self._count_loans_in_category(category, loan_data)
+        for category, count in zip(self.loan_categories, self._bucket_counts()):
             percentage = (round((count / len(filtered_df)) * 100, 1) if len(filtered_df) > 0 else 0.0)
             distribution.append({
                 "category": category["name"], "count": count,
@@ -219,13 +248,16 @@ class LoanProcessor:
         stats["distribution"] = distribution
         return stats
 
+    @timed("loan", rows=_frame_rows)
     def get_loan_purpose_distribution(self):
-        borrowers_df = self.df[self.df["outstanding_loan"] > 0].copy()
-        if borrowers_df.empty: return []
+        purposes = self.df.loc[self.df["outstanding_loan"] > 0, "loan_usage_purpose"]
+        if purposes.empty: return []
 
-        borrowers_df["loan_usage_purpose"] = borrowers_df["loan_usage_purpose"].fillna("Undefined").replace(["Tidak Ada", ""], "Undefined")
-        purpose_counts = borrowers_df["loan_usage_purpose"].value_counts()
-        total_borrowers = len(borrowers_df)
+        if isinstance(purposes.dtype, pd.CategoricalDtype) and "Undefined" not in purposes.cat.categories:
+            purposes = purposes.cat.add_categories("Undefined")
+        purposes = replace_values(purposes.fillna("Undefined"), {"Tidak Ada": "Undefined", "": "Undefined"})
+        purpose_counts = value_counts(purposes)
+        total_borrowers = len(purposes)
 
         distribution = []
         for purpose, count in purpose_counts.items():
@@ -239,32 +271,26 @@ class LoanProcessor:
         return distribution
 
 
-    def _count_loans_in_category(self, category, loan_data=None):
+    def _bucket_counts(self, loan_data=None):
         """
-        Count loans in a specific category (NULL-safe)
+        Count loans per category in one pass (NULL-safe)
 
         Args:
-            category (dict): Category definition with min/max values
-            loan_data (pd.Series, optional): Loan data to count. Defaults to self.df['outstanding_loan']
+            loan_data (pd.Series, optional): Loan data to count. Defaults to
+                self.df['outstanding_loan'], using the precomputed bucket codes
+                when they were given
 
         Returns:
-            int: Count of loans in category
+            list: Count per category, in LOAN_CATEGORIES order
         """
+        # Missing loan data counts as "No Loan" for consistent aggregation
         if loan_data is None:
-            loan_data = self.df["outstanding_loan"]
-
-        # CRITICAL FIX: Fill NaN with 0 to ensure all records are categorized
-        # Treats missing loan data as "No Loan" for consistent aggregation
-        loan_data = loan_data.fillna(0)
-
-        if category["max"] == 0:
-            return int((loan_data == 0).sum())
-        elif category["max"] == float("inf"):
-            return int((loan_data >= category["min"]).sum())
+            codes = self._bucket_codes
+            if codes is None:
+                codes = self.bucketer.codes(self.df["outstanding_loan"])
         else:
-            return int(
-                ((loan_data >= category["min"]) & (loan_data <= category["max"])).sum()
-            )
+            codes = self.bucketer.codes(loan_data)
+        return [int(count) for count in self.bucketer.counts(codes)]
 
     def _get_empty_stats(self):
         """Return empty statistics structure"""
@@ -319,3 +345,7 @@ class LoanProcessor:
             return f"Rp {amount/1_000:.1f}K"
         else:
             return f"Rp {amount:.0f}"
+
+
+# Shared bucketing of the fixed loan categories
+BUCKETER = LoanBucketer(LoanProcessor.LOAN_CATEGORIES)
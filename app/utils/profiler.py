@@ -0,0 +1,242 @@
+"""
+Profiler Module
+Opt-in WSGI middleware writing per-request pstats, collapsed-stack and allocation profiles
+"""
+
+import cProfile
+import datetime
+import hmac
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+PROFILERS = ("cprofile", "sample")
+
+# Allocation sites kept in the .alloc.txt report
+TOP_ALLOCATIONS = 50
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")).replace(os.sep, "/") + "/"
+
+
+def _frame_label(code):
+    """``function (path:line)`` with the path cut at the repo or site-packages."""
+    path = code.co_filename.replace(os.sep, "/")
+    position = path.rfind("/site-packages/")
+    if position >= 0:
+        path = path[position + len("/site-packages/"):]
+    elif path.startswith(_REPO_ROOT):
+        path = path[len(_REPO_ROOT):]
+    else:
+        path = os.path.basename(path)
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack at a fixed interval
+
+    Stacks are cut at ``root`` (the frame that started the sampler), so every
+    sample starts at the profiled request, and counted in the collapsed-stack
+    format read by flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, thread_id, root, interval):
+        """
+        Initialize StackSampler
+
+        Args:
+            thread_id (int): ``threading.get_ident()`` of the thread to sample
+            root (frame): Outermost frame to include
+            interval (float): Seconds between samples
+        """
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                if frame is self.root:
+                    break
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self):
+        """``frame;frame;frame count`` lines, one per distinct stack."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfilerMiddleware:
+    """
+    Profiles selected requests of a WSGI app and writes the results to disk
+
+    A request is profiled when ``PROFILE_REQUESTS`` is on, or when it carries
+    an ``X-Profile`` header equal to ``PROFILE_TOKEN``. The whole request is
+    covered: routing, services, processors, chart building, serialization and
+    compression. Other requests pass straight through.
+
+    Per profiled request, ``PROFILE_DIR`` gets files sharing one stem:
+
+    - ``<stem>.prof``: cProfile statistics (``python -m pstats``, snakeviz)
+    - ``<stem>.collapsed``: sampled stacks for flamegraph tools
+    - ``<stem>.alloc.txt``: top allocation sites, with allocation tracking on
+    - ``<stem>.json``: URL, status, duration and the files written
+
+    The stem is returned in an ``X-Profile-Id`` response header. Only one
+    request is profiled at a time (cProfile is process-wide state); requests
+    arriving meanwhile are served unprofiled, and a profile that cannot be
+    written is logged and skipped. Both profilers follow the request thread
+    only, so work handed to thread pools shows up as waiting.
+    """
+
+    def __init__(self, wsgi_app, config):
+        """
+        Initialize ProfilerMiddleware
+
+        Args:
+            wsgi_app (callable): The WSGI app to wrap
+            config (dict): Read on every request, so settings can change at runtime:
+                PROFILE_REQUESTS, PROFILE_TOKEN, PROFILE_DIR, PROFILER
+                ("cprofile", "sample" or both, comma-separated),
+                PROFILE_INTERVAL_MS and PROFILE_ALLOCATIONS
+        """
+        self.wsgi_app = wsgi_app
+        self.config = config
+        self._lock = threading.Lock()
+
+    def _requested(self, environ):
+        if self.config.get("PROFILE_REQUESTS"):
+            return True
+        token = self.config.get("PROFILE_TOKEN")
+        supplied = environ.get("HTTP_X_PROFILE")
+        return bool(token and supplied) and hmac.compare_digest(supplied.encode(), token.encode())
+
+    def _options(self, environ):
+        """Profilers and allocation tracking, optionally overridden by request headers."""
+        profilers = environ.get("HTTP_X_PROFILE_MODE") or self.config.get("PROFILER", "cprofile,sample")
+        profilers = {name.strip().lower() for name in profilers.split(",")} & set(PROFILERS)
+        allocations = environ.get("HTTP_X_PROFILE_ALLOCATIONS")
+        allocations = allocations not in ("0", "false", "no") if allocations else self.config.get("PROFILE_ALLOCATIONS", False)
+        return profilers or {"cprofile"}, allocations
+
+    def __call__(self, environ, start_response):
+        if not self._requested(environ) or not self._lock.acquire(blocking=False):
+            return self.wsgi_app(environ, start_response)
+        try:
+            return self._profile(environ, start_response)
+        finally:
+            self._lock.release()
+
+    def _profile(self, environ, start_response):
+        profilers, allocations = self._options(environ)
+        stem = self._stem(environ)
+        captured = {}
+
+        def capture_start_response(status, headers, exc_info=None):
+            captured["status"] = status
+            return start_response(status, headers + [("X-Profile-Id", stem)], exc_info)
+
+        sampler = None
+        if "sample" in profilers:
+            interval = float(self.config.get("PROFILE_INTERVAL_MS", 1)) / 1e3
+            sampler = StackSampler(threading.get_ident(), sys._getframe(), interval)
+        profile = cProfile.Profile() if "cprofile" in profilers else None
+        tracing = allocations and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start(25)
+
+        started = time.perf_counter()
+        if sampler is not None:
+            sampler.start()
+        if profile is not None:
+            profile.enable()
+        try:
+            # Drain the body here so lazily generated responses are profiled too
+            body = self.wsgi_app(environ, capture_start_response)
+            try:
+                chunks = list(body)
+            finally:
+                if hasattr(body, "close"):
+                    body.close()
+        finally:
+            if profile is not None:
+                profile.disable()
+            if sampler is not None:
+                sampler.stop()
+            duration = time.perf_counter() - started
+            snapshot = None
+            if allocations and tracemalloc.is_tracing():
+                snapshot = tracemalloc.take_snapshot().filter_traces([
+                    tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__),
+                ])
+                peak = tracemalloc.get_traced_memory()[1]
+                if tracing:
+                    tracemalloc.stop()
+            allocated = (snapshot, peak) if snapshot is not None else None
+            try:
+                self._write(stem, environ, captured.get("status"), duration, profile, sampler, allocated)
+            except Exception as e:
+                # A profile that cannot be saved must not fail the request or mask its error
+                logger.warning("Could not write profile %s: %s", stem, e)
+        return chunks
+
+    @staticmethod
+    def _stem(environ):
+        timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = re.sub(r"[^A-Za-z0-9_.-]+", "_", environ.get("PATH_INFO", "/").strip("/")) or "index"
+        return f"{timestamp}-{environ.get('REQUEST_METHOD', 'GET')}-{path[:80]}"
+
+    def _write(self, stem, environ, status, duration, profile, sampler, allocations):
+        directory = self.config.get("PROFILE_DIR") or "profiles"
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, stem)
+        files = []
+        if profile is not None:
+            profile.dump_stats(base + ".prof")
+            files.append(stem + ".prof")
+        if sampler is not None:
+            with open(base + ".collapsed", "w", encoding="utf-8") as fh:
+                fh.write(sampler.collapsed())
+            files.append(stem + ".collapsed")
+        if allocations is not None:
+            snapshot, peak = allocations
+            statistics = snapshot.statistics("lineno")
+            with open(base + ".alloc.txt", "w", encoding="utf-8") as fh:
+                fh.write(f"peak traced memory: {peak / 2**20:.1f} MiB\n")
+                fh.write(f"live at end: {sum(stat.size for stat in statistics) / 2**20:.1f} MiB\n\n")
+                for stat in statistics[:TOP_ALLOCATIONS]:
+                    fh.write(f"{stat}\n")
+            files.append(stem + ".alloc.txt")
+        meta = {
+            "method": environ.get("REQUEST_METHOD"),
+            "path": environ.get("PATH_INFO"),
+            "query": environ.get("QUERY_STRING", ""),
+            "status": status,
+            "duration_s": round(duration, 6),
+            "samples": sum(sampler.stacks.values()) if sampler is not None else None,
+            "files": files,
+        }
+        with open(base + ".json", "w", encoding="utf-8") as fh:
+            json.dump(meta, fh, indent=1)
@@ -0,0 +1,364 @@
+"""
+Quantile Sketch Module
+Mergeable KLL quantile sketches and heavy-hitter counters per facet value
+"""
+
+import numpy as np
+import pandas as pd
+
+from app.utils.running_aggregates import RunningStats
+
+DEFAULT_PERCENTILES = (10, 25, 75, 90)
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch over float values
+
+    Keeps a stack of compactors; an item on level ``h`` stands for ``2**h``
+    original values. Sketches built from bulk updates and combined with
+    ``merge_many`` answer quantiles with a normalized rank error of about
+    ``1.7 / k`` (under 1% for the default ``k=200``) with high probability,
+    independent of the number of values; many small incremental updates can
+    roughly double that. While nothing has been compacted
+    the sketch holds every value and answers exactly, interpolating like
+    pandas.
+    """
+
+    def __init__(self, k=200, seed=0):
+        """
+        Initialize KLLSketch
+
+        Args:
+            k (int): Capacity of the top compactor; larger is more accurate
+            seed (int): Seed of the compaction coin flips, which are derived from
+                it and the item counts so answers are reproducible
+        """
+        self.k = k
+        self.n = 0
+        self.seed = seed
+        self.levels = [np.empty(0)]
+
+    @property
+    def is_exact(self):
+        return len(self.levels) == 1
+
+    @property
+    def rank_error(self):
+        """Normalized rank error bound of quantile answers (0 while exact)."""
+        return 0.0 if self.is_exact else 1.7 / self.k
+
+    def update(self, values):
+        """Add a batch of values, ignoring NaN."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress(np.random.default_rng([self.seed, self.n]))
+
+    def merge(self, other):
+        """
+        Combine two sketches
+
+        Returns:
+            KLLSketch: New sketch summarizing both inputs
+        """
+        return KLLSketch.merge_many([self, other])
+
+    @classmethod
+    def merge_many(cls, sketches):
+        """
+        Combine any number of sketches with a single compaction pass
+
+        Merging all inputs at once compacts each level at most a few times,
+        which keeps the error lower than a chain of pairwise merges.
+
+        Returns:
+            KLLSketch: New sketch summarizing every input
+        """
+        sketches = list(sketches)
+        merged = cls(max((s.k for s in sketches), default=200), sketches[0].seed if sketches else 0)
+        merged.n = sum(s.n for s in sketches)
+        depth = max((len(s.levels) for s in sketches), default=1)
+        merged.levels = [
+            np.concatenate([np.empty(0)] + [s.levels[h] for s in sketches if h < len(s.levels)])
+            for h in range(depth)
+        ]
+        # Coin flips depend on the inputs; reusing one fixed stream for
+        # every merge would bias all compactions the same way
+        merged._compress(np.random.default_rng([merged.seed, merged.n] + [s.n for s in sketches]))
+        return merged
+
+    def quantiles(self, qs):
+        """
+        Approximate quantiles
+
+        Args:
+            qs (list): Quantile levels between 0 and 1
+
+        Returns:
+            list: One float per level, None when the sketch is empty
+        """
+        if self.n == 0:
+            return [None for _ in qs]
+        if self.is_exact:
+            return [float(v) for v in np.quantile(self.levels[0], qs)]
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2 ** h, dtype=np.int64) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        targets = np.asarray(qs, dtype=np.float64) * cumulative[-1]
+        positions = np.minimum(np.searchsorted(cumulative, targets, side="left"), len(items) - 1)
+        return [float(v) for v in items[positions]]
+
+    def quantile(self, q):
+        return self.quantiles([q])[0]
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(8, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self, rng):
+        compacted = True
+        while compacted:
+            compacted = False
+            for level in range(len(self.levels)):
+                items = self.levels[level]
+                if len(items) <= self._capacity(level):
+                    continue
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                # Keep one item back when the count is odd so weight is conserved
+                items = np.sort(items)
+                odd = len(items) % 2
+                promoted = items[odd:][int(rng.integers(2))::2]
+                self.levels[level] = items[:odd]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                compacted = True
+
+
+class FrequentItems:
+    """
+    Misra-Gries heavy-hitter counter
+
+    Keeps at most ``capacity`` counters. A reported count underestimates
+    the true count by at most ``error`` (itself at most
+    ``n / (capacity + 1)``); counts are exact while fewer than
+    ``capacity`` distinct values have been seen.
+    """
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.n = 0
+        self.error = 0
+        self.counts = {}
+
+    def update(self, values):
+        """Count a batch of values, ignoring NaN."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        uniques, counts = np.unique(values, return_counts=True)
+        self.n += len(values)
+        for value, count in zip(uniques.tolist(), counts.tolist()):
+            self.counts[value] = self.counts.get(value, 0) + count
+        self._reduce()
+
+    def merge(self, other):
+        """
+        Combine two counters
+
+        Returns:
+            FrequentItems: New counter summarizing both inputs
+        """
+        merged = FrequentItems(max(self.capacity, other.capacity))
+        merged.n = self.n + other.n
+        merged.error = self.error + other.error
+        merged.counts = dict(self.counts)
+        for value, count in other.counts.items():
+            merged.counts[value] = merged.counts.get(value, 0) + count
+        merged._reduce()
+        return merged
+
+    def most_common(self):
+        """
+        Most frequent value, ties going to the smallest value (as pandas' mode)
+
+        Returns:
+            tuple: (value, count), or None when no counter survived
+        """
+        if not self.counts:
+            return None
+        value = min(self.counts, key=lambda v: (-self.counts[v], v))
+        return value, self.counts[value]
+
+    def _reduce(self):
+        if len(self.counts) <= self.capacity:
+            return
+        threshold = sorted(self.counts.values(), reverse=True)[self.capacity]
+        self.error += threshold
+        self.counts = {v: c - threshold for v, c in self.counts.items() if c > threshold}
+
+
+class ColumnSummary:
+    """Moments, quantile sketch and heavy hitters of one numeric column subset"""
+
+    def __init__(self, k=200, capacity=64):
+        self.stats = RunningStats()
+        self.total = 0.0
+        self.quantile_sketch = KLLSketch(k)
+        self.frequent = FrequentItems(capacity)
+
+    @classmethod
+    def from_values(cls, values, k=200, capacity=64):
+        summary = cls(k, capacity)
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        summary.stats.update(values)
+        summary.total = float(values.sum())
+        summary.quantile_sketch.update(values)
+        summary.frequent.update(values)
+        return summary
+
+    @classmethod
+    def merge_all(cls, summaries):
+        """
+        Combine summaries of disjoint subsets
+
+        Returns:
+            ColumnSummary: Summary of their union
+        """
+        summaries = list(summaries)
+        merged = cls()
+        for summary in summaries:
+            merged.stats.merge(summary.stats)
+            merged.total += summary.total
+            merged.frequent = merged.frequent.merge(summary.frequent)
+        if summaries:
+            merged.quantile_sketch = KLLSketch.merge_many(s.quantile_sketch for s in summaries)
+        return merged
+
+    @property
+    def count(self):
+        return self.stats.count
+
+    def mode(self):
+        """Most frequent value; the minimum when no value repeats often enough to be tracked."""
+        top = self.frequent.most_common()
+        return top[0] if top is not None else self.stats.min
+
+    def describe(self, percentiles=DEFAULT_PERCENTILES):
+        """Summary statistics in the shape of ``describe_exact``."""
+        variance = self.stats.variance
+        quantiles = self.quantile_sketch.quantiles([0.5] + [p / 100 for p in percentiles])
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.stats.mean if self.count else None,
+            "std": float(np.sqrt(variance)) if variance is not None else None,
+            "min": self.stats.min,
+            "max": self.stats.max,
+            "median": quantiles[0],
+            "percentiles": {f"p{p}": q for p, q in zip(percentiles, quantiles[1:])},
+            "mode": self.mode() if self.count else None,
+            "approximate": not self.quantile_sketch.is_exact,
+            "rank_error": self.quantile_sketch.rank_error,
+        }
+
+
+def describe_exact(values, percentiles=DEFAULT_PERCENTILES):
+    """
+    Exact summary statistics of a numeric series, ignoring NaN
+
+    Returns:
+        dict: count, sum, mean, std, min, max, median, percentiles, mode
+    """
+    values = pd.Series(values, dtype=np.float64).dropna()
+    if values.empty:
+        return {
+            "count": 0, "sum": 0.0, "mean": None, "std": None, "min": None, "max": None, "median": None,
+            "percentiles": {f"p{p}": None for p in percentiles}, "mode": None,
+            "approximate": False, "rank_error": 0.0,
+        }
+    quantiles = np.quantile(values.to_numpy(), [0.5] + [p / 100 for p in percentiles])
+    std = values.std()
+    return {
+        "count": int(len(values)),
+        "sum": float(values.sum()),
+        "mean": float(values.mean()),
+        "std": float(std) if not np.isnan(std) else None,
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "median": float(quantiles[0]),
+        "percentiles": {f"p{p}": float(q) for p, q in zip(percentiles, quantiles[1:])},
+        "mode": float(values.mode().iloc[0]),
+        "approximate": False,
+        "rank_error": 0.0,
+    }
+
+
+class SummaryIndex:
+    """
+    ColumnSummary for the whole frame and for every (facet column, value)
+
+    A filter on one facet column, with any number of values, is answered by
+    merging the summaries of those values, which are disjoint. Filters over
+    several columns cannot be combined from per-value summaries; ``lookup``
+    returns None for them and callers compute exactly.
+    """
+
+    def __init__(self, df, columns, facet_columns, k=200, capacity=64):
+        """
+        Initialize SummaryIndex
+
+        Args:
+            df (pd.DataFrame): Frame to summarize
+            columns (dict): Summary name -> callable mapping the frame to a
+                float array (NaN for rows that do not count)
+            facet_columns (iterable): Columns whose values get a summary each
+            k (int): KLL sketch size
+            capacity (int): Heavy-hitter counters per summary
+        """
+        self.k = k
+        values = {name: np.asarray(extract(df), dtype=np.float64) for name, extract in columns.items()}
+        self._overall = {name: ColumnSummary.from_values(v, k, capacity) for name, v in values.items()}
+        self._facets = {}
+        for facet in facet_columns:
+            if facet not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[facet])
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            self._facets[facet] = {
+                str(value): {
+                    name: ColumnSummary.from_values(v[order[bounds[i]:bounds[i + 1]]], k, capacity)
+                    for name, v in values.items()
+                }
+                for i, value in enumerate(uniques)
+            }
+
+    def lookup(self, name, filters=None):
+        """
+        Summary of a column under a filter spec
+
+        Args:
+            name (str): Summary name
+            filters (dict, optional): Column -> list of accepted values
+
+        Returns:
+            ColumnSummary: Merged summary, or None when the filter spans
+                several columns
+        """
+        if not filters:
+            return self._overall[name]
+        if len(filters) != 1:
+            return None
+        (facet, accepted), = filters.items()
+        by_value = self._facets.get(facet)
+        if by_value is None:
+            return None
+        return ColumnSummary.merge_all(
+            by_value[value][name] for value in dict.fromkeys(map(str, accepted)) if value in by_value
+        )
@@ -0,0 +1,90 @@
+"""
+Regional Aggregator Module
+Per-region means, modes and mode shares from one grouped pass
+"""
+
+import numpy as np
+import pandas as pd
+
+from app.utils.instrumentation import timed
+
+
+class RegionalAggregator:
+    """
+    Grouped means and categorical modes over a key column
+
+    Every categorical column is turned into a (region x value) count table
+    with a single ``np.bincount``; the mode of each region is the arg-max of
+    its row and the mode's share is read off the same table, so no region
+    is ever re-filtered. Values are factorized in sorted order, which makes
+    ties go to the smallest value, as with ``Series.mode().iloc[0]``.
+    """
+
+    def __init__(self, key, mean_columns, mode_columns, share_columns=()):
+        """
+        Initialize RegionalAggregator
+
+        Args:
+            key (str): Grouping column; rows with a null key are skipped
+            mean_columns (list): Numeric columns to average (nulls ignored)
+            mode_columns (list): Categorical columns to take the mode of
+            share_columns (list): Mode columns whose mode share is also
+                reported, as a percentage of all rows of the region, in a
+                ``<column>_share`` column
+        """
+        self.key = key
+        self.mean_columns = list(mean_columns)
+        self.mode_columns = list(mode_columns)
+        self.share_columns = list(share_columns)
+
+    @timed("aggregate", rows=lambda aggregator, df: len(df))
+    def aggregate(self, df):
+        """
+        Aggregate a frame
+
+        Args:
+            df (pd.DataFrame): Rows to aggregate
+
+        Returns:
+            pd.DataFrame: One row per region, sorted by the key, with the key,
+                mean columns, mode columns and share columns in that order
+        """
+        keys, regions = pd.factorize(df[self.key], sort=True)
+        n_regions = len(regions)
+        in_region = keys >= 0
+        sizes = np.bincount(keys[in_region], minlength=n_regions)
+
+        numeric = df[self.mean_columns].apply(pd.to_numeric, errors="coerce")
+        means = numeric[in_region].groupby(keys[in_region]).mean().reindex(range(n_regions))
+
+        result = {self.key: regions}
+        for column in self.mean_columns:
+            result[column] = means[column].to_numpy()
+
+        shares = {}
+        for column in self.mode_columns:
+            modes, mode_counts = self._modes(keys, df[column], n_regions)
+            result[column] = modes
+            if column in self.share_columns:
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    share = np.round(mode_counts / sizes * 100, 1)
+                shares[f"{column}_share"] = np.where(mode_counts > 0, share, 0.0)
+        result.update(shares)
+        return pd.DataFrame(result)
+
+    @staticmethod
+    def _modes(keys, values, n_regions):
+        """Mode and its count per region, from a (region x value) count table."""
+        codes, labels = pd.factorize(values, sort=True)
+        valid = (keys >= 0) & (codes >= 0)
+        n_labels = max(len(labels), 1)
+        table = np.bincount(
+            keys[valid].astype(np.int64) * n_labels + codes[valid], minlength=n_regions * n_labels,
+        ).reshape(n_regions, n_labels)
+        mode_counts = table.max(axis=1)
+        mode_codes = table.argmax(axis=1)
+        labels = np.asarray(labels, dtype=object)
+        modes = np.array(
+            [labels[code] if count > 0 else None for code, count in zip(mode_codes, mode_counts)], dtype=object,
+        )
+        return modes, mode_counts
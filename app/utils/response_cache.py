@@ -0,0 +1,203 @@
+"""
+Response Cache Module
+Bounded LRU/TTL memoization of service results
+"""
+
+import functools
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from app.utils.instrumentation import note
+
+
+def estimate_size(obj):
+    """
+    Approximate deep size of a JSON-like result in bytes
+
+    Args:
+        obj: Nested dicts/lists/tuples of scalars, strings and NumPy arrays
+
+    Returns:
+        int: Estimated number of bytes held by the object graph
+    """
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (0 if obj.base is None else obj.nbytes)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v) for v in obj)
+    return size
+
+
+def _freeze(value):
+    """
+    Hashable form of request parameters
+
+    Tuples (positional arguments) keep their order; dict keys and list/set
+    members (e.g. the values of a cross filter) are sorted, since their
+    order does not change the result.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, tuple):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (list, set, frozenset)):
+        return tuple(sorted((_freeze(v) for v in value), key=repr))
+    return value
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with a byte budget and per-entry TTL
+
+    Entries are evicted least-recently-used first whenever the estimated
+    size of all cached results exceeds ``max_bytes``, and are treated as
+    misses once they are older than ``ttl`` seconds. Cached results are
+    shared between callers and must not be modified.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttl=600, enabled=True):
+        """
+        Initialize ResponseCache
+
+        Args:
+            max_bytes (int): Byte budget for all cached results
+            ttl (float): Seconds an entry stays valid; 0 disables expiry
+            enabled (bool): When False every lookup is a miss and nothing is stored
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        self._endpoints = {}
+
+    def configure(self, max_bytes=None, ttl=None, enabled=None):
+        """Update limits at runtime; shrinking the budget evicts immediately."""
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if ttl is not None:
+                self.ttl = ttl
+            if enabled is not None:
+                self.enabled = enabled
+            self._evict()
+
+    def get(self, key):
+        """
+        Look up a cached result
+
+        Returns:
+            tuple: (True, value) on a hit, (False, None) on a miss
+        """
+        if not self.enabled:
+            return False, None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return False, None
+            value, size, stored_at = entry
+            if self.ttl and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self._bytes -= size
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return True, value
+
+    def put(self, key, value):
+        """Store a result, evicting older entries to stay within the byte budget."""
+        if not self.enabled:
+            return
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size, time.monotonic())
+            self._bytes += size
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Counters and current occupancy, including the hit ratio."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update(entries=len(self._entries), bytes=self._bytes, max_bytes=self.max_bytes, ttl=self.ttl)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def endpoint_stats(self):
+        """Hits and misses of every decorated function, keyed by its endpoint name."""
+        with self._lock:
+            return {name: {"hits": hits, "misses": misses} for name, (hits, misses) in self._endpoints.items()}
+
+    def cached(self, name, version=None, cache_if=None):
+        """
+        Decorator memoizing a function on its arguments and a dataset version
+
+        Args:
+            name (str): Endpoint name, part of every key
+            version (callable, optional): Returns the version of the data the
+                function reads; a new version makes old entries unreachable
+            cache_if (callable, optional): Predicate on the result deciding
+                whether it is stored (defaults to skipping ``(error, status)``
+                tuples)
+
+        Returns:
+            callable: Decorator
+        """
+        if cache_if is None:
+            cache_if = lambda result: not isinstance(result, tuple)
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                try:
+                    key = (name, _freeze(args), _freeze(kwargs), version() if version else None)
+                    hash(key)
+                except (TypeError, FileNotFoundError):
+                    return func(*args, **kwargs)
+                hit, value = self.get(key)
+                if self.enabled:
+                    self._count_endpoint(name, hit)
+                    note("cache", f"{'hit' if hit else 'miss'}:{name}")
+                if hit:
+                    return value
+                value = func(*args, **kwargs)
+                if cache_if(value):
+                    self.put(key, value)
+                return value
+
+            wrapper.uncached = func
+            return wrapper
+
+        return decorator
+
+    def _count_endpoint(self, name, hit):
+        with self._lock:
+            counts = self._endpoints.setdefault(name, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._counters["evictions"] += 1
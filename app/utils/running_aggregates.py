@@ -0,0 +1,183 @@
+"""
+Running Aggregates Module
+Incrementally maintained statistics over appended survey rows
+"""
+
+import threading
+
+import numpy as np
+
+from app.utils.frame_schema import value_counts
+
+
+class RunningStats:
+    """Count, mean and variance of a numeric column, updated batch by batch (Welford/Chan)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def update(self, values):
+        """
+        Merge a batch of values, ignoring nulls
+
+        Args:
+            values (array-like): New observations
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        n_b = len(values)
+        if n_b == 0:
+            return
+        mean_b = float(values.mean())
+        m2_b = float(((values - mean_b) ** 2).sum())
+
+        n = self.count + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * self.count * n_b / n
+        self.count = n
+        self.min = float(values.min()) if self.min is None else min(self.min, float(values.min()))
+        self.max = float(values.max()) if self.max is None else max(self.max, float(values.max()))
+
+    def merge(self, other):
+        """Fold another RunningStats into this one (parallel variance formula)."""
+        if other.count == 0:
+            return
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / n
+        self.m2 += other.m2 + delta * delta * self.count * other.count / n
+        self.count = n
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1), as pandas reports it."""
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    def as_dict(self):
+        variance = self.variance
+        return {
+            "count": self.count,
+            "mean": self.mean if self.count else None,
+            "variance": variance,
+            "std": float(np.sqrt(variance)) if variance is not None else None,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+class RunningAggregates:
+    """
+    Dashboard aggregates of one dataset, kept current as rows are appended
+
+    Built once from the loaded frame and then updated with each appended
+    batch only, so the cost of an ingest is proportional to the batch size.
+    Every aggregate is additive: Welford statistics, per-category counts,
+    crosstab counts and per-metric score sums.
+    """
+
+    def __init__(self, stats=(), counts=None, crosstabs=(), scorer=None):
+        """
+        Initialize RunningAggregates
+
+        Args:
+            stats (iterable): Numeric columns tracked with RunningStats
+            counts (dict, optional): Name -> column to count values of, or a
+                callable mapping a frame to a {label: count} dict
+            crosstabs (iterable): (row column, column column) pairs
+            scorer (callable, optional): Maps a frame to (metric names,
+                (n_rows, n_metrics) per-respondent mean answers)
+        """
+        self.stats = {column: RunningStats() for column in stats}
+        self.counts = dict(counts or {})
+        self.crosstabs = [tuple(pair) for pair in crosstabs]
+        self.scorer = scorer
+        self.rows = 0
+        self._counts = {name: {} for name in self.counts}
+        self._crosstabs = {pair: {} for pair in self.crosstabs}
+        self._score_sums = {}
+        self._lock = threading.Lock()
+
+    def update(self, df):
+        """
+        Fold a batch of rows into every aggregate
+
+        Args:
+            df (pd.DataFrame): New rows, typed like the dataset
+        """
+        batch_counts = {name: self._count(df, source) for name, source in self.counts.items()}
+        batch_crosstabs = {
+            pair: df.groupby(list(pair), observed=True).size().to_dict() if len(df) else {}
+            for pair in self.crosstabs
+        }
+        batch_scores = None
+        if self.scorer is not None and len(df):
+            metrics, means = self.scorer(df)
+            answered = ~np.isnan(means)
+            batch_scores = {
+                metric: (float(np.where(answered[:, j], means[:, j], 0).sum()), int(answered[:, j].sum()))
+                for j, metric in enumerate(metrics)
+            }
+
+        with self._lock:
+            self.rows += len(df)
+            for column, stats in self.stats.items():
+                stats.update(df[column])
+            for name, batch in batch_counts.items():
+                self._merge(self._counts[name], batch)
+            for pair, batch in batch_crosstabs.items():
+                self._merge(self._crosstabs[pair], batch)
+            for metric, (total, count) in (batch_scores or {}).items():
+                old_total, old_count = self._score_sums.get(metric, (0.0, 0))
+                self._score_sums[metric] = (old_total + total, old_count + count)
+
+    def snapshot(self, to_percent=None):
+        """
+        JSON-ready copy of every aggregate
+
+        Args:
+            to_percent (callable, optional): Converts a mean answer into the
+                reported metric score
+
+        Returns:
+            dict: rows, stats, counts, crosstabs and (when scored) scores
+        """
+        with self._lock:
+            snapshot = {
+                "rows": self.rows,
+                "stats": {column: stats.as_dict() for column, stats in self.stats.items()},
+                "counts": {name: dict(counts) for name, counts in self._counts.items()},
+                "crosstabs": {
+                    f"{row}|{col}": self._nest(table) for (row, col), table in self._crosstabs.items()
+                },
+            }
+            if self.scorer is not None:
+                snapshot["scores"] = {
+                    metric: (to_percent(total / count) if to_percent else total / count) if count else 0
+                    for metric, (total, count) in self._score_sums.items()
+                }
+        return snapshot
+
+    @staticmethod
+    def _count(df, source):
+        if callable(source):
+            return source(df)
+        return {str(k): int(v) for k, v in value_counts(df[source]).items()}
+
+    @staticmethod
+    def _merge(target, batch):
+        for key, value in batch.items():
+            target[key] = target.get(key, 0) + int(value)
+
+    @staticmethod
+    def _nest(table):
+        nested = {}
+        for (row, col), count in table.items():
+            nested.setdefault(str(row), {})[str(col)] = count
+        return nested
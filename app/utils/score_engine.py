@@ -0,0 +1,194 @@
+"""
+Score Engine Module
+Scores the Likert survey answers for every metric in one NumPy pass
+"""
+
+import numpy as np
+
+from app.utils.frame_schema import LIKERT_MISSING
+from app.utils.instrumentation import timed
+
+# Rows converted to float32 at a time when scoring, so the float copy of the
+# answers stays a few MB however many rows are scored
+ROWS_PER_BLOCK = 65536
+
+
+def _scored_rows(engine, rows=None):
+    if rows is None:
+        return engine.n_rows
+    rows = np.asarray(rows)
+    return int(rows.sum()) if rows.dtype == bool else len(rows)
+
+
+def _compact_answers(df, questions, negative):
+    """
+    Polarity-corrected uint8 answer matrix, LIKERT_MISSING for a missing answer
+
+    Returns None when a column holds a value that does not fit (a fraction, or
+    a reversed answer that would leave the 1-4 scale).
+    """
+    answers = np.empty((len(df), len(questions)), dtype=np.uint8)
+    for i, question in enumerate(questions):
+        column = df[question]
+        if column.dtype == np.uint8:
+            values = column.to_numpy()
+            missing = values == LIKERT_MISSING
+        else:
+            values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+            missing = np.isnan(values)
+            present = values[~missing]
+            if not (np.all(present == np.round(present)) and np.all((present >= 1) & (present <= 255))):
+                return None
+        if i in negative:
+            if np.any(values[~missing] > 4):
+                return None
+            values = 5 - values
+        answers[:, i] = np.where(missing, LIKERT_MISSING, values)
+    return answers
+
+
+class ScoreEngine:
+    """
+    Precomputed, polarity-corrected Likert matrix for metric scoring
+
+    The answers of every question referenced by the metric config are
+    packed once into a uint8 matrix, one byte per answer with LIKERT_MISSING
+    for a missing one (negative-polarity questions already reversed with
+    ``5 - x``). A question-to-metric indicator matrix then turns the
+    per-respondent metric means of any row subset into two matrix products,
+    so no DataFrame is copied per request. The answered mask and the float32
+    operands of those products are derived per block of ROWS_PER_BLOCK rows.
+    Frames whose answers do not fit one byte are kept as float32 with NaN for
+    a missing answer.
+    """
+
+    def __init__(self, df, metrics_config, negative_questions=()):
+        """
+        Initialize ScoreEngine
+
+        Args:
+            df (pd.DataFrame): Survey answers, one column per question (1-4 scale);
+                uint8 columns hold LIKERT_MISSING for a missing answer
+            metrics_config (dict): Metric name -> config with a "questions" list
+            negative_questions (iterable): Questions whose scale is reversed
+        """
+        self.metrics = list(metrics_config.keys())
+        self.questions = []
+        for config in metrics_config.values():
+            for question in config["questions"]:
+                if question in df.columns and question not in self.questions:
+                    self.questions.append(question)
+
+        position = {q: i for i, q in enumerate(self.questions)}
+        self.metric_columns = {
+            metric: np.array([position[q] for q in config["questions"] if q in position], dtype=np.intp)
+            for metric, config in metrics_config.items()
+        }
+
+        negative = {position[q] for q in negative_questions if q in position}
+        answers = _compact_answers(df, self.questions, negative)
+        if answers is None:
+            answers = df[self.questions].to_numpy(dtype=np.float32, na_value=np.nan)
+            compact = [i for i, q in enumerate(self.questions) if df[q].dtype == np.uint8]
+            answers[:, compact] = np.where(answers[:, compact] == LIKERT_MISSING, np.nan, answers[:, compact])
+            answers[:, sorted(negative)] = 5 - answers[:, sorted(negative)]
+        self.n_rows = len(df)
+        self._answers = answers
+
+        self._weights = np.zeros((len(self.questions), len(self.metrics)), dtype=np.float32)
+        for j, metric in enumerate(self.metrics):
+            self._weights[self.metric_columns[metric], j] = 1
+
+    def respondent_means(self, rows=None):
+        """
+        Per-respondent mean answer for every metric
+
+        Args:
+            rows (np.ndarray, optional): Boolean mask or integer row positions.
+                All rows when omitted.
+
+        Returns:
+            np.ndarray: (n_rows, n_metrics) float64 array, NaN where a
+                respondent answered none of the metric's questions
+        """
+        answers = self._answers if rows is None else self._answers[rows]
+        sums = np.empty((len(answers), len(self.metrics)), dtype=np.float64)
+        counts = np.empty_like(sums)
+        for start in range(0, len(answers), ROWS_PER_BLOCK):
+            block = answers[start:start + ROWS_PER_BLOCK]
+            if block.dtype == np.uint8:
+                valid = block != LIKERT_MISSING
+                values = block.astype(np.float32)
+            else:
+                valid = ~np.isnan(block)
+                values = np.where(valid, block, np.float32(0))
+            # Sums of at most a few dozen small integers are exact in float32
+            sums[start:start + len(block)] = values @ self._weights
+            counts[start:start + len(block)] = valid.astype(np.float32) @ self._weights
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return sums / counts
+
+    @timed("score", rows=_scored_rows)
+    def score(self, rows=None):
+        """
+        Score a row subset on a 0-100 scale for every metric
+
+        Args:
+            rows (np.ndarray, optional): Boolean mask or integer row positions.
+                All rows when omitted.
+
+        Returns:
+            dict: Metric name -> rounded score, 0 when there is no data
+        """
+        means = np.ascontiguousarray(self.respondent_means(rows).T)
+        if means.shape[1] == 0:
+            return {metric: 0 for metric in self.metrics}
+
+        answered = ~np.isnan(means)
+        totals = np.where(answered, means, 0).sum(axis=1)
+        counts = answered.sum(axis=1)
+        return {
+            metric: self.to_percent(totals[j] / counts[j]) if counts[j] else 0
+            for j, metric in enumerate(self.metrics)
+        }
+
+    @timed("score", rows=lambda engine, group_codes, n_groups: len(group_codes))
+    def score_groups(self, group_codes, n_groups):
+        """
+        Score every group of a row partition in one grouped reduction
+
+        Args:
+            group_codes (np.ndarray): Group index per row, -1 for rows that
+                belong to no group
+            n_groups (int): Number of groups
+
+        Returns:
+            list: One ``score``-style dict per group, in group-index order
+        """
+        group_codes = np.asarray(group_codes)
+        in_group = group_codes >= 0
+        means = self.respondent_means(in_group)
+        n_metrics = len(self.metrics)
+
+        # Flatten (group, metric) into one bin index so a single bincount
+        # produces every group's totals and answer counts at once
+        bins = (group_codes[in_group][:, None] * n_metrics + np.arange(n_metrics)).ravel()
+        answered = ~np.isnan(means).ravel()
+        size = n_groups * n_metrics
+        totals = np.bincount(bins[answered], weights=means.ravel()[answered], minlength=size)
+        counts = np.bincount(bins[answered], minlength=size)
+        totals = totals.reshape(n_groups, n_metrics)
+        counts = counts.reshape(n_groups, n_metrics)
+
+        return [
+            {
+                metric: self.to_percent(totals[g, j] / counts[g, j]) if counts[g, j] else 0
+                for j, metric in enumerate(self.metrics)
+            }
+            for g in range(n_groups)
+        ]
+
+    @staticmethod
+    def to_percent(avg_score):
+        """Mean answer on the 1-4 scale as a rounded 0-100 score."""
+        return round(((avg_score - 1) / 3) * 100)
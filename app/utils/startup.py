@@ -0,0 +1,88 @@
+"""
+Startup Module
+Deferred imports of heavy libraries and timings of the worker's startup stages
+"""
+
+import contextlib
+import importlib
+import sys
+import threading
+import time
+
+from app.utils.instrumentation import phase
+
+_IMPORTS = {}
+_IMPORTS_LOCK = threading.Lock()
+
+
+def deferred_import(name):
+    """
+    Import a module on first use instead of at app import
+
+    The first import is timed: as an "import" phase of the current request
+    and in ``deferred_imports()``, so a slow first request can be told apart
+    from a slow endpoint.
+
+    Args:
+        name (str): Absolute module name, e.g. "scipy.stats"
+
+    Returns:
+        module: The imported module
+    """
+    if name in sys.modules:
+        return importlib.import_module(name)
+    started = time.perf_counter()
+    with phase("import"):
+        module = importlib.import_module(name)
+    with _IMPORTS_LOCK:
+        _IMPORTS.setdefault(name, time.perf_counter() - started)
+    return module
+
+
+def deferred_imports():
+    """Module name -> seconds its deferred import took, for modules imported so far."""
+    with _IMPORTS_LOCK:
+        return dict(_IMPORTS)
+
+
+class StartupReport:
+    """
+    Seconds spent in each startup stage of the app
+
+    Stages are recorded in order (e.g. "import", "warmup.datasets",
+    "warmup.charts") and reported in the log, on /metrics and on
+    /api/startup together with the deferred imports done since.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.ready = False
+
+    def record(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Context manager recording the time spent in a block as a stage."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    @property
+    def total(self):
+        return sum(self.stages.values())
+
+    def as_dict(self):
+        return {
+            "ready": self.ready,
+            "total_s": round(self.total, 6),
+            "stages": {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            "deferred_imports": {name: round(seconds, 6) for name, seconds in deferred_imports().items()},
+        }
+
+    def summary(self):
+        """One log line, e.g. ``startup 1.84 s (import 0.92 s, warmup.charts 0.90 s)``."""
+        stages = ", ".join(f"{name} {seconds:.2f} s" for name, seconds in self.stages.items())
+        return f"startup {self.total:.2f} s ({stages})"
@@ -0,0 +1,244 @@
+"""
+Static Assets Module
+Content-hashed, precompressed copies of the static JS, CSS and images
+"""
+
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import posixpath
+import re
+import tempfile
+import threading
+import time
+
+from app.utils.compression import COMPRESSIBLE_TYPES, ENCODINGS, compress_variants, encoded_path
+
+logger = logging.getLogger(__name__)
+
+# A compressed copy is only kept when it saves at least this fraction
+MIN_COMPRESSION_SAVING = 0.1
+
+_CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")\s]+)\1\s*\)|@import\s+(['"])([^'"]+)\3""")
+_JS_IMPORT = re.compile(r"""(\bfrom\s*|\bimport\s*\(?\s*)(['"])(\.{1,2}/[^'"]+)\2""")
+
+
+class StaticAssetManifest:
+    """
+    Fingerprinted build of selected static directories
+
+    Every file is copied to ``build_dir`` as ``<name>.<content hash>.<ext>``
+    (with gzip/brotli copies for text formats), so its URL changes exactly
+    when its bytes do and can be cached forever. References between built
+    files are rewritten to the fingerprinted names first: ``url()`` and
+    ``@import`` in CSS and relative ``import`` specifiers in ES modules.
+    A file's hash therefore covers everything it loads, and a changed
+    dependency also renames the files that reference it.
+    """
+
+    def __init__(self, static_dir, build_dir, directories=("js", "css"), url_prefix="/assets/", static_url="/static/"):
+        """
+        Initialize StaticAssetManifest
+
+        Args:
+            static_dir (str): Flask static folder
+            build_dir (str): Directory the fingerprinted files are written to
+            directories (iterable): Subdirectories of static_dir to include
+            url_prefix (str): URL the build directory is served under; used
+                for absolute ``/static/...`` references inside built files
+            static_url (str): URL of the static folder
+        """
+        self.static_dir = static_dir
+        self.build_dir = build_dir
+        self.directories = tuple(directories)
+        self.url_prefix = url_prefix
+        self.static_url = static_url
+        self._manifest = None
+        self._files = None
+        self._stamp = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def manifest(self, check=False):
+        """
+        Source path -> built file entry, building on first use
+
+        Args:
+            check (bool): Rebuild when a source file was added, removed or
+                modified (stat'ed at most once per second); for development
+
+        Returns:
+            dict: Path relative to static_dir -> file (fingerprinted path),
+                bytes and the size of every compressed copy
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._manifest is None or (check and now - self._checked >= 1.0):
+                self._checked = now
+                stamp = self._source_stamp()
+                if self._manifest is None or stamp != self._stamp:
+                    self._manifest = self._build()
+                    self._files = {entry["file"]: source for source, entry in self._manifest.items()}
+                    self._stamp = stamp
+            return self._manifest
+
+    def hashed_name(self, filename, check=False):
+        """Fingerprinted path of a static file, or None when it is not part of the build."""
+        entry = self.manifest(check).get(filename.lstrip("/"))
+        return entry["file"] if entry else None
+
+    def hashed_names(self, directory, check=False):
+        """Fingerprinted path of every built file under a directory, keyed by path within it."""
+        prefix = directory.strip("/") + "/"
+        return {
+            source[len(prefix):]: entry["file"]
+            for source, entry in self.manifest(check).items() if source.startswith(prefix)
+        }
+
+    def locate(self, hashed, accepted=ENCODINGS):
+        """
+        File to send for a fingerprinted path
+
+        Args:
+            hashed (str): Fingerprinted path from the manifest
+            accepted (iterable): Encodings the client accepts, in preference order
+
+        Returns:
+            tuple: (path, encoding or None, mimetype), or None for paths that
+                are not in the current build
+        """
+        manifest = self.manifest()
+        source = self._files.get(hashed)
+        if source is None:
+            return None
+        entry = manifest[source]
+        mimetype = mimetypes.guess_type(source)[0] or "application/octet-stream"
+        path = os.path.join(self.build_dir, *hashed.split("/"))
+        for encoding in accepted:
+            if entry.get(encoding):
+                return encoded_path(path, encoding), encoding, mimetype
+        return path, None, mimetype
+
+    def _sources(self):
+        sources = []
+        for directory in self.directories:
+            root = os.path.join(self.static_dir, directory)
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+                for name in sorted(filenames):
+                    if not name.startswith("."):
+                        path = os.path.join(dirpath, name)
+                        sources.append(os.path.relpath(path, self.static_dir).replace(os.sep, "/"))
+        return sources
+
+    def _source_stamp(self):
+        stamp = []
+        for source in self._sources():
+            stat = os.stat(os.path.join(self.static_dir, source))
+            stamp.append((source, stat.st_size, stat.st_mtime_ns))
+        return tuple(stamp)
+
+    def _build(self):
+        sources = set(self._sources())
+        built = {}
+        bodies = {}
+
+        def fingerprint(source, visiting=()):
+            if source in built:
+                return built[source]["file"]
+            if source in visiting:  # import cycle: leave the back reference unhashed
+                return None
+            with open(os.path.join(self.static_dir, *source.split("/")), "rb") as fh:
+                body = fh.read()
+            body = self._rewrite(source, body, sources, lambda ref: fingerprint(ref, visiting + (source,)))
+            digest = hashlib.blake2b(body, digest_size=5).hexdigest()
+            stem, ext = posixpath.splitext(source)
+            hashed = f"{stem}.{digest}{ext}"
+            mimetype = mimetypes.guess_type(source)[0] or ""
+            variants = {}
+            if mimetype.startswith(COMPRESSIBLE_TYPES):
+                variants = {
+                    encoding: data for encoding, data in compress_variants(body).items()
+                    if len(data) <= len(body) * (1 - MIN_COMPRESSION_SAVING)
+                }
+            built[source] = {"file": hashed, "bytes": len(body), **{e: len(d) for e, d in variants.items()}}
+            bodies[hashed] = (body, variants)
+            return hashed
+
+        for source in sorted(sources):
+            fingerprint(source)
+
+        try:
+            os.makedirs(self.build_dir, exist_ok=True)
+            for hashed, (body, variants) in bodies.items():
+                path = os.path.join(self.build_dir, *hashed.split("/"))
+                outputs = {path: body, **{encoded_path(path, e): data for e, data in variants.items()}}
+                for target, data in outputs.items():
+                    if os.path.exists(target):
+                        continue  # same name, same bytes
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(target))
+                    with os.fdopen(fd, "wb") as fh:
+                        fh.write(data)
+                    os.replace(tmp_path, target)
+            fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=self.build_dir)
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(built, fh)
+            os.replace(tmp_path, os.path.join(self.build_dir, "manifest.json"))
+            self._remove_stale(bodies)
+        except OSError as e:
+            logger.warning("Could not write static asset build to %s: %s", self.build_dir, e)
+            return {}
+        logger.info("Fingerprinted %d static files into %s", len(built), self.build_dir)
+        return built
+
+    def _rewrite(self, source, body, sources, fingerprint):
+        """Point references to other built files at their fingerprinted names."""
+        if source.endswith(".css"):
+            pattern = _CSS_URL
+        elif source.endswith((".js", ".mjs")):
+            pattern = _JS_IMPORT
+        else:
+            return body
+        base = posixpath.dirname(source)
+
+        def replace(match):
+            text = match.group(0)
+            ref = next(g for g in match.groups()[1::2] if g) if pattern is _CSS_URL else match.group(3)
+            path, suffix = re.match(r"([^?#]*)(.*)", ref).groups()
+            if path.startswith(self.static_url):
+                target = path[len(self.static_url):]
+            elif "://" in path or path.startswith(("/", "data:", "#")) or not path:
+                return text
+            else:
+                target = posixpath.normpath(posixpath.join(base, path))
+            if target not in sources:
+                return text
+            hashed = fingerprint(target)
+            if hashed is None:
+                return text
+            if path.startswith(self.static_url):
+                new_path = self.url_prefix + hashed
+            else:
+                new_path = posixpath.join(posixpath.dirname(path), posixpath.basename(hashed))
+            return text.replace(ref, new_path + suffix, 1)
+
+        return pattern.sub(replace, body.decode("utf-8")).encode("utf-8")
+
+    def _remove_stale(self, current):
+        keep = set()
+        for hashed, (_, variants) in current.items():
+            path = os.path.join(self.build_dir, *hashed.split("/"))
+            keep.add(path)
+            keep.update(encoded_path(path, encoding) for encoding in variants)
+        keep.add(os.path.join(self.build_dir, "manifest.json"))
+        for dirpath, _, filenames in os.walk(self.build_dir):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if path not in keep:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
@@ -0,0 +1,4 @@
+"""
+Benchmarks Package
+Synthetic datasets, service microbenchmarks and route load tests
+"""
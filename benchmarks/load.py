@@ -0,0 +1,492 @@
+"""
+Load Test Module
+Drives the Flask routes of a local server with realistic filter mixes
+
+    python -m benchmarks.load --sizes 1k 100k --concurrency 1 8 --output load.json --markdown load.md
+    python -m benchmarks.load --compare benchmarks/results/load-previous.json
+
+For every dataset size a server is started on a synthetic copy of the
+data (``benchmarks.synthetic``) and every route is driven in turn with
+``--requests`` GETs per concurrency level, after a warm-up. The JSON report
+has stable keys and rounded numbers, and ``--markdown`` writes the same
+numbers as tables, so two releases can be compared with a plain diff.
+"""
+
+import argparse
+import collections
+import datetime
+import http.client
+import json
+import os
+import random
+import shlex
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import quote, urlencode, urlsplit
+
+import pandas as pd
+
+from benchmarks import synthetic
+from benchmarks.run import RESULTS_DIR, git_commit
+from benchmarks.suite import environment
+
+# Report layout; bump when keys change meaning
+REPORT_SCHEMA = 1
+
+DEFAULT_SERVER = "{python} -m flask --app app run --host 127.0.0.1 --port {port} --with-threads --no-reload --no-debugger"
+
+# Share of requests that carry no filter, as on the first page load
+UNFILTERED_SHARE = 0.3
+# Of the filtered dashboard requests, the share using the multi-value cross filters
+CROSS_FILTER_SHARE = 0.25
+
+# p95 this fraction slower, or throughput this fraction lower, than the compared report is flagged
+DEFAULT_THRESHOLD = 0.2
+
+RSS_SAMPLE_SECONDS = 0.2
+READY_TIMEOUT_SECONDS = 1800
+
+
+class FilterMix:
+    """Filter values of one dataset, sampled the way the dashboard sends them"""
+
+    def __init__(self, dataset_dir, seed=0):
+        """
+        Initialize FilterMix
+
+        Args:
+            dataset_dir (str): Directory with the CSVs the server loads
+            seed (int): Seed of the URL sampling
+        """
+        from app.services import METRICS_CONFIG, PROFILE_FILTER_COLUMNS, QUESTION_INDEX, SHEET2_COLUMN_MAPPING
+
+        self.rng = random.Random(seed)
+        self.metrics = list(METRICS_CONFIG)
+        self.questions = list(QUESTION_INDEX)
+
+        sheet1 = pd.read_csv(os.path.join(dataset_dir, "Sheet1.csv"), usecols=list(SHEET2_COLUMN_MAPPING))
+        self.sheet_dimensions = {
+            column: sorted(str(value) for value in sheet1[column].dropna().unique()) for column in SHEET2_COLUMN_MAPPING
+        }
+        # Deep-dive and filter_metrics take an age for birth_year
+        self.sheet_dimensions["birth_year"] = sorted({str(2025 - int(year)) for year in sheet1["birth_year"].dropna()})
+
+        profile_columns = {name: column for name, column in PROFILE_FILTER_COLUMNS.items() if column != "birth_year"}
+        profile = pd.read_csv(os.path.join(dataset_dir, "dataset_gelarrasa_genzfinancialprofile.csv"), usecols=list(set(profile_columns.values())))
+        self.profile_filters = {
+            name: sorted(str(value) for value in profile[column].dropna().unique()) for name, column in profile_columns.items()
+        }
+
+    def sheet_filter(self):
+        """(filter_by, filter_value) of a Sheet1 dimension."""
+        filter_by = self.rng.choice(list(self.sheet_dimensions))
+        return filter_by, self.rng.choice(self.sheet_dimensions[filter_by])
+
+    def sheet_query(self):
+        """``?filter_by=&filter_value=`` or nothing."""
+        if self.rng.random() < UNFILTERED_SHARE:
+            return ""
+        filter_by, filter_value = self.sheet_filter()
+        return "?" + urlencode({"filter_by": filter_by, "filter_value": filter_value})
+
+    def profile_query(self):
+        """Dashboard filters: none, a filter_type/filter_value pair or one to two cross filters."""
+        if self.rng.random() < UNFILTERED_SHARE:
+            return ""
+        if self.rng.random() < CROSS_FILTER_SHARE:
+            names = self.rng.sample(list(self.profile_filters), 2 if self.rng.random() < 0.5 else 1)
+            return "?" + urlencode([(name, self.rng.choice(self.profile_filters[name])) for name in names])
+        filter_type = self.rng.choice(list(self.profile_filters))
+        return "?" + urlencode({"filter_type": filter_type, "filter_value": self.rng.choice(self.profile_filters[filter_type])})
+
+    def dimension(self):
+        return self.rng.choice(list(self.sheet_dimensions))
+
+
+def _path(*parts):
+    return "/".join(quote(str(part), safe="") for part in parts)
+
+
+# Route pattern -> URL sampler; every GET route that reads the datasets
+ROUTES = {
+    "/": lambda mix: "/",
+    "/api/metrics-deep-dive/unfiltered": lambda mix: "/api/metrics-deep-dive/unfiltered",
+    "/api/metrics-deep-dive/filtered/<filter_by>/<filter_value>": lambda mix: "/api/metrics-deep-dive/filtered/" + _path(*mix.sheet_filter()),
+    "/api/question-distribution/<question_id>": lambda mix: "/api/question-distribution/" + _path(mix.rng.choice(mix.questions)) + mix.sheet_query(),
+    "/api/metric-distributions/<metric>": lambda mix: "/api/metric-distributions/" + _path(mix.rng.choice(mix.metrics)) + mix.sheet_query(),
+    "/data/anxiety_by/<filter_by>": lambda mix: "/data/anxiety_by/" + mix.dimension(),
+    "/api/filter_metrics/<filter_by>/<filter_value>": lambda mix: "/api/filter_metrics/" + _path(*mix.sheet_filter()),
+    "/api/group_metrics/<filter_by>": lambda mix: "/api/group_metrics/" + mix.dimension(),
+    "/api/loan-filtered": lambda mix: "/api/loan-filtered" + mix.profile_query(),
+    "/api/loan-distribution-by/<group_by>": lambda mix: "/api/loan-distribution-by/" + mix.rng.choice(list(mix.profile_filters)) + mix.profile_query(),
+    "/api/column-summary/<name>": lambda mix: "/api/column-summary/" + mix.rng.choice(["loan", "income", "expense"]) + mix.profile_query(),
+    "/api/loan-purpose": lambda mix: "/api/loan-purpose" + mix.profile_query(),
+    "/api/digital-time": lambda mix: "/api/digital-time" + mix.profile_query(),
+    "/api/profession-chart": lambda mix: "/api/profession-chart" + mix.profile_query(),
+    "/api/education-chart": lambda mix: "/api/education-chart" + mix.profile_query(),
+    "/api/financial-profile": lambda mix: "/api/financial-profile" + mix.profile_query(),
+    "/api/dashboard-state": lambda mix: "/api/dashboard-state" + mix.profile_query(),
+    "/api/visual-analytics": lambda mix: "/api/visual-analytics?format=json",
+    "/api/data": lambda mix: "/api/data",
+    "/api/live-aggregates": lambda mix: "/api/live-aggregates",
+}
+
+
+def tree_rss_mb(pid):
+    """Resident memory of a process and all of its descendants (workers), in MB."""
+    try:
+        listing = subprocess.run(["ps", "-A", "-o", "pid=,ppid=,rss="], capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    children = collections.defaultdict(list)
+    rss = {}
+    for line in listing.splitlines():
+        fields = line.split()
+        if len(fields) == 3:
+            children[int(fields[1])].append(int(fields[0]))
+            rss[int(fields[0])] = int(fields[2])
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        total += rss.get(current, 0)
+        stack.extend(children.get(current, ()))
+    return total / 1024
+
+
+class RssSampler:
+    """Peak resident memory of a server process tree while a phase runs"""
+
+    def __init__(self, pid, interval=RSS_SAMPLE_SECONDS):
+        self.pid = pid
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        if self.pid is not None:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return False
+
+    def _sample(self):
+        while True:
+            rss = tree_rss_mb(self.pid)
+            if rss is not None:
+                self.peak = rss if self.peak is None else max(self.peak, rss)
+            if self._stop.wait(self.interval):
+                return
+
+
+def percentile(sorted_values, q):
+    """Linearly interpolated percentile (0-100) of an already sorted list."""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def drive(base_url, paths, concurrency, headers=None, timeout=300):
+    """
+    GET every path with ``concurrency`` client threads
+
+    Each thread keeps its own connection, reopened whenever the server
+    closes it.
+
+    Returns:
+        dict: Wall time and, per request, latency in seconds, status (None
+            for a failed connection) and body size
+    """
+    url = urlsplit(base_url)
+    pending = iter(paths)
+    lock = threading.Lock()
+    samples = []
+
+    def worker():
+        connection = http.client.HTTPConnection(url.hostname, url.port, timeout=timeout)
+        local = []
+        while True:
+            with lock:
+                path = next(pending, None)
+            if path is None:
+                break
+            started = time.perf_counter()
+            try:
+                connection.request("GET", url.path.rstrip("/") + path, headers=headers or {})
+                response = connection.getresponse()
+                body = response.read()
+                status, size = response.status, len(body)
+                if response.will_close:
+                    connection.close()
+            except (OSError, http.client.HTTPException):
+                status, size = None, 0
+                connection.close()
+            local.append((time.perf_counter() - started, status, size))
+        connection.close()
+        with lock:
+            samples.extend(local)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"wall_s": time.perf_counter() - started, "samples": samples}
+
+
+def summarize(run, rss_peak_mb=None, rss_end_mb=None):
+    """Latency percentiles (ms), throughput, errors and memory of one drive() run."""
+    samples = run["samples"]
+    latencies = sorted(latency * 1e3 for latency, status, _ in samples if status is not None and status < 400)
+    statuses = collections.Counter("error" if status is None else str(status) for _, status, _ in samples)
+
+    def ms(value):
+        return None if value is None else round(value, 2)
+
+    return {
+        "requests": len(samples),
+        "errors": sum(count for status, count in statuses.items() if status == "error" or int(status) >= 400),
+        "statuses": dict(sorted(statuses.items())),
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "mean_ms": ms(statistics.fmean(latencies) if latencies else None),
+        "max_ms": ms(latencies[-1] if latencies else None),
+        "throughput_rps": round(len(samples) / run["wall_s"], 1) if run["wall_s"] else None,
+        "bytes_mean": round(statistics.fmean(size for _, _, size in samples)) if samples else 0,
+        "rss_peak_mb": None if rss_peak_mb is None else round(rss_peak_mb, 1),
+        "rss_end_mb": None if rss_end_mb is None else round(rss_end_mb, 1),
+    }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(base_url, process=None, timeout=READY_TIMEOUT_SECONDS):
+    """Poll the server until it answers; the first request may have to load a large dataset."""
+    url = urlsplit(base_url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Server exited with status {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection(url.hostname, url.port, timeout=timeout)
+            connection.request("GET", url.path.rstrip("/") + "/api/cache-stats")
+            if connection.getresponse().status == 200:
+                return
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} not ready after {timeout} s")
+
+
+def start_server(command, dataset_dir, env_overrides, log):
+    """
+    Start the server command on a free port
+
+    Args:
+        command (str): Shell-style command with ``{python}`` and ``{port}`` placeholders
+        dataset_dir (str): DATASET_DIR of the server
+        env_overrides (dict): Further environment variables
+        log (file): Receives the server's stdout and stderr
+
+    Returns:
+        tuple: (subprocess.Popen, base URL)
+    """
+    port = _free_port()
+    env = dict(os.environ, DATASET_DIR=dataset_dir, **env_overrides)
+    argv = shlex.split(command.format(python=shlex.quote(sys.executable), port=port))
+    process = subprocess.Popen(argv, env=env, stdout=log, stderr=log, cwd=os.path.join(os.path.dirname(__file__), ".."))
+    return process, f"http://127.0.0.1:{port}"
+
+
+def stop_server(process):
+    """Terminate a server started by start_server, killing it after 30 s."""
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def load_test(base_url, mix, routes, concurrency_levels, requests, warmup, headers, pid=None, log=sys.stderr):
+    """
+    Drive every route at every concurrency level
+
+    Warm-up requests build the server's per-dataset indexes and are not
+    counted. URLs are sampled per route before timing starts, so every
+    run of a seed sends the same requests.
+
+    Returns:
+        dict: Route pattern -> ``c<concurrency>`` -> summarize() output
+    """
+    results = {}
+    for route in routes:
+        sampler = ROUTES[route]
+        drive(base_url, [sampler(mix) for _ in range(warmup)], 1, headers)
+        results[route] = {}
+        for concurrency in concurrency_levels:
+            paths = [sampler(mix) for _ in range(requests)]
+            with RssSampler(pid) as rss:
+                run = drive(base_url, paths, concurrency, headers)
+            summary = summarize(run, rss.peak, tree_rss_mb(pid) if pid is not None else None)
+            results[route][f"c{concurrency}"] = summary
+            print(
+                f"  {route:<60} c={concurrency:<3} p50 {summary['p50_ms']} ms  p95 {summary['p95_ms']} ms  "
+                f"p99 {summary['p99_ms']} ms  {summary['throughput_rps']} req/s  errors {summary['errors']}",
+                file=log, flush=True,
+            )
+    return results
+
+
+def compare(report, previous, threshold=DEFAULT_THRESHOLD):
+    """
+    Routes whose p95 or throughput got worse than in ``previous``
+
+    Returns:
+        list: (size, route, concurrency, metric, previous value, current value)
+    """
+    flagged = []
+    for label, size in report["sizes"].items():
+        before_size = previous.get("sizes", {}).get(label, {})
+        for route, levels in size["routes"].items():
+            for level, current in levels.items():
+                before = before_size.get("routes", {}).get(route, {}).get(level)
+                if not before:
+                    continue
+                if current["p95_ms"] and before["p95_ms"] and current["p95_ms"] > before["p95_ms"] * (1 + threshold):
+                    flagged.append((label, route, level, "p95_ms", before["p95_ms"], current["p95_ms"]))
+                if current["throughput_rps"] and before["throughput_rps"] and current["throughput_rps"] < before["throughput_rps"] / (1 + threshold):
+                    flagged.append((label, route, level, "throughput_rps", before["throughput_rps"], current["throughput_rps"]))
+    return flagged
+
+
+def markdown(report):
+    """The report as one Markdown table per dataset size."""
+    lines = [f"# Load test {report['created']} ({report['commit'] or 'no commit'})", ""]
+    for label, size in report["sizes"].items():
+        lines += [
+            f"## {label}: {size['rows']:,} rows, ready in {size['startup_s']} s, idle RSS {size['idle_rss_mb']} MB",
+            "",
+            "| route | conc | p50 ms | p95 ms | p99 ms | req/s | errors | peak RSS MB |",
+            "|---|---:|---:|---:|---:|---:|---:|---:|",
+        ]
+        for route, levels in size["routes"].items():
+            for level, s in levels.items():
+                lines.append(
+                    f"| `{route}` | {level[1:]} | {s['p50_ms']} | {s['p95_ms']} | {s['p99_ms']} | "
+                    f"{s['throughput_rps']} | {s['errors']} | {s['rss_peak_mb']} |"
+                )
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """``python -m benchmarks.load [--sizes ...] [--concurrency ...] [--url URL]``."""
+    parser = argparse.ArgumentParser(description="Load-test the Flask routes on synthetic datasets")
+    parser.add_argument("--sizes", nargs="+", default=["1k", "100k"], help=f"size labels ({', '.join(synthetic.SIZES)}) or row counts")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8], help="client threads; one run per value")
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per route and concurrency level")
+    parser.add_argument("--warmup", type=int, default=10, help="untimed requests per route")
+    parser.add_argument("--routes", help="comma-separated route patterns (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=synthetic.DATA_DIR, help="where synthetic datasets are generated")
+    parser.add_argument("--server", default=DEFAULT_SERVER, help="server command; {python} and {port} are substituted")
+    parser.add_argument("--url", help="load an already running server instead (uses --sizes[0]'s data for the filter mix)")
+    parser.add_argument("--pid", type=int, help="with --url: server process whose RSS is reported")
+    parser.add_argument("--no-response-cache", action="store_true", help="start the server with RESPONSE_CACHE=0")
+    parser.add_argument("--accept-encoding", default="gzip", help="Accept-Encoding sent with every request ('' for none)")
+    parser.add_argument("--output", help="JSON report (default: benchmarks/results/load-<timestamp>.json)")
+    parser.add_argument("--markdown", help="also write the report as Markdown tables")
+    parser.add_argument("--compare", help="earlier JSON report to compare p95 and throughput against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    routes = [route.strip() for route in args.routes.split(",")] if args.routes else list(ROUTES)
+    unknown = [route for route in routes if route not in ROUTES]
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(unknown)}")
+    headers = {"Accept-Encoding": args.accept_encoding} if args.accept_encoding else {}
+    env_overrides = {"RESPONSE_CACHE": "0"} if args.no_response_cache else {}
+
+    report = {
+        "schema": REPORT_SCHEMA,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "environment": environment(),
+        "config": {
+            "concurrency": args.concurrency, "requests": args.requests, "warmup": args.warmup, "seed": args.seed,
+            "server": args.url or args.server, "response_cache": not args.no_response_cache,
+            "accept_encoding": args.accept_encoding,
+        },
+        "sizes": {},
+    }
+    for label in (args.sizes[:1] if args.url else args.sizes):
+        dataset_dir = synthetic.dataset_dir(label, args.data_dir)
+        synthetic.generate(synthetic.parse_size(label), dataset_dir)
+        mix = FilterMix(dataset_dir, args.seed)
+        print(f"[{label}]", file=sys.stderr, flush=True)
+
+        process = None
+        started = time.perf_counter()
+        server_log_path = os.path.join(dataset_dir, "server.log")
+        with open(server_log_path, "w", encoding="utf-8") as server_log:
+            if args.url:
+                base_url, pid = args.url, args.pid
+            else:
+                process, base_url = start_server(args.server, dataset_dir, env_overrides, server_log)
+                pid = process.pid
+            try:
+                wait_until_ready(base_url, process)
+                startup_s = time.perf_counter() - started
+                idle_rss = tree_rss_mb(pid) if pid is not None else None
+                routes_result = load_test(base_url, mix, routes, args.concurrency, args.requests, args.warmup, headers, pid)
+            except RuntimeError as e:
+                sys.exit(f"{e} (server output: {server_log_path})")
+            finally:
+                if process is not None:
+                    stop_server(process)
+        with open(os.path.join(dataset_dir, "meta.json"), encoding="utf-8") as fh:
+            rows = json.load(fh)["rows"]
+        report["sizes"][label] = {
+            "rows": rows,
+            "startup_s": None if args.url else round(startup_s, 2),
+            "idle_rss_mb": None if idle_rss is None else round(idle_rss, 1),
+            "routes": routes_result,
+        }
+
+    output = args.output or os.path.join(RESULTS_DIR, "load-" + datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=1)
+    if args.markdown:
+        with open(args.markdown, "w", encoding="utf-8") as fh:
+            fh.write(markdown(report))
+    print(f"Report written to {output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            flagged = compare(report, json.load(fh), args.threshold)
+        for label, route, level, metric, before, after in flagged:
+            print(f"  {label} {route} {level}: {metric} {before} -> {after}", file=sys.stderr)
+        print(f"{len(flagged)} route(s) worse than {args.compare} (threshold {args.threshold:.0%})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmark Runner Module
+Runs the suite on synthetic datasets of growing size and compares against a baseline
+
+    python -m benchmarks.run --sizes 1k 100k 1m --output results.json
+    python -m benchmarks.run --save-baseline          # store the current numbers
+    python -m benchmarks.run --fail-on-regression     # compare with them
+"""
+
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import synthetic
+from benchmarks.suite import environment
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+
+# Result file layout; bump when keys change meaning
+RESULT_SCHEMA = 1
+
+# A benchmark regressed when its median is this fraction slower than the baseline's
+DEFAULT_THRESHOLD = 0.15
+
+# Medians below this are too noisy to flag (timer resolution, cache effects)
+MIN_COMPARABLE_SECONDS = 20e-6
+
+
+def git_commit():
+    """Short hash of the checked-out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(label, data_dir, repeat, pattern):
+    """
+    Benchmark one dataset size in a fresh interpreter
+
+    The app reads DATASET_DIR at import, so every size needs its own
+    process. Response memoization and chart prerendering are disabled there:
+    the suite times the computation behind a cache miss, with the app's
+    derived indexes warm as they are in a running server.
+    """
+    directory = synthetic.dataset_dir(label, data_dir)
+    synthetic.generate(synthetic.parse_size(label), directory)
+    env = dict(os.environ, DATASET_DIR=directory, RESPONSE_CACHE="0", PRERENDER_CHARTS="0")
+    fd, output = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        command = [sys.executable, "-m", "benchmarks.suite", "--repeat", str(repeat), "--output", output]
+        if pattern:
+            command += ["--filter", pattern]
+        subprocess.run(command, env=env, check=True, cwd=os.path.join(os.path.dirname(__file__), ".."))
+        with open(output, encoding="utf-8") as fh:
+            return json.load(fh)
+    finally:
+        os.remove(output)
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Median ratio of every benchmark present in both result files
+
+    Args:
+        results (dict): Output of this runner
+        baseline (dict): An earlier output of this runner
+        threshold (float): Slowdown fraction that counts as a regression
+
+    Returns:
+        list: One dict per (size, benchmark): medians, ratio and status
+            ("regression", "improvement", "ok" or "noise")
+    """
+    rows = []
+    for label, current in results["sizes"].items():
+        previous = baseline.get("sizes", {}).get(label)
+        if previous is None:
+            continue
+        for name, timing in current["benchmarks"].items():
+            before = previous["benchmarks"].get(name)
+            if before is None:
+                continue
+            ratio = timing["median_s"] / before["median_s"] if before["median_s"] else float("inf")
+            if max(timing["median_s"], before["median_s"]) < MIN_COMPARABLE_SECONDS:
+                status = "noise"
+            elif ratio > 1 + threshold:
+                status = "regression"
+            elif ratio < 1 / (1 + threshold):
+                status = "improvement"
+            else:
+                status = "ok"
+            rows.append({
+                "size": label, "name": name, "baseline_s": before["median_s"],
+                "current_s": timing["median_s"], "ratio": ratio, "status": status,
+            })
+    return rows
+
+
+def _format_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+def print_results(results, comparison=None, out=sys.stdout):
+    """Table of medians per size, with the baseline ratio when compared."""
+    ratios = {(row["size"], row["name"]): row for row in comparison or []}
+    for label, result in results["sizes"].items():
+        rows = result["rows"]
+        print(f"\n== {label}: {rows['profile']:,} rows, setup {result['setup_s']:.2f} s, peak RSS {result['max_rss_mb']:.0f} MB", file=out)
+        for name, timing in result["benchmarks"].items():
+            line = f"  {name:<62} {_format_seconds(timing['median_s']):>12}  first {_format_seconds(timing['first_s']):>12}"
+            row = ratios.get((label, name))
+            if row:
+                marker = {"regression": "  REGRESSION", "improvement": "  improved"}.get(row["status"], "")
+                line += f"  x{row['ratio']:.2f}{marker}"
+            print(line, file=out)
+
+
+def main(argv=None):
+    """``python -m benchmarks.run [--sizes ...] [--baseline FILE] [--save-baseline]``."""
+    parser = argparse.ArgumentParser(description="Benchmark the services on synthetic datasets")
+    parser.add_argument("--sizes", nargs="+", default=["1k", "100k"], help=f"size labels ({', '.join(synthetic.SIZES)}) or row counts")
+    parser.add_argument("--filter", help="regular expression selecting benchmark names")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--data-dir", default=synthetic.DATA_DIR, help="where synthetic datasets are generated")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="results file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="also write the results to --baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="slowdown fraction reported as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 when anything regressed")
+    args = parser.parse_args(argv)
+
+    results = {
+        "schema": RESULT_SCHEMA,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "environment": environment(),
+        "repeat": args.repeat,
+        "sizes": {},
+    }
+    for label in args.sizes:
+        print(f"[{label}]", file=sys.stderr, flush=True)
+        results["sizes"][label] = run_size(label, args.data_dir, args.repeat, args.filter)
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    targets = [output] + ([args.baseline] if args.save_baseline else [])
+    for target in targets:
+        os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+        with open(target, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=1)
+
+    comparison = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as fh:
+            comparison = compare(results, json.load(fh), args.threshold)
+    print_results(results, comparison)
+    print(f"\nResults written to {output}", file=sys.stderr)
+
+    if comparison is not None:
+        regressions = [row for row in comparison if row["status"] == "regression"]
+        print(f"{len(regressions)} regression(s) against {args.baseline} (threshold {args.threshold:.0%})", file=sys.stderr)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,522 @@
+"""
+Benchmark Suite Module
+Microbenchmarks of the service functions, processors and chart builders
+
+Runs against whatever DATASET_DIR the app was imported with, so
+``benchmarks.run`` starts one process per dataset size.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import resource
+import statistics
+import sys
+import time
+import timeit
+
+import pandas as pd
+
+# Benchmark name -> (group, setup); setup(ctx) returns the callable to time, or None to skip
+BENCHMARKS = {}
+
+# Calls slower than this get at most SLOW_REPEAT timed repetitions
+SLOW_CALL_SECONDS = 1.0
+SLOW_REPEAT = 3
+
+
+def benchmark(name):
+    """Register ``setup(ctx)`` under ``<group>.<name>``."""
+    def register(setup):
+        BENCHMARKS[name] = (name.split(".", 1)[0], setup)
+        return setup
+    return register
+
+
+def _mode(series):
+    counts = series.value_counts()
+    return counts.index[0] if len(counts) else None
+
+
+class Context:
+    """Loaded frames and realistic filter values of the current dataset"""
+
+    def __init__(self):
+        from app import services
+
+        self.services = services
+        self.sheet1 = services._load_sheet("Sheet1.csv")
+        self.sheet2 = services._load_sheet("Sheet2.csv")
+        self.loader = services.DataLoader(services.NEW_DATASET_PATH)
+        self.profile = self.loader.load_data()
+        self.regional_raw = pd.read_csv(services.REGIONAL_DATASET_PATH)
+
+        # The most common value of each dimension: the filters users pick most
+        self.employment_status = _mode(self.sheet1["employment_status"])
+        self.age = str(2025 - int(_mode(self.sheet1["birth_year"])))
+        self.income = _mode(self.profile["avg_income_category"])
+        self.province = _mode(self.profile["province"])
+        self.metric = next(iter(services.METRICS_CONFIG))
+        self.question = services.METRICS_CONFIG[self.metric]["questions"][0]
+
+
+# --- Service functions (app/services.py), as called by the routes ---
+
+@benchmark("services.get_main_metrics")
+def main_metrics(ctx):
+    return ctx.services.get_main_metrics
+
+
+@benchmark("services.get_metrics_deep_dive")
+def metrics_deep_dive(ctx):
+    return ctx.services.get_metrics_deep_dive
+
+
+@benchmark("services.get_filtered_metrics_deep_dive")
+def filtered_metrics_deep_dive(ctx):
+    return lambda: ctx.services.get_filtered_metrics_deep_dive("employment_status", ctx.employment_status)
+
+
+@benchmark("services.get_question_distribution_data")
+def question_distribution(ctx):
+    return lambda: ctx.services.get_question_distribution_data(ctx.question, "gender", "Male")
+
+
+@benchmark("services.get_metric_distributions")
+def metric_distributions(ctx):
+    return lambda: ctx.services.get_metric_distributions(ctx.metric, "employment_status", ctx.employment_status)
+
+
+@benchmark("services.get_anxiety_by_category")
+def anxiety_by_category(ctx):
+    return lambda: ctx.services.get_anxiety_by_category("birth_year")
+
+
+@benchmark("services.get_filtered_metrics")
+def filtered_metrics(ctx):
+    return lambda: ctx.services.get_filtered_metrics("birth_year", ctx.age)
+
+
+@benchmark("services.get_group_metrics")
+def group_metrics(ctx):
+    return lambda: ctx.services.get_group_metrics("education_level")
+
+
+@benchmark("services.get_visual_analytics_data")
+def visual_analytics(ctx):
+    # The cached path; the rendering itself is charts.render_visual_analytics
+    return lambda: ctx.services.get_visual_analytics_data("json")
+
+
+@benchmark("services.get_filtered_loan_data")
+def filtered_loan_data(ctx):
+    return lambda: ctx.services.get_filtered_loan_data("income", ctx.income)
+
+
+@benchmark("services.get_filtered_loan_data.unfiltered")
+def filtered_loan_data_unfiltered(ctx):
+    return lambda: ctx.services.get_filtered_loan_data(None, None)
+
+
+@benchmark("services.get_column_summary")
+def column_summary(ctx):
+    return lambda: ctx.services.get_column_summary("loan", filters={"province": [ctx.province]})
+
+
+@benchmark("services.get_column_summary.exact")
+def column_summary_exact(ctx):
+    return lambda: ctx.services.get_column_summary("income", exact=True)
+
+
+@benchmark("services.get_loan_distribution_by")
+def loan_distribution_by(ctx):
+    return lambda: ctx.services.get_loan_distribution_by("province", "income", ctx.income)
+
+
+@benchmark("services.get_loan_purpose_data")
+def loan_purpose_data(ctx):
+    return lambda: ctx.services.get_loan_purpose_data("income", ctx.income)
+
+
+@benchmark("services.get_digital_time_data")
+def digital_time_data(ctx):
+    return lambda: ctx.services.get_digital_time_data("income", ctx.income)
+
+
+@benchmark("services.get_profession_data")
+def profession_data(ctx):
+    return lambda: ctx.services.get_profession_data("income", ctx.income)
+
+
+@benchmark("services.get_education_data")
+def education_data(ctx):
+    return lambda: ctx.services.get_education_data("income", ctx.income)
+
+
+@benchmark("services.get_dashboard_state")
+def dashboard_state(ctx):
+    return lambda: ctx.services.get_dashboard_state(filters={"province": [ctx.province]})
+
+
+@benchmark("services.get_dashboard_state.parallel")
+def dashboard_state_parallel(ctx):
+    return lambda: ctx.services.get_dashboard_state(filters={"province": [ctx.province]}, parallel=True)
+
+
+@benchmark("services.clean_regional_data")
+def clean_regional_data(ctx):
+    # The cleaner converts columns in place, so every call gets a fresh copy
+    return lambda: ctx.services.clean_regional_data(ctx.regional_raw.copy())
+
+
+@benchmark("services.clean_and_aggregate_financial_data")
+def clean_and_aggregate_financial_data(ctx):
+    df = ctx.profile[ctx.services.FINANCIAL_PROFILE_COLUMNS].rename(columns={
+        "avg_monthly_income": "avg_monthly_income (INT)", "avg_monthly_expense": "avg_monthly_expense (INT)",
+    })
+    return lambda: ctx.services.clean_and_aggregate_financial_data(df)
+
+
+@benchmark("services.get_regional_data_from_file")
+def regional_data_from_file(ctx):
+    return ctx.services.get_regional_data_from_file
+
+
+@benchmark("services.get_financial_data_from_file")
+def financial_data_from_file(ctx):
+    return lambda: ctx.services.get_financial_data_from_file("income", ctx.income)
+
+
+@benchmark("services.get_live_aggregates")
+def live_aggregates(ctx):
+    return ctx.services.get_live_aggregates
+
+
+# --- Processors (app/utils) on the full frames ---
+
+@benchmark("processors.ScoreEngine.build")
+def score_engine_build(ctx):
+    from app.utils.score_engine import ScoreEngine
+
+    services = ctx.services
+    return lambda: ScoreEngine(ctx.sheet2, services.METRICS_CONFIG, services.NEGATIVE_POLARITY_QUESTIONS)
+
+
+@benchmark("processors.ScoreEngine.score")
+def score_engine_score(ctx):
+    return ctx.services._score_engine().score
+
+
+@benchmark("processors.ScoreEngine.score_groups")
+def score_engine_score_groups(ctx):
+    codes, groups = pd.factorize(ctx.sheet2["Job"])
+    engine = ctx.services._score_engine()
+    return lambda: engine.score_groups(codes, len(groups))
+
+
+@benchmark("processors.calculate_scores")
+def calculate_scores(ctx):
+    return lambda: ctx.services._calculate_scores(ctx.sheet2)
+
+
+@benchmark("processors.LoanProcessor.get_loan_statistics")
+def loan_statistics(ctx):
+    from app.utils.loan_processor import LoanProcessor
+
+    return lambda: LoanProcessor(ctx.profile).get_loan_statistics()
+
+
+@benchmark("processors.LoanProcessor.get_loan_distribution")
+def loan_distribution(ctx):
+    from app.utils.loan_processor import LoanProcessor
+
+    return lambda: LoanProcessor(ctx.profile).get_loan_distribution()
+
+
+@benchmark("processors.LoanProcessor.validate_loan_data")
+def validate_loan_data(ctx):
+    from app.utils.loan_processor import LoanProcessor
+
+    return lambda: LoanProcessor(ctx.profile).validate_loan_data()
+
+
+@benchmark("processors.LoanProcessor.get_filtered_loan_data")
+def loan_filtered_data(ctx):
+    from app.utils.loan_processor import LoanProcessor
+
+    return lambda: LoanProcessor(ctx.profile).get_filtered_loan_data()
+
+
+@benchmark("processors.LoanProcessor.get_loan_purpose_distribution")
+def loan_purpose_distribution(ctx):
+    from app.utils.loan_processor import LoanProcessor
+
+    return lambda: LoanProcessor(ctx.profile).get_loan_purpose_distribution()
+
+
+@benchmark("processors.EngagementProcessor.get_engagement_distribution")
+def engagement_distribution(ctx):
+    from app.utils.engagement_processor import EngagementProcessor
+
+    return lambda: EngagementProcessor(ctx.profile).get_engagement_distribution()
+
+
+@benchmark("processors.RegionalAggregator.aggregate")
+def regional_aggregate(ctx):
+    df = ctx.profile.rename(columns={
+        "avg_monthly_income": "avg_monthly_income (INT)", "avg_monthly_expense": "avg_monthly_expense (INT)",
+    })
+    return lambda: ctx.services.FINANCIAL_AGGREGATOR.aggregate(df)
+
+
+@benchmark("processors.AnswerDistribution.build")
+def answer_distribution_build(ctx):
+    return lambda: ctx.services._build_answer_distribution(ctx.sheet1, ctx.sheet2)
+
+
+@benchmark("processors.FacetIndex.build")
+def facet_index_build(ctx):
+    from app.utils.facet_index import FacetIndex
+
+    services = ctx.services
+    return lambda: FacetIndex(
+        ctx.sheet1, ctx.sheet2, services.SHEET2_COLUMN_MAPPING, services.SHEET2_VALUE_MAPPING,
+        normalizers={"employment_status": services._normalize_employment_status},
+    )
+
+
+@benchmark("processors.BitmapIndex.build")
+def bitmap_index_build(ctx):
+    from app.utils.bitmap_index import BitmapIndex
+
+    return lambda: BitmapIndex(ctx.profile, set(ctx.services.PROFILE_FILTER_COLUMNS.values()))
+
+
+@benchmark("processors.BitmapIndex.query")
+def bitmap_index_query(ctx):
+    index = ctx.loader._bitmap_index()
+    spec = {"avg_income_category": [ctx.income], "province": [ctx.province]}
+    return lambda: index.query(spec)
+
+
+@benchmark("processors.DataLoader.get_chart_data")
+def chart_data(ctx):
+    return ctx.loader.get_chart_data
+
+
+# --- Chart builders (app/utils/chart_generator.py) ---
+
+def _chart_inputs(ctx):
+    return ctx.loader.get_chart_data(), ctx.loader.get_filtered_profession_chart_data(), ctx.loader.get_filtered_education_chart_data()
+
+
+@benchmark("charts.create_diverging_bar_chart")
+def diverging_bar_chart(ctx):
+    from app.utils.chart_generator import ChartGenerator
+
+    chart, _, _ = _chart_inputs(ctx)
+    return lambda: ChartGenerator.create_diverging_bar_chart(chart)
+
+
+@benchmark("charts.create_diverging_bar_chart_json")
+def diverging_bar_chart_json(ctx):
+    from app.utils.chart_generator import ChartGenerator
+
+    chart, _, _ = _chart_inputs(ctx)
+    return lambda: ChartGenerator.create_diverging_bar_chart_json(chart)
+
+
+@benchmark("charts.create_grouped_bar_chart")
+def grouped_bar_chart(ctx):
+    from app.utils.chart_generator import ChartGenerator
+
+    chart, _, _ = _chart_inputs(ctx)
+    return lambda: ChartGenerator.create_grouped_bar_chart(chart)
+
+
+@benchmark("charts.create_profession_chart")
+def profession_chart(ctx):
+    from app.utils.chart_generator import ChartGenerator
+
+    _, profession, _ = _chart_inputs(ctx)
+    return lambda: ChartGenerator.create_profession_chart(profession)
+
+
+@benchmark("charts.create_profession_chart_json")
+def profession_chart_json(ctx):
+    from app.utils.chart_generator import ChartGenerator
+
+    _, profession, _ = _chart_inputs(ctx)
+    return lambda: ChartGenerator.create_profession_chart_json(profession)
+
+
+@benchmark("charts.create_education_chart")
+def education_chart(ctx):
+    from app.utils.chart_generator import ChartGenerator
+
+    _, _, education = _chart_inputs(ctx)
+    return lambda: ChartGenerator.create_education_chart(education)
+
+
+@benchmark("charts.create_education_chart_json")
+def education_chart_json(ctx):
+    from app.utils.chart_generator import ChartGenerator
+
+    _, _, education = _chart_inputs(ctx)
+    return lambda: ChartGenerator.create_education_chart_json(education)
+
+
+@benchmark("charts.render_visual_analytics")
+def render_visual_analytics(ctx):
+    return lambda: ctx.services._render_visual_analytics(ctx.profile)
+
+
+# --- Loading: CSV parse, clean and compact, and the columnar cache ---
+
+@benchmark("load.profile_csv")
+def load_profile_csv(ctx):
+    from app.utils.dataset_registry import DatasetRegistry
+
+    schemas = ctx.services.DATASETS.schemas
+    return lambda: DatasetRegistry(schemas=schemas).get(ctx.services.NEW_DATASET_PATH, ctx.services.clean_profile_data)
+
+
+@benchmark("load.profile_cache")
+def load_profile_cache(ctx):
+    from app.utils.dataset_registry import DatasetRegistry
+
+    cache = ctx.services.DATASETS.cache
+    if cache is None:
+        return None
+    schemas = ctx.services.DATASETS.schemas
+    return lambda: DatasetRegistry(cache=cache, schemas=schemas).get(ctx.services.NEW_DATASET_PATH, ctx.services.clean_profile_data)
+
+
+@benchmark("load.sheet2_csv")
+def load_sheet2_csv(ctx):
+    from app.utils.dataset_registry import DatasetRegistry
+
+    schemas = ctx.services.DATASETS.schemas
+    return lambda: DatasetRegistry(schemas=schemas).get(os.path.join(ctx.services.DATASET_DIR, "Sheet2.csv"))
+
+
+# --- Ingestion; registered last because every call grows the profile frame ---
+
+@benchmark("ingest.ingest_rows")
+def ingest_rows(ctx):
+    head = ctx.sheet1.head(10)
+    records = head.astype(object).where(head.notna(), None).to_dict("records")
+    return lambda: ctx.services.ingest_rows("profile", records, persist=False)
+
+
+def measure(fn, repeat=5):
+    """
+    Time one callable
+
+    The first call is timed on its own (it builds the derived caches a
+    cold process would). Then ``timeit`` picks a loop count taking at least
+    0.2 s and the loop is repeated ``repeat`` times (at most SLOW_REPEAT
+    for calls slower than SLOW_CALL_SECONDS).
+
+    Returns:
+        dict: Seconds per call (min, median, mean, stdev), the first call,
+            and the loop count and repetitions used
+    """
+    started = time.perf_counter()
+    fn()
+    first = time.perf_counter() - started
+
+    timer = timeit.Timer(fn)
+    number, total = timer.autorange()
+    if total / number > SLOW_CALL_SECONDS:
+        repeat = min(repeat, SLOW_REPEAT)
+    runs = [seconds / number for seconds in timer.repeat(repeat, number)]
+    return {
+        "min_s": min(runs),
+        "median_s": statistics.median(runs),
+        "mean_s": statistics.fmean(runs),
+        "stdev_s": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+        "first_s": first,
+        "number": number,
+        "repeat": len(runs),
+    }
+
+
+def _max_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run(pattern=None, repeat=5, log=None):
+    """
+    Run every registered benchmark whose name matches ``pattern``
+
+    Args:
+        pattern (str, optional): Regular expression searched in benchmark names
+        repeat (int): Timed repetitions per benchmark
+        log (file, optional): Progress is written here, one line per benchmark
+
+    Returns:
+        dict: Row counts, context setup time, peak RSS and per-benchmark timings
+    """
+    started = time.perf_counter()
+    ctx = Context()
+    setup_s = time.perf_counter() - started
+
+    results = {}
+    for name, (group, setup) in BENCHMARKS.items():
+        if pattern and not re.search(pattern, name):
+            continue
+        fn = setup(ctx)
+        if fn is None:
+            continue
+        results[name] = {"group": group, **measure(fn, repeat)}
+        if log:
+            print(f"  {name:<62} {results[name]['median_s'] * 1e3:>11.3f} ms", file=log, flush=True)
+
+    return {
+        "dataset_dir": os.path.abspath(ctx.services.DATASET_DIR),
+        "rows": {"sheet1": len(ctx.sheet1), "sheet2": len(ctx.sheet2), "profile": len(ctx.profile), "regional": len(ctx.regional_raw)},
+        "setup_s": setup_s,
+        "max_rss_mb": _max_rss_mb(),
+        "benchmarks": results,
+    }
+
+
+def environment():
+    """Interpreter, platform and library versions recorded with every result file."""
+    import numpy as np
+
+    versions = {"python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__}
+    for module in ("scipy", "plotly", "orjson", "brotli"):
+        try:
+            versions[module] = getattr(__import__(module), "__version__", "installed")
+        except ImportError:
+            versions[module] = None
+    return {"platform": platform.platform(), "machine": platform.machine(), "cpu_count": os.cpu_count(), "versions": versions}
+
+
+def main(argv=None):
+    """Benchmark the dataset in DATASET_DIR: ``python -m benchmarks.suite --output FILE``."""
+    parser = argparse.ArgumentParser(description="Benchmark the services against the current DATASET_DIR")
+    parser.add_argument("--filter", help="regular expression selecting benchmark names")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the results as JSON here instead of stdout")
+    parser.add_argument("--list", action="store_true", help="print the benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(name for name in BENCHMARKS if not args.filter or re.search(args.filter, name)))
+        return
+    result = run(args.filter, args.repeat, log=sys.stderr)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=1)
+    else:
+        json.dump(result, sys.stdout, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Synthetic Dataset Module
+Scales the survey CSVs to any row count while keeping their schema and vocabularies
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+SOURCE_DIR = os.path.join(os.path.dirname(__file__), "..", "dataset")
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+# Bump when the generated files change for the same source, size and seed
+GENERATOR_VERSION = 1
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+
+# Respondent-level files get the requested row count; the regional indicators
+# get REGIONAL_ROWS_PER_1000 rows per 1000 respondents (one per province at 1k)
+RESPONDENT_FILES = ("Sheet1.csv", "Sheet2.csv", "dataset_gelarrasa_genzfinancialprofile.csv")
+REGIONAL_FILE = "Dataset Gelarrasa - Regional_Economic_Indicators.csv"
+REGIONAL_ROWS_PER_1000 = 38
+
+# Numeric columns with at least this many distinct values are jittered
+# instead of copied, so the generated data is not 1000 repeated values
+CONTINUOUS_MIN_DISTINCT = 50
+JITTER_SIGMA = 0.05
+
+_ID_PATTERN = re.compile(r"^([A-Za-z_]*)(\d+)$")
+
+
+def parse_size(label):
+    """
+    Row count of a size label
+
+    Args:
+        label (str): A key of SIZES ("1k", "100k", "1m", "10m") or a plain
+            number, optionally with a k/m suffix ("250k")
+
+    Returns:
+        int: Number of rows
+
+    Raises:
+        ValueError: For a label that is neither
+    """
+    label = str(label).strip().lower()
+    if label in SIZES:
+        return SIZES[label]
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([km]?)", label.replace("_", ""))
+    if not match:
+        raise ValueError(f"Unknown dataset size: {label}")
+    return int(float(match.group(1)) * {"": 1, "k": 1_000, "m": 1_000_000}[match.group(2)])
+
+
+class ColumnProfile:
+    """How each column of a source CSV is reproduced"""
+
+    def __init__(self, df):
+        """
+        Initialize ColumnProfile
+
+        Args:
+            df (pd.DataFrame): Source read with ``dtype=str, keep_default_na=False``,
+                so every cell is kept exactly as written
+        """
+        self.ids = {}
+        self.continuous = {}
+        for column in df.columns:
+            values = df[column]
+            present = values[values != ""]
+            if present.empty:
+                continue
+            if present.is_unique and len(present) == len(values):
+                match = present.str.extract(_ID_PATTERN)
+                if match.notna().all().all():
+                    self.ids[column] = (match[0].iloc[0], int(match[1].str.len().max()))
+                    continue
+            numbers = pd.to_numeric(present, errors="coerce")
+            if numbers.notna().all() and numbers.nunique() >= CONTINUOUS_MIN_DISTINCT:
+                fractions = present.str.extract(r"\.(\d+)$")[0]
+                decimals = int(fractions.str.len().max()) if fractions.notna().any() else 0
+                self.continuous[column] = (float(numbers.min()), float(numbers.max()), decimals)
+
+
+def _generate_rows(source, profile, rows, rng, chunk_rows):
+    """
+    Chunks of rows resampled from ``source``
+
+    The first ``len(source)`` rows are a permutation of the source (every
+    category value and answer appears at least once once ``rows`` reaches
+    the source size); later rows are drawn uniformly with replacement.
+    Whole rows are copied, so correlations between columns survive.
+    """
+    permutation = rng.permutation(len(source))
+    for start in range(0, rows, chunk_rows):
+        stop = min(start + chunk_rows, rows)
+        positions = np.arange(start, stop)
+        picks = rng.integers(0, len(source), stop - start)
+        covered = positions < len(source)
+        picks[covered] = permutation[positions[covered]]
+        chunk = source.take(picks).reset_index(drop=True)
+
+        for column, (prefix, width) in profile.ids.items():
+            width = max(width, len(str(rows)))
+            chunk[column] = [f"{prefix}{i:0{width}d}" for i in range(start + 1, stop + 1)]
+        for column, (low, high, decimals) in profile.continuous.items():
+            raw = chunk[column]
+            present = (raw != "").to_numpy()
+            values = pd.to_numeric(raw[present]).to_numpy()
+            values = np.clip(values * rng.lognormal(0.0, JITTER_SIGMA, len(values)), low, high).round(decimals)
+            formatted = raw.to_numpy(copy=True)
+            formatted[present] = np.char.mod(f"%.{decimals}f", values)
+            chunk[column] = formatted
+        yield chunk
+
+
+def _write_csv(source_path, target_path, rows, seed, chunk_rows):
+    source = pd.read_csv(source_path, dtype=str, keep_default_na=False, encoding="utf-8")
+    profile = ColumnProfile(source)
+    rng = np.random.default_rng(seed)
+    tmp_path = target_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as fh:
+        for i, chunk in enumerate(_generate_rows(source, profile, rows, rng, chunk_rows)):
+            chunk.to_csv(fh, header=i == 0, index=False)
+    os.replace(tmp_path, target_path)
+
+
+def _file_hash(path):
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def generate(rows, out_dir, source_dir=SOURCE_DIR, seed=0, chunk_rows=250_000, force=False):
+    """
+    Write a synthetic copy of the dataset directory
+
+    Generation is skipped when ``out_dir/meta.json`` already describes the
+    same sources, row count, seed and GENERATOR_VERSION.
+
+    Args:
+        rows (int): Rows of each respondent-level file
+        out_dir (str): Directory to write the CSVs to; usable as DATASET_DIR
+        source_dir (str): Directory holding the real CSVs
+        seed (int): Seed of the resampling and jitter
+        chunk_rows (int): Rows generated and written at a time
+        force (bool): Regenerate even when meta.json matches
+
+    Returns:
+        dict: The meta.json contents (row count per file, seed, source hashes)
+    """
+    files = {name: rows for name in RESPONDENT_FILES}
+    files[REGIONAL_FILE] = max(REGIONAL_ROWS_PER_1000, rows * REGIONAL_ROWS_PER_1000 // 1000)
+    meta = {
+        "generator": GENERATOR_VERSION,
+        "rows": rows,
+        "seed": seed,
+        "files": files,
+        "sources": {name: _file_hash(os.path.join(source_dir, name)) for name in files},
+    }
+    meta_path = os.path.join(out_dir, "meta.json")
+    if not force:
+        try:
+            with open(meta_path, encoding="utf-8") as fh:
+                if json.load(fh) == meta and all(os.path.exists(os.path.join(out_dir, name)) for name in files):
+                    return meta
+        except (OSError, ValueError):
+            pass
+
+    # Derived caches (columnar frames, map and asset builds) belong to the old files
+    shutil.rmtree(os.path.join(out_dir, ".cache"), ignore_errors=True)
+    os.makedirs(out_dir, exist_ok=True)
+    for offset, (name, count) in enumerate(files.items()):
+        _write_csv(os.path.join(source_dir, name), os.path.join(out_dir, name), count, seed + offset, chunk_rows)
+    with open(meta_path, "w", encoding="utf-8") as fh:
+        json.dump(meta, fh, indent=1)
+    return meta
+
+
+def dataset_dir(label, data_dir=DATA_DIR):
+    """Directory a size label is generated into."""
+    return os.path.join(data_dir, label)
+
+
+def main(argv=None):
+    """``python -m benchmarks.synthetic [--sizes 1k 100k ...] [--out DIR]``."""
+    parser = argparse.ArgumentParser(description="Generate synthetic survey datasets of growing size")
+    parser.add_argument("--sizes", nargs="+", default=["1k", "100k"], help=f"size labels ({', '.join(SIZES)}) or row counts")
+    parser.add_argument("--out", default=DATA_DIR, help="directory that gets one subdirectory per size")
+    parser.add_argument("--source", default=SOURCE_DIR, help="directory of the real CSVs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--force", action="store_true", help="regenerate existing datasets")
+    args = parser.parse_args(argv)
+
+    for label in args.sizes:
+        rows = parse_size(label)
+        started = time.perf_counter()
+        meta = generate(rows, dataset_dir(label, args.out), args.source, args.seed, force=args.force)
+        print(f"{label:>6}: {meta['rows']:,} rows in {dataset_dir(label, args.out)} ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
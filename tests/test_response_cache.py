@@ -0,0 +1,30 @@
+import unittest
+
+from app.utils.response_cache import ResponseCache
+
+
+class CacheKeyTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache()
+        self.calls = []
+
+        @self.cache.cached("summary")
+        def summary(name, filter_type=None, filter_value=None, filters=None):
+            self.calls.append((name, filter_type, filter_value, filters))
+            return {"name": name, "filter_type": filter_type}
+
+        self.summary = summary
+
+    def test_swapped_positional_arguments_get_separate_entries(self):
+        self.assertEqual(self.summary("expense", "income", "4-6jt")["name"], "expense")
+        self.assertEqual(self.summary("income", "expense", "4-6jt")["name"], "income")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_filter_value_order_shares_an_entry(self):
+        self.summary("loan", filters={"province": ["Aceh", "Bali"], "gender": ["F"]})
+        self.summary("loan", filters={"gender": ["F"], "province": ["Bali", "Aceh"]})
+        self.assertEqual(len(self.calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()